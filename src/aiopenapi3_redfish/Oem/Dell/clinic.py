@@ -2,6 +2,12 @@ import copy
 import collections
 import yaml
 import io
+import asyncio
+import hashlib
+import json
+import os
+import re
+import zlib
 
 import yarl
 
@@ -521,9 +527,73 @@ class Message(aiopenapi3_redfish.clinic.Message):
         return ctx
 
 
+from typing import Any, NamedTuple, Optional, Union
+
 from aiopenapi3_redfish.entities.service import AsyncTaskService
-from typing import Union
 from aiopenapi3_redfish.oem import Detour
+from aiopenapi3_redfish.deadline import Deadline, sleep
+
+
+class Download(NamedTuple):
+    size: int
+    """bytes received"""
+    sha256: str
+    """hex digest of the bytes received"""
+    content_type: Optional[str]
+    written: int
+    """bytes written to the sink - differs from size if compressed"""
+    compressed: bool
+
+
+class _Sink:
+    """
+    a file (path), a binary file object or an object with an async write()
+    paths are written to <path>.part in a thread and renamed once complete, binary file objects are written on the
+    event loop
+    """
+
+    def __init__(self, sink: Union[str, os.PathLike, Any], compress: bool):
+        self._sink = sink
+        self._file = None
+        self._path: Optional[Path] = None
+        self._zlib = zlib.compressobj(wbits=31) if compress else None
+        self.written = 0
+
+    def __enter__(self) -> "_Sink":
+        if isinstance(self._sink, (str, os.PathLike)):
+            self._path = Path(self._sink)
+            self._file = self._path.with_name(self._path.name + ".part").open("wb")
+        else:
+            self._file = self._sink
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._path is None:
+            return
+        part = Path(self._file.name)
+        self._file.close()
+        if exc_type is None:
+            part.replace(self._path)
+        else:
+            part.unlink(missing_ok=True)
+
+    async def write(self, data: bytes) -> None:
+        if self._zlib is not None:
+            data = self._zlib.compress(data)
+        await self._write(data)
+
+    async def flush(self) -> None:
+        if self._zlib is not None:
+            await self._write(self._zlib.flush())
+
+    async def _write(self, data: bytes) -> None:
+        if not data:
+            return
+        self.written += len(data)
+        if self._path is not None:
+            await asyncio.to_thread(self._file.write, data)
+        elif asyncio.iscoroutine(r := self._file.write(data)):
+            await r
 
 
 @Detour("/redfish/v1/TaskService")
@@ -543,3 +613,79 @@ class DellTaskServiceMonitor(AsyncTaskService):
             return await super().wait_for(TaskId, pollInterval, maxWait)
         except TypeError as e:
             return e.args[0]
+
+    def _monitorResult(self, TaskId: str, value) -> Union[AsyncTaskService.AsyncTask, bytes]:
+        """
+        the result data of a finished Task - wait_for_many() yields it instead of the Task
+        """
+        return value
+
+    _TaskType = re.compile(rb'"@odata\.type"\s*:\s*"#Task\.')
+
+    async def download(
+        self,
+        TaskId: str,
+        sink: Union[str, os.PathLike, Any],
+        compress: bool = False,
+        pollInterval: float = 7,
+        maxWait: float = 700,
+        chunk_size: int = 64 * 1024,
+    ) -> Download:
+        """
+        wait for the Task and stream the result data to sink in chunks - e.g. the Server Configuration Profile of an
+        export, without keeping it in memory
+
+        :param sink: a path, a binary file object or an object with an async write(bytes)
+        :param compress: gzip the data written
+        :return: the size, sha256 and content type of the data received
+        :raises ValueError: the Task finished without result data
+        :raises TimeoutError: the Task did not finish within maxWait
+        """
+        path = f"{self.Tasks._v.odata_id_}/{TaskId}"
+        loop = asyncio.get_running_loop()
+        until = loop.time() + maxWait
+        try:
+            while True:
+                async with Deadline(until - loop.time()):
+                    async with self._client.stream(path) as (schema_, response):
+                        if response.status_code == 202:
+                            await response.aread()
+                        elif (r := await self._download(response, sink, compress, chunk_size)) is not None:
+                            return r
+                    await sleep(pollInterval)
+        except TimeoutError as e:
+            raise TimeoutError(TaskId) from e
+
+    async def _download(self, response, sink, compress: bool, chunk_size: int) -> Optional[Download]:
+        """
+        :return: None if the response is a Task pending
+        """
+        content_type = response.headers.get("content-type", None)
+        chunks = response.aiter_bytes(chunk_size)
+        head = b""
+        async for chunk in chunks:
+            head += chunk
+            if len(head) >= 4096:
+                break
+
+        if content_type and "json" in content_type and self._TaskType.search(head):
+            """the stream is consumed by aiter_bytes, aread() would raise StreamConsumed"""
+            async for chunk in chunks:
+                head += chunk
+            task = json.loads(head)
+            state, status = task.get("TaskState", None), task.get("TaskStatus", None)
+            if state in self.PendingStates and status in ("OK", None):
+                return None
+            messages = [i.get("Message", None) for i in task.get("Messages", [])]
+            raise ValueError(f"Task {task.get('Id', None)} {state}/{status} without result {messages}")
+
+        digest = hashlib.sha256(head)
+        size = len(head)
+        with _Sink(sink, compress) as out:
+            await out.write(head)
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                await out.write(chunk)
+            await out.flush()
+        return Download(size, digest.hexdigest(), content_type, out.written, compress)
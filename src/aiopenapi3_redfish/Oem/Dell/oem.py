@@ -1,13 +1,18 @@
 import asyncio
 import collections
 import enum
+import functools
+import hashlib
+import json
+import os
+import re
+import typing
 from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, NamedTuple, Optional, Tuple, Union
 
 import jq
 import yarl
 
-import aiopenapi3.errors
-
 from aiopenapi3_redfish.base import AsyncResourceRoot, ResourceItem, AsyncCollection
 from aiopenapi3_redfish.entities.settings import AsyncSettings
 from aiopenapi3_redfish.serviceroot import AsyncServiceRoot
@@ -16,6 +21,16 @@ from aiopenapi3_redfish.oem import Oem, Detour
 import aiopenapi3_redfish.entities.actions
 
 from aiopenapi3_redfish.entities.manager import AsyncManager
+from aiopenapi3_redfish.deadline import Deadline
+from aiopenapi3_redfish.hub import _field
+from aiopenapi3_redfish.tasks import WorkerPool
+
+from .tracker import DellJobTracker, StallPolicy, NoProgress
+
+if typing.TYPE_CHECKING:
+    from aiopenapi3_redfish.client import AsyncClient
+    from aiopenapi3_redfish.tasks import Result
+    from .clinic import Download
 
 
 @Detour("/redfish/v1")
@@ -71,21 +86,53 @@ class DellAttributes(AsyncSettings):
         TestAlerts = 0x00000080
         ExecuteDebugCommands = 0x00000100
 
-    def list(self):
-        r = collections.defaultdict(lambda: collections.defaultdict(dict))
+    def __init__(self, client, value):
+        super().__init__(client, value)
+        self._attributes: Optional[Tuple[Any, Dict[str, Dict[str, Dict[str, Any]]]]] = None
+        self._attributesJson: Optional[str] = None
 
-        def compare(kv):
-            cls, idx, attr = kv[0]
-            return (cls, int(idx), attr)
+    def list(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        the Attributes grouped - {group: {index: {attribute: value}}}, ordered by group, index, attribute
 
-        for (cls, idx, attr), value in sorted(
-            map(lambda kv: (kv[0].split("."), kv[1]), self._v.Attributes.model_extra.items()), key=compare
-        ):
-            r[cls][idx][attr] = value
-        return r
+        the index is built once per value retrieved and shared, do not modify
+        """
+        if self._attributes is None or self._attributes[0] is not self._v:
+            r = collections.defaultdict(lambda: collections.defaultdict(dict))
+
+            def compare(kv):
+                cls, idx, attr = kv[0]
+                return (cls, int(idx), attr)
+
+            for (cls, idx, attr), value in sorted(
+                map(lambda kv: (kv[0].split("."), kv[1]), self._v.Attributes.model_extra.items()), key=compare
+            ):
+                r[cls][idx][attr] = value
+            self._attributes = (self._v, {k: dict(v) for k, v in r.items()})
+            self._attributesJson = None
+        return self._attributes[1]
+
+    def get(self, group: str, idx: Union[int, str], attr: str = None) -> Any:
+        """
+        direct lookup - get("Users", 2, "UserName"), get("Users", 2) for all attributes of the index
+
+        :raises KeyError: the attribute does not exist
+        """
+        if attr is not None:
+            return self._v.Attributes.model_extra[f"{group}.{idx}.{attr}"]
+        return self.list()[group][str(idx)]
 
     def filter(self, jq_):
-        return jq.compile(jq_).input(self.list())
+        """
+        jq query on list() - the programs compiled are cached, the input is serialized once per index
+        """
+        index = self.list()
+        if self._attributesJson is None:
+            self._attributesJson = json.dumps(index)
+        return _compile(jq_).input_text(self._attributesJson)
+
+
+_compile = functools.lru_cache(maxsize=256)(jq.compile)
 
 
 @Detour("#DellOem..DellOemLinks/DellAttributes")
@@ -132,30 +179,220 @@ class EID_674_Manager_ExportSystemConfiguration(aiopenapi3_redfish.entities.acti
     async def export(self):
         return await self.__call__()
 
+    async def exportTo(
+        self,
+        sink: Union[str, os.PathLike, Any],
+        Format: str = "XML",
+        Use: str = "Clone",
+        Target: str = "ALL",
+        compress: bool = False,
+        maxWait: float = 700,
+    ) -> "Download":
+        """
+        export the Server Configuration Profile and stream it to sink - a path, a binary file object or an object
+        with an async write()
+
+        await manager.Actions.Oem["#OemManager.ExportSystemConfiguration"].exportTo("backup/host.xml.gz", compress=True)
+
+        :return: the size, sha256 and content type of the profile
+        """
+        r = await self.__call__(Format=Format, Use=Use, Target=Target)
+        return await self._client.TaskService.download(r.Id, sink, compress=compress, maxWait=maxWait)
+
+
+_templates: "collections.OrderedDict[str, str]" = collections.OrderedDict()
+
+
+def template(source: Union[Path, str, bytes]) -> Tuple[str, str]:
+    """
+    the Server Configuration Profile compacted for the ImportBuffer - cached by the sha256 of the content
+
+    :param source: the path or the content of the profile, JSON or XML
+    :return: the sha256 of the content, the compacted profile
+    """
+    data = source if isinstance(source, bytes) else Path(source).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if (r := _templates.get(digest, None)) is None:
+        text = data.decode()
+        try:
+            r = json.dumps(json.loads(text), separators=(",", ":"))
+        except ValueError:
+            r = re.sub(r">\s+<", "><", text.strip())
+        _templates[digest] = r
+        while len(_templates) > 32:
+            _templates.popitem(last=False)
+    else:
+        _templates.move_to_end(digest)
+    return digest, r
+
+
+class ImportOutcome(NamedTuple):
+    digest: str
+    """sha256 of the profile"""
+    skipped: bool
+    """the preview reported no changes, the profile was not imported"""
+    preview: Optional[Any]
+    """the Task of the preview"""
+    task: Optional[Any]
+    """the Task of the import"""
+
 
 @Detour(
     "/redfish/v1/Managers/{ManagerId}/Actions/Oem/EID_674_Manager.ImportSystemConfiguration",
 )
 class EID_674_Manager_ImportSystemConfiguration(aiopenapi3_redfish.entities.actions.Action):
-    async def __call__(self, path: Path, Target: str = "IDRAC"):
-        tShareParameters = self.data.model_fields["ShareParameters"].annotation
+    NoChanges = frozenset({"SYS069"})
+    """MessageIds of a preview reporting the configuration matches the profile already"""
 
-        import re
+    FailedStates = frozenset({"Exception", "Killed", "Cancelled", "Interrupted"})
 
-        template = path.read_text()
-        template = re.sub(r"(   | \n ?)", "", template)
+    async def __call__(self, path: Union[Path, str, bytes], Target: str = "IDRAC", **kwargs):
+        """
+        :param path: the path or the content of the profile
+        :param kwargs: ExecutionMode, HostPowerState, ShutdownType, TimeToWait
+        """
+        tShareParameters = self.data.model_fields["ShareParameters"].annotation
 
+        _, buffer = template(path)
         data = self.data(
-            ExecutionMode="Default",
-            HostPowerState="On",
-            ImportBuffer=template,
-            ShareParameters=tShareParameters(FileName="template.json", Target=[Target]),
-            ShutdownType="NoReboot",
-            TimeToWait=300,
+            **(
+                dict(ExecutionMode="Default", HostPowerState="On", ShutdownType="NoReboot", TimeToWait=300)
+                | kwargs
+                | dict(ImportBuffer=buffer, ShareParameters=tShareParameters(FileName="template.json", Target=[Target]))
+            )
         )
         r = await super().__call__(data=data.model_dump(exclude_unset=True))
         return r
 
+    async def preview(self, path: Union[Path, str, bytes], Target: str = "IDRAC", maxWait: float = 700):
+        """
+        preview the import of the profile
+
+        :return: the Task of the preview, changes() tells if the import would change the configuration
+        """
+        action = self._previewAction()
+        tShareParameters = action.data.model_fields["ShareParameters"].annotation
+        _, buffer = template(path)
+        data = action.data(ImportBuffer=buffer, ShareParameters=tShareParameters(Target=[Target]))
+        r = await action(data=data.model_dump(exclude_unset=True))
+        return await self._client.TaskService.wait_for(r.Id, maxWait=maxWait)
+
+    def _previewAction(self) -> "EID_674_Manager_ImportSystemConfigurationPreview":
+        """the ImportSystemConfigurationPreview action of the Manager of this action"""
+        target = f"{self.odata_id_.rpartition('/')[0]}/EID_674_Manager.ImportSystemConfigurationPreview"
+        parameters, url = self._client.routeOf(target)
+        return EID_674_Manager_ImportSystemConfigurationPreview(self._client, url, parameters, target, None, dict())
+
+    @classmethod
+    def changes(cls, task) -> bool:
+        """
+        the preview Task does not report the configuration matches already
+
+        :raises ValueError: the preview failed - e.g. the profile was rejected
+        """
+        state, status = _field(task, "TaskState"), _field(task, "TaskStatus")
+        if state in cls.FailedStates or status == "Critical":
+            messages = [_field(getattr(i, "root", i), "Message") for i in _field(task, "Messages") or []]
+            raise ValueError(f"preview {_field(task, 'Id')} {state}/{status} {messages}")
+        for message in _field(task, "Messages") or []:
+            if (MessageId := _field(getattr(message, "root", message), "MessageId")) is None:
+                continue
+            if MessageId.rpartition(".")[2] in cls.NoChanges:
+                return False
+        return True
+
+    async def apply(
+        self,
+        path: Union[Path, str, bytes],
+        Target: str = "IDRAC",
+        preview: bool = True,
+        wait: bool = True,
+        maxWait: float = 700,
+        **kwargs,
+    ) -> ImportOutcome:
+        """
+        import the profile - skipped if the preview reports no changes
+
+        :param preview: preview before
+        :param wait: wait for the Task of the import
+        """
+        digest, _ = template(path)
+        p = None
+        if preview and not self.changes(p := await self.preview(path, Target, maxWait)):
+            self._client.log.info(f"SCP {digest[:12]} matches the configuration, not importing")
+            return ImportOutcome(digest, True, p, None)
+        r = await self.__call__(path, Target, **kwargs)
+        if wait:
+            r = await self._client.TaskService.wait_for(r.Id, maxWait=maxWait)
+        return ImportOutcome(digest, False, p, r)
+
+    @staticmethod
+    async def applyMany(
+        clients: Iterable["AsyncClient"],
+        path: Union[Path, str, bytes],
+        Target: str = "IDRAC",
+        preview: bool = True,
+        concurrency: int = 16,
+        maxWait: float = 700,
+        **kwargs,
+    ) -> AsyncIterator["Result"]:
+        """
+        import the profile on many BMCs - the previews and imports are pipelined, a BMC is imported as soon as its
+        preview reports changes while the previews of the others proceed
+
+        async for r in EID_674_Manager_ImportSystemConfiguration.applyMany(clients, "template.json"):
+            r.item, r.value.skipped, r.error
+
+        :return: the Results in the order of completion, the value is the ImportOutcome
+        """
+        if isinstance(path, (str, os.PathLike)):
+            """read and compact once"""
+            path = Path(path).read_bytes()
+        digest, _ = template(path)
+
+        def action(client) -> "EID_674_Manager_ImportSystemConfiguration":
+            return client.Manager.Actions.Oem["#OemManager.ImportSystemConfiguration"]
+
+        async def check(client):
+            return await action(client).preview(path, Target, maxWait)
+
+        async def apply(client):
+            if preview:
+                if not (r := previews.pop(client)).ok:
+                    raise r.error
+                if not EID_674_Manager_ImportSystemConfiguration.changes(r.value):
+                    return ImportOutcome(digest, True, r.value, None)
+            return await action(client).apply(path, Target, preview=False, maxWait=maxWait, **kwargs)
+
+        previews: Dict[Any, "Result"] = dict()
+        applying = WorkerPool(apply, concurrency=concurrency)
+
+        async def feed():
+            try:
+                if preview:
+                    async for r in WorkerPool(check, concurrency=concurrency).map(clients):
+                        previews[r.item] = r
+                        await applying.submit(r.item)
+                else:
+                    for client in clients:
+                        await applying.submit(client)
+            except BaseException:
+                await applying.cancel()
+                raise
+            await applying.join()
+
+        applying.start()
+        feeder = asyncio.create_task(feed())
+        try:
+            async for r in applying.results():
+                yield r
+            await feeder
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+                await asyncio.gather(feeder, return_exceptions=True)
+                await applying.cancel()
+
 
 @Detour(
     "/redfish/v1/Managers/{ManagerId}/Actions/Oem/EID_674_Manager.ImportSystemConfigurationPreview",
@@ -197,6 +434,15 @@ class DellSoftwareInstallationService(AsyncResourceRoot):
         :return: True on Success, all jobs finished.
                 False on Timeout, unfinished jobs
         """
+        return await self._awaitInstall(await self.startInstall())
+
+    async def startInstall(self, **parameters) -> str:
+        """
+        power on the System and start #DellSoftwareInstallationService.InstallFromRepository
+
+        :param parameters: replace the defaults - the repository of downloads.dell.com via HTTPS, reboot
+        :return: the JobId
+        """
         client = self._client
         self._client.log.info("Action #DellSoftwareInstallationService.InstallFromRepository")
 
@@ -213,91 +459,35 @@ class DellSoftwareInstallationService(AsyncResourceRoot):
                 "ShareType": "HTTPS",
                 "RebootNeeded": "True",
             }
+            | parameters
         )
         r = await action(data=data.model_dump(exclude_unset=True, by_alias=True))
+        return r.Id
 
-        return await self._awaitInstall(r.Id)
-
-    async def _awaitInstall(self, initial=None):
+    async def _awaitInstall(self, initial=None, stall: StallPolicy = None):
         """
-        :param initial:
+        :param initial: the JobId to await in addition to the other Jobs in the queue
+        :param stall: the StallPolicy - the System is power cycled on stall, defaults to no progress within 10 minutes
         :return: True if no unfinished jobs remain, else False
         """
         client = self._client
-        system = await client.Systems.index("System.Embedded.1")
+        tracker = DellJobTracker(client)
 
-        done = dict()
-        todo = dict()
-
-        if initial is None:
-            """pick a random job to start with"""
-            jobs = await client.Manager.Links.Oem.Dell.Jobs.refresh()
-            i = await jobs.first()
-            todo[Path(i.odata_id_).name] = i
-        else:
-            todo[initial] = await client.Manager.Links.Oem.Dell.Jobs.index(initial)
-
-        async def step() -> bool:
-            """
-            :return True if finished. False if not stalled
-            """
-            stalled = True
-            while len(todo):
-                try:
-                    jobs = await client.Manager.Links.Oem.Dell.Jobs.refresh()
-                    for i in jobs._data:
-                        Id = Path(i.odata_id_).name
-
-                        if Id in done:
-                            continue
-
-                        old = job = await client.Manager.Links.Oem.Dell.Jobs.index(Id)
-                        if Id not in todo:
-                            todo[Id] = job
-                        else:
-                            old = todo[Id]
-
-                        if old.PercentComplete != job.PercentComplete or old == job:
-                            stalled = False
-                            self._client.log.info(
-                                f"{job.Id}/{job.JobType}/{job.Name} {job.JobState}/#{job.MessageId}/{job.Message} {old.PercentComplete} -> {job.PercentComplete}"
-                            )
-                        todo[Id] = job
-
-                        if job.PercentComplete == 100:
-                            del todo[job.Id]
-                            done[job.Id] = job
-                    await asyncio.sleep(7)
-                except (aiopenapi3.errors.RequestError, aiopenapi3.errors.ResponseError) as e0:
-                    self._client.log.exception(e0)
-                    await asyncio.sleep(15)
-                except Exception as e2:
-                    self._client.log.exception(e2)
-                if stalled is False:
-                    self._client.log.info("step continue")
-                    return False
-            self._client.log.info("step finished")
-            return True
-
-        async def install() -> None:
-            while True:
-                try:
-                    finished = await asyncio.wait_for(step(), timeout=10 * 60)
-                except (asyncio.TimeoutError, TimeoutError, asyncio.CancelledError) as e0:
-                    self._client.log.info(f"step Timeout {type(e0)}")
-                    self._client.log.exception(e0)
-                    await system.togglePower()
-                except Exception as e1:
-                    self._client.log.exception(e1)
-                else:
-                    if finished is True:
-                        self._client.log.info("step Finished")
-                        break
-                self._client.log.info(f"status {len(todo)=} {len(done)=}")
+        async def reboot():
+            system = await client.Systems.index("System.Embedded.1")
+            await system.togglePower()
 
         try:
-            await asyncio.wait_for(install(), timeout=3600 * 2)
-        except (asyncio.TimeoutError, TimeoutError):
+            async with Deadline(3600 * 2):
+                if initial is not None:
+                    await tracker.add(initial)
+
+                async for job, old, new in tracker.changes(stall or NoProgress(10 * 60), onStall=reboot):
+                    self._client.log.info(
+                        f"{job.Id}/{job.JobType}/{job.Name} {job.JobState}/#{job.MessageId}/{job.Message} {old} -> {new}"
+                    )
+                    self._client.log.info(f"status {len(tracker.pending)=} {len(tracker.done)=}")
+        except TimeoutError:
             self._client.log.info("install Timeout")
             return False
         except Exception as e:
@@ -326,6 +516,7 @@ class DellOem(Oem):
         DellJobCollection2,
         DellAttributes,
         EID_674_Manager_ImportSystemConfiguration,
+        EID_674_Manager_ImportSystemConfigurationPreview,
         EID_674_Manager_ExportSystemConfiguration,
         DellUpdateService,
         DellTelemetryService,
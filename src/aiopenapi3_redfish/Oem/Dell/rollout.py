@@ -0,0 +1,303 @@
+import asyncio
+import json
+import logging
+import os
+import typing
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+from aiopenapi3_redfish.base import AsyncResourceRoot
+from aiopenapi3_redfish.tasks import WorkerPool
+
+from .tracker import DellJobTracker, NoProgress, StallPolicy, _state
+
+if typing.TYPE_CHECKING:
+    from aiopenapi3_redfish.client import AsyncClient
+    from aiopenapi3_redfish.tasks import Result
+
+
+class _Watch:
+    def __init__(self, name: str, tracker: DellJobTracker, stall: StallPolicy, until: float, reboots: int):
+        self.name = name
+        self.tracker = tracker
+        self.stall = stall
+        self.until = until
+        self.reboots = reboots
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.rebooting: Optional[asyncio.Task] = None
+
+
+class JobMonitor:
+    """
+    tracks the job queues of many BMCs in shared rounds - a single loop polls all trackers concurrently each interval
+    instead of a polling loop per BMC
+    """
+
+    log = logging.getLogger("aiopenapi3_redfish.JobMonitor")
+
+    def __init__(
+        self,
+        interval: float = 30,
+        reboot: Callable[["AsyncClient"], Awaitable[Any]] = None,
+        onChange: Callable[[str, DellJobTracker], Any] = None,
+    ):
+        """
+        :param reboot: recovers a stalled BMC, defaults to toggling the power of the System
+        :param onChange: called with (name, tracker) if Jobs of a BMC changed
+        """
+        self.interval = interval
+        self.reboot = reboot or _reboot
+        self.onChange = onChange
+        self._watches: Dict[str, _Watch] = dict()
+        self._task: Optional[asyncio.Task] = None
+
+    async def watch(
+        self, name: str, tracker: DellJobTracker, stall: StallPolicy, maxWait: float = 7200, reboots: int = 3
+    ) -> DellJobTracker:
+        """
+        wait until no Job of the tracker is pending
+
+        :param stall: the StallPolicy of the BMC - a stalled BMC is rebooted up to reboots times
+        :raises TimeoutError: Jobs are pending after maxWait or the queue stalled after reboots
+        """
+        loop = asyncio.get_running_loop()
+        stall.reset(loop.time())
+        w = self._watches[name] = _Watch(name, tracker, stall, loop.time() + maxWait, reboots)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        try:
+            return await asyncio.shield(w.future)
+        finally:
+            if self._watches.get(name, None) is w:
+                del self._watches[name]
+            if w.rebooting is not None:
+                w.rebooting.cancel()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        error: Optional[Exception] = None
+        try:
+            while watches := [w for w in self._watches.values() if not w.future.done()]:
+                results = await asyncio.gather(*[w.tracker.poll() for w in watches], return_exceptions=True)
+                now = loop.time()
+                for w, changes in zip(watches, results):
+                    if w.future.done():
+                        continue
+                    if isinstance(changes, DellJobTracker.Transient):
+                        """e.g. the iDRAC resetting during the update - retried until maxWait"""
+                        self.log.warning(f"{w.name} poll failed {changes!r}")
+                        changes = []
+                    elif isinstance(changes, Exception):
+                        w.future.set_exception(changes)
+                        continue
+
+                    if changes and self.onChange is not None:
+                        try:
+                            self.onChange(w.name, w.tracker)
+                        except Exception as e:
+                            self.log.exception(f"{w.name} onChange failed {e!r}")
+                    if not w.tracker.active:
+                        w.future.set_result(w.tracker)
+                    elif now >= w.until:
+                        w.future.set_exception(TimeoutError(w.name, *w.tracker.pending))
+                    elif (w.rebooting is None or w.rebooting.done()) and w.stall.stalled(w.tracker, changes, now):
+                        if w.reboots == 0:
+                            w.future.set_exception(TimeoutError(w.name, "stalled", *w.tracker.pending))
+                            continue
+                        w.reboots -= 1
+                        self.log.info(f"{w.name} stalled {list(w.tracker.pending)}, rebooting")
+                        w.rebooting = asyncio.create_task(self._reboot(w))
+                        w.stall.reset(now)
+                await asyncio.sleep(self.interval)
+        except Exception as e:
+            self.log.exception(f"JobMonitor failed {e!r}")
+            error = e
+        finally:
+            self._task = None
+            """no watch is left waiting for a loop which ended"""
+            for w in self._watches.values():
+                if not w.future.done():
+                    w.future.set_exception(error or RuntimeError("JobMonitor stopped"))
+
+    async def _reboot(self, w: _Watch) -> None:
+        try:
+            await self.reboot(w.tracker._client)
+        except Exception as e:
+            self.log.warning(f"{w.name} reboot failed {e!r}")
+
+
+async def _reboot(client: "AsyncClient") -> None:
+    system = await client.Systems.index("System.Embedded.1")
+    await system.togglePower()
+
+
+async def _install(client: "AsyncClient") -> Optional[str]:
+    service = await AsyncResourceRoot.asyncNew(
+        client, "/redfish/v1/Systems/System.Embedded.1/Oem/Dell/DellSoftwareInstallationService"
+    )
+    return await service.startInstall()
+
+
+class Rollout:
+    """
+    install updates on a fleet in waves
+
+    rollout = Rollout({"r01n01": "rack01", …}, connect, "rollout.json", waves=(1, 10, 100), per_group=2)
+    async for r in rollout.run():
+        …
+
+    Each wave starts once the previous one finished - the first waves are canaries, the rollout stops if more than
+    max_failures of a wave failed.
+    Within a wave at most concurrency hosts and per_group hosts of a group (rack, cluster) are updated at a time.
+    The job queues of all hosts are tracked by a shared JobMonitor, stalled hosts are rebooted.
+    The state of each host is checkpointed to a json file, running the Rollout again resumes - finished hosts are
+    skipped, hosts interrupted once the install was started are tracked without starting the install again, hosts
+    interrupted while starting the install are installed again.
+    Only the Jobs of the install and the Jobs seen pending decide if a host failed - Jobs finished before are ignored.
+    """
+
+    log = logging.getLogger("aiopenapi3_redfish.Rollout")
+
+    def __init__(
+        self,
+        hosts: Mapping[str, str],
+        connect: Callable[[str], Awaitable["AsyncClient"]],
+        checkpoint: Union[str, os.PathLike],
+        waves: Sequence[int] = (1,),
+        concurrency: int = 16,
+        per_group: int = 1,
+        max_failures: float = 0.0,
+        install: Callable[["AsyncClient"], Awaitable[Optional[str]]] = None,
+        tracker: Callable[["AsyncClient"], DellJobTracker] = None,
+        monitor: JobMonitor = None,
+        stall: Callable[[], StallPolicy] = None,
+        maxWait: float = 7200,
+        reboots: int = 3,
+    ):
+        """
+        :param hosts: {host: group} in the order of the rollout
+        :param connect: returns the client of a host
+        :param checkpoint: the path of the checkpoint
+        :param waves: the number of hosts of the waves, the remaining hosts form the last wave
+        :param concurrency: the number of hosts updated at a time
+        :param per_group: the number of hosts of a group updated at a time
+        :param max_failures: the fraction of failed hosts of a wave tolerated
+        :param install: starts the install on a host, returns the JobId - defaults to InstallFromRepository
+        :param tracker: the DellJobTracker of a host
+        :param monitor: the JobMonitor shared by the hosts
+        :param stall: the StallPolicy of a host, defaults to no progress within 10 minutes
+        :param maxWait: the seconds a host may take
+        :param reboots: the number of reboots of a stalled host
+        """
+        self.hosts = dict(hosts)
+        self.connect = connect
+        self.checkpoint = Path(checkpoint)
+        self.waves = list(waves)
+        self.concurrency = concurrency
+        self.per_group = per_group
+        self.max_failures = max_failures
+        self.install = install or _install
+        self.tracker = tracker or (lambda client: DellJobTracker(client, interval=0))
+        self.monitor = monitor or JobMonitor()
+        if self.monitor.onChange is None:
+            self.monitor.onChange = self._progress
+        self.stall = stall or (lambda: NoProgress(10 * 60))
+        self.maxWait = maxWait
+        self.reboots = reboots
+        self.state: Dict[str, Dict[str, Any]] = dict()
+
+    def load(self) -> None:
+        if self.checkpoint.exists():
+            self.state = json.loads(self.checkpoint.read_text())["hosts"]
+
+    def save(self) -> None:
+        """
+        write the checkpoint - atomic via rename
+        """
+        tmp = self.checkpoint.with_name(self.checkpoint.name + ".tmp")
+        tmp.write_text(json.dumps({"hosts": self.state}, indent=1))
+        tmp.replace(self.checkpoint)
+
+    def _update(self, host: str, **values) -> None:
+        self.state.setdefault(host, {"group": self.hosts[host], "state": "pending"}).update(values)
+        self.save()
+
+    def _progress(self, host: str, tracker: DellJobTracker) -> None:
+        """
+        record the Jobs seen pending and the Jobs recorded before - the queue lists Jobs finished long ago
+        """
+        jobs = dict(self.state.get(host, {}).get("jobs", {}))
+        jobs.update({Id: _state(job) for Id, job in tracker.pending.items()})
+        jobs.update({Id: _state(job) for Id, job in tracker.done.items() if Id in jobs})
+        self._update(host, jobs=jobs)
+
+    def partition(self) -> List[List[str]]:
+        """
+        the hosts of the waves
+        """
+        hosts = list(self.hosts)
+        r = []
+        for n in self.waves:
+            if not hosts:
+                break
+            r.append(hosts[:n])
+            hosts = hosts[n:]
+        if hosts:
+            r.append(hosts)
+        return r
+
+    @staticmethod
+    def failed(jobs: Dict[str, Optional[str]]) -> List[str]:
+        return [Id for Id, state in jobs.items() if state not in ("Completed", None)]
+
+    async def _host(self, host: str) -> Dict[str, Optional[str]]:
+        client = await self.connect(host)
+        tracker = self.tracker(client)
+        if (state := self.state.get(host, {})).get("state", None) == "running":
+            self.log.info(f"{host} resuming")
+            JobId = state.get("job", None)
+        else:
+            self._update(host, state="installing", jobs={})
+            try:
+                JobId = await self.install(client)
+            except Exception as e:
+                self._update(host, state="failed", error=repr(e))
+                raise
+            self._update(host, state="running", job=JobId, jobs={} if JobId is None else {JobId: None})
+        if JobId is not None:
+            await tracker.add(JobId)
+            self._progress(host, tracker)
+
+        try:
+            await self.monitor.watch(host, tracker, self.stall(), self.maxWait, self.reboots)
+        except Exception as e:
+            self._update(host, state="failed", error=repr(e))
+            raise
+
+        self._progress(host, tracker)
+        jobs = self.state[host]["jobs"]
+        if failed := self.failed(jobs):
+            self._update(host, state="failed", error=f"Jobs failed {failed}")
+            raise ValueError(host, failed)
+        self._update(host, state="done", error=None)
+        return jobs
+
+    async def run(self) -> AsyncIterator["Result"]:
+        """
+        :return: the Results of the hosts in the order of completion, the value are the JobStates {JobId: JobState}
+        :raises RuntimeError: more than max_failures of a wave failed - the rollout is stopped
+        """
+        self.load()
+        for n, wave in enumerate(self.partition()):
+            todo = [host for host in wave if self.state.get(host, {}).get("state", None) not in ("done", "failed")]
+            failed = sum(self.state.get(host, {}).get("state", None) == "failed" for host in wave)
+            if todo:
+                self.log.info(f"wave {n}: {len(todo)} hosts")
+                pool = WorkerPool(
+                    self._host, concurrency=self.concurrency, key=self.hosts.__getitem__, per_key=self.per_group
+                )
+                async for r in pool.map(todo):
+                    failed += not r.ok
+                    yield r
+            if failed > self.max_failures * len(wave):
+                raise RuntimeError(f"wave {n}: {failed} of {len(wave)} hosts failed")
@@ -0,0 +1,283 @@
+import asyncio
+import json
+import logging
+import typing
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional
+
+import aiopenapi3.errors
+import httpx
+
+from aiopenapi3_redfish.base import AsyncResourceRoot, AsyncCollection
+from aiopenapi3_redfish.errors import RedfishException
+from aiopenapi3_redfish.deadline import sleep
+
+if typing.TYPE_CHECKING:
+    from aiopenapi3_redfish.client import AsyncClient
+
+
+class JobChange(NamedTuple):
+    job: AsyncResourceRoot
+    old: Optional[int]
+    """PercentComplete before, None for Jobs seen the first time"""
+    new: Optional[int]
+    """PercentComplete"""
+
+
+class StallPolicy:
+    """
+    decides if the job queue is stalled - e.g. the Jobs wait for a reboot which will not happen by itself
+    """
+
+    def reset(self, now: float) -> None:
+        pass
+
+    def stalled(self, tracker: "DellJobTracker", changes: List[JobChange], now: float) -> bool:
+        return False
+
+
+class NoProgress(StallPolicy):
+    """
+    stalled if no Job changed within timeout
+    """
+
+    def __init__(self, timeout: float = 600):
+        self.timeout = timeout
+        self._since: Optional[float] = None
+
+    def reset(self, now: float) -> None:
+        self._since = now
+
+    def stalled(self, tracker: "DellJobTracker", changes: List[JobChange], now: float) -> bool:
+        if self._since is None or changes:
+            self._since = now
+        return now - self._since >= self.timeout
+
+
+class AwaitingReboot(NoProgress):
+    """
+    stalled if all pending Jobs are waiting for a reboot for timeout
+    """
+
+    States = frozenset({"Scheduled", "Downloaded", "RebootPending", "PendingActivation"})
+
+    def __init__(self, timeout: float = 120):
+        super().__init__(timeout)
+
+    def stalled(self, tracker: "DellJobTracker", changes: List[JobChange], now: float) -> bool:
+        if not all(_state(job) in self.States for job in tracker.pending.values()):
+            changes = [True]
+        return super().stalled(tracker, changes, now)
+
+
+def _state(job) -> Optional[str]:
+    v = job.JobState
+    return getattr(v, "value", v)
+
+
+class DellJobTracker:
+    """
+    tracks the Dell job queue
+
+    tracker = DellJobTracker(client)
+    async for job, old, new in tracker.changes(NoProgress(600), onStall=system.togglePower):
+        …
+
+    Each round requests the Jobs collection expanded ($expand=*($levels=1)) - a single request.
+    If the service does not expand the Members, the pending Jobs are requested concurrently.
+    Members are only validated if their @odata.etag (or the fingerprint of JobState/PercentComplete/Message) changed.
+    """
+
+    log = logging.getLogger("aiopenapi3_redfish.DellJobTracker")
+
+    FinalStates = frozenset({"Completed", "CompletedWithErrors", "Failed"})
+
+    Transient = (
+        aiopenapi3.errors.RequestError,
+        aiopenapi3.errors.ResponseError,
+        RedfishException,
+        httpx.HTTPError,
+        json.JSONDecodeError,
+    )
+    """errors of a round retried - e.g. the iDRAC resetting during a firmware update answers 503 or truncates"""
+
+    ExpandUnsupported = frozenset({400, 501})
+
+    def __init__(
+        self,
+        client: "AsyncClient",
+        jobs: AsyncCollection = None,
+        JobIds: Iterable[str] = None,
+        interval: float = 7,
+        expand: bool = True,
+    ):
+        """
+        :param jobs: the Jobs collection, defaults to the one of the iDRAC Manager
+        :param JobIds: the Jobs to track, None to track all Jobs listed
+        :param interval: the seconds between rounds
+        :param expand: try $expand
+        """
+        self._client = client
+        self._jobs = jobs
+        self.interval = interval
+        self.expand = expand
+        self.track = None if JobIds is None else set(JobIds)
+        self.pending: Dict[str, AsyncResourceRoot] = dict()
+        self.done: Dict[str, AsyncResourceRoot] = dict()
+        self._fingerprints: Dict[str, Hashable] = dict()
+        self.requests = 0
+
+    @property
+    def jobs(self) -> AsyncCollection:
+        if self._jobs is None:
+            self._jobs = self._client.Manager.Links.Oem.Dell.Jobs
+        return self._jobs
+
+    @property
+    def active(self) -> bool:
+        """
+        Jobs are pending or tracked Jobs were not seen finished yet
+        """
+        return bool(self.pending) or (self.track is not None and not self.track <= self.done.keys())
+
+    @classmethod
+    def finished(cls, job) -> bool:
+        return job.PercentComplete == 100 or _state(job) in cls.FinalStates
+
+    @staticmethod
+    def fingerprint(value: Any) -> Hashable:
+        if isinstance(value, dict):
+            if (etag := value.get("@odata.etag", None)) is not None:
+                return etag
+            return tuple(value.get(i, None) for i in ("JobState", "PercentComplete", "MessageId", "Message"))
+        if (etag := getattr(value, "odata_etag_", None)) is not None:
+            return etag
+        return tuple(getattr(value, i, None) for i in ("JobState", "PercentComplete", "MessageId", "Message"))
+
+    async def add(self, JobId: str) -> AsyncResourceRoot:
+        """
+        track a Job which may not be listed in the queue yet
+        """
+        job = await self.jobs.index(JobId)
+        if self.track is not None:
+            self.track.add(JobId)
+        self._update(JobId, job, self.fingerprint(job))
+        return job
+
+    async def poll(self) -> List[JobChange]:
+        """
+        a single round
+        """
+        if self.expand:
+            try:
+                return await self._pollExpanded()
+            except (RedfishException, httpx.HTTPStatusError, KeyError) as e:
+                if not self._unsupported(e):
+                    raise
+                self.log.info(f"$expand not usable {e!r}, requesting Jobs individually")
+                self.expand = False
+        return await self._pollConcurrent()
+
+    @classmethod
+    def _unsupported(cls, e: Exception) -> bool:
+        """
+        the response shows $expand is not supported - rejected or Members not expanded
+        """
+        if isinstance(e, RedfishException):
+            return e.status in cls.ExpandUnsupported
+        if isinstance(e, httpx.HTTPStatusError):
+            return e.response.status_code in cls.ExpandUnsupported
+        return isinstance(e, KeyError) and e.args == ("@odata.type",)
+
+    def _wanted(self, Id: str) -> bool:
+        return Id not in self.done and (self.track is None or Id in self.track)
+
+    async def _pollExpanded(self) -> List[JobChange]:
+        changes = list()
+        self.requests += 1
+        async for member in self.jobs.stream(query={"$expand": "*($levels=1)"}, validate=False):
+            odata_id_ = member["@odata.id"]
+            if not self._wanted(Id := Path(odata_id_).name):
+                continue
+            if (fingerprint := self.fingerprint(member)) == self._fingerprints.get(Id, None):
+                continue
+            if "@odata.type" not in member:
+                raise KeyError("@odata.type")
+            value = self._client.modelOf(member["@odata.type"]).model_validate(member)
+            job = await AsyncResourceRoot.asyncFromValue(self._client, odata_id_, value)
+            changes.extend(self._update(Id, job, fingerprint))
+        return changes
+
+    async def _pollConcurrent(self) -> List[JobChange]:
+        if self.track is None:
+            self.requests += 1
+            jobs = await self.jobs.refresh()
+            ids = [Path(i.odata_id_).name async for i in jobs._members()]
+        else:
+            ids = list(self.track)
+        base = self.jobs._v.odata_id_
+        paths = {f"{base}/{Id}": Id for Id in ids if self._wanted(Id)}
+        self.requests += len(paths)
+        changes = list()
+        values = await self._client.get_many(paths, cache=False)
+        for path, value in zip(paths, values):
+            Id = paths[path]
+            if (fingerprint := self.fingerprint(value)) == self._fingerprints.get(Id, None):
+                continue
+            job = await AsyncResourceRoot.asyncFromValue(self._client, path, value)
+            changes.extend(self._update(Id, job, fingerprint))
+        return changes
+
+    def _update(self, Id: str, job: AsyncResourceRoot, fingerprint: Hashable) -> List[JobChange]:
+        self._fingerprints[Id] = fingerprint
+        old = self.pending.pop(Id, None)
+        if self.finished(job):
+            self.done[Id] = job
+            del self._fingerprints[Id]
+            if old is None:
+                """finished before it was seen - not a change"""
+                return []
+        else:
+            self.pending[Id] = job
+        return [JobChange(job, None if old is None else old.PercentComplete, job.PercentComplete)]
+
+    async def changes(
+        self, stall: StallPolicy = None, onStall: Callable[[], Awaitable[Any]] = None, maxBackoff: float = 120
+    ) -> AsyncIterator[JobChange]:
+        """
+        poll until no tracked Job is pending, yields the changes
+
+        :param stall: the StallPolicy
+        :param onStall: called if the queue stalled - e.g. to reboot the System
+        :param maxBackoff: the maximum seconds between rounds failing
+        """
+        loop = asyncio.get_running_loop()
+        stall = stall or StallPolicy()
+        stall.reset(loop.time())
+        backoff = self.interval * 2
+        while True:
+            try:
+                changes = await self.poll()
+            except self.Transient as e:
+                self.log.warning(f"poll failed {e!r}, retrying in {backoff}s")
+                await sleep(backoff)
+                backoff = min(backoff * 2, maxBackoff)
+                continue
+            backoff = self.interval * 2
+
+            for change in changes:
+                yield change
+
+            if not self.active:
+                break
+
+            if stall.stalled(self, changes, loop.time()):
+                self.log.info(f"stalled {list(self.pending)}")
+                if onStall is not None:
+                    try:
+                        await onStall()
+                    except self.Transient as e:
+                        self.log.warning(f"onStall failed {e!r}")
+                stall.reset(loop.time())
+
+            await sleep(self.interval)
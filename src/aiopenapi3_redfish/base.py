@@ -1,3 +1,5 @@
+import asyncio
+import random
 import typing
 
 import yarl
@@ -6,7 +8,9 @@ from pydantic import BaseModel
 
 import aiopenapi3.model
 
-from aiopenapi3_redfish.errors import RedfishException
+from aiopenapi3_redfish.errors import PreconditionFailed, RedfishException
+from aiopenapi3_redfish.deadline import sleep
+from aiopenapi3_redfish.jsonstream import MembersParser
 from aiopenapi3_redfish.oem import Oem
 
 if typing.TYPE_CHECKING:
@@ -46,7 +50,7 @@ class ResourceItem:
         return v
 
     async def refresh(self):
-        self._v = await self._root._client.get(self._v.odata_id_)
+        self._v = await self._root._client.get(self._v.odata_id_, cache=False)
 
     async def get(self, *args, **kwargs):
         return await AsyncResourceRoot.asyncNew(self._root._client, self._v.odata_id_)
@@ -65,9 +69,11 @@ class AsyncResourceRoot(ResourceItem):
     def __init__(self, client: "AsyncClient", value: "BaseModel"):
         self._client: "AsyncClient" = client
         super().__init__(self, yarl.URL("/"), value)
+        if client is not None and client._cache is not None:
+            client._cache.track(self)
 
     async def refresh(self):
-        self._v = await self._client.get(self._v.odata_id_)
+        self._v = await self._client.get(self._v.odata_id_, cache=False)
 
     async def get(self, *args, **kwargs):
         return await self._client.get(self._v.odata_id_, *args, **kwargs)
@@ -78,9 +84,62 @@ class AsyncResourceRoot(ResourceItem):
     async def delete(self):
         return await self._client.delete(self._v.odata_id_, context=self)
 
+    async def modify(
+        self,
+        change: typing.Callable[["AsyncResourceRoot"], typing.Any],
+        retries: int = 4,
+        backoff: float = 0.5,
+        maxBackoff: float = 8.0,
+    ):
+        """
+        PATCH the values change() computes for the current value - if the resource was modified concurrently (412),
+        refresh it and apply change() again
+
+        await account.modify(lambda a: {"RoleId": "Operator"} if a.RoleId != "Administrator" else None)
+
+        :param change: computes the values to PATCH from the resource, None if there is nothing to change
+        :param retries: the number of retries on 412
+        :param backoff: the seconds waited before the first retry, doubled for each retry up to maxBackoff, jittered
+        :return: the result of the PATCH, None if there was nothing to change
+        :raises PreconditionFailed: retries exhausted
+        """
+        for attempt in range(retries + 1):
+            values = change(self)
+            if asyncio.iscoroutine(values):
+                values = await values
+            if not values:
+                return None
+            try:
+                return await self._modify(values)
+            except PreconditionFailed:
+                if attempt == retries:
+                    raise
+                delay = min(maxBackoff, backoff * 2**attempt) * random.uniform(0.5, 1.0)
+                self._client.log.info(f"{self._v.odata_id_} modified concurrently, retrying in {delay:.1f}s")
+                await sleep(delay)
+                await self.refresh()
+
+    async def _modify(self, values: typing.Dict[str, typing.Any]):
+        """the PATCH of modify()"""
+        return await self.patch(values)
+
     @classmethod
-    async def asyncNew(cls, client: "AsyncClient", odata_id_: str):
+    async def asyncNew(cls, client: "AsyncClient", odata_id_: str, priority=None):
+        if priority is not None:
+            with client.priority(priority):
+                return await cls.asyncNew(client, odata_id_)
+
         value = await client.get(odata_id_)
+        return await cls.asyncFromValue(client, odata_id_, value)
+
+    @classmethod
+    async def asyncFromValue(cls, client: "AsyncClient", odata_id_: str, value, priority=None):
+        """
+        asyncNew for a value which was retrieved already
+        """
+        if priority is not None:
+            with client.priority(priority):
+                return await cls.asyncFromValue(client, odata_id_, value)
 
         if not isinstance(value, (BaseModel, dict)):
             return value
@@ -138,10 +197,15 @@ T = typing.TypeVar("T")
 
 
 class AsyncCollection(typing.Generic[T], AsyncResourceRoot):
+    top: typing.Optional[int] = None
+    """$top - the page size requested, None for the service default"""
+
     def __init__(self, client=None, data=None):
         super().__init__(client, data)
         self._data = data or {}
         self._T = None
+        self._next: typing.Optional[str] = None
+        self._lock = asyncio.Lock()
 
     @property
     def T(self):
@@ -156,30 +220,153 @@ class AsyncCollection(typing.Generic[T], AsyncResourceRoot):
         return self._T
 
     async def asyncNew(self, client: "AsyncClient", odata_id_: str):
-        value = await client.get(odata_id_)
+        value = await client.get(self._firstPage(odata_id_))
         super().__init__(client, value)
-        self._data = self._v.Members
+        self._setPage(value, replace=True)
         return self
 
+    def _firstPage(self, odata_id_: str) -> str:
+        if self.top is None:
+            return odata_id_
+        return str(yarl.URL(odata_id_).update_query({"$top": self.top}))
+
+    def _setPage(self, value, replace=False) -> None:
+        name = aiopenapi3.model.Model.nameof("Members@odata.nextLink")
+        self._next = getattr(value, name, None) or (value.model_extra or {}).get("Members@odata.nextLink", None)
+        if replace:
+            self._data = list(value.Members)
+        else:
+            self._data.extend(value.Members)
+
+    async def _nextPage(self, priority=None) -> None:
+        """
+        load the next page into _data
+        """
+        async with self._lock:
+            if self._next is None:
+                return
+            self._setPage(await self._client.get(self._next, priority=priority))
+
+    async def _members(self, prefetch=False, priority=None) -> typing.AsyncGenerator:
+        """
+        iterate the Members (references), pages are loaded as iteration advances
+
+        :param prefetch: request the next page while the current one is processed
+        :param priority: the request lane of the pages
+        """
+        i = 0
+        task = None
+        try:
+            while True:
+                if prefetch and task is None and self._next is not None:
+                    task = asyncio.create_task(self._nextPage(priority))
+                while i < len(self._data):
+                    yield self._data[i]
+                    i += 1
+                if self._next is None and task is None:
+                    break
+                await (task or self._nextPage(priority))
+                task = None
+        finally:
+            if task is not None:
+                task.cancel()
+
     async def first(self) -> T:
-        i = self._data[0]
-        v = await self.T.asyncNew(self._client, i.odata_id_)
-        return v
+        async for i in self._members():
+            return await self.T.asyncNew(self._client, i.odata_id_)
+        raise IndexError(self._v.odata_id_)
 
     async def refresh(self):
-        self._v = await self._client.get(self._v.odata_id_)
-        self._data = self._v.Members
+        self._v = await self._client.get(self._firstPage(self._v.odata_id_), cache=False)
+        self._setPage(self._v, replace=True)
         return self
 
-    async def list(self, skip_errors=True) -> typing.Generator:
-        for i in self._data:
-            try:
-                v = await self.T.asyncNew(self._client, i.odata_id_)
-                yield v
-            except RedfishException as e:
-                if skip_errors:
-                    continue
-                raise e
+    async def list(self, skip_errors=True, priority=None, concurrency=None, prefetch=False) -> typing.Generator:
+        """
+        :param skip_errors: skip members which can not be retrieved
+        :param priority: the request lane
+        :param concurrency: number of members requested ahead, defaults to Config.connections
+        :param prefetch: request the next page of the Collection while the current one is processed
+        """
+        """priority is passed on - a context set around the yields would apply to the consumer"""
+        step = concurrency or self._client.config.connections
+        paths = list()
+        async for i in self._members(prefetch, priority):
+            paths.append(i.odata_id_)
+            if len(paths) == step:
+                async for v in self._many(paths, skip_errors, concurrency, priority):
+                    yield v
+                paths = list()
+        async for v in self._many(paths, skip_errors, concurrency, priority):
+            yield v
+
+    async def _many(
+        self, paths: typing.List[str], skip_errors=True, concurrency=None, priority=None
+    ) -> typing.Generator:
+        step = concurrency or self._client.config.connections
+        for n in range(0, len(paths), step):
+            chunk = paths[n : n + step]
+            values = await self._client.get_many(chunk, concurrency=step, return_exceptions=True, priority=priority)
+            for path, value in zip(chunk, values):
+                try:
+                    if isinstance(value, Exception):
+                        raise value
+                    yield await self.T.asyncFromValue(self._client, path, value, priority)
+                except RedfishException as e:
+                    if skip_errors:
+                        continue
+                    raise e
+
+    async def stream(self, query=None, priority=None, chunk_size=64 * 1024, validate=True) -> typing.AsyncGenerator:
+        """
+        iterate the Members of (very) large Collections
+
+        The response is parsed incrementally, Members are validated and yielded as soon as they are decoded,
+        Members@odata.nextLink pages are requested once the previous page is exhausted.
+        The Collection is never held in memory.
+
+        async for entry in logs.Entries.stream():
+            …
+
+        :param query: OData query parameters for the first page, e.g. {"$top": 500}
+        :param validate: validate the Members, disable to receive the decoded json - e.g. for $expand
+        :return: the Members, as defined by the Collection Schema
+        """
+        url = self._firstPage(self._v.odata_id_)
+        while url is not None:
+            parser = MembersParser()
+            async with self._client.stream(url, query=query, priority=priority) as (schema_, response):
+                type_ = self._membersType(schema_) if validate else None
+                async for chunk in response.aiter_bytes(chunk_size):
+                    for member in parser.feed(chunk):
+                        yield type_.model_validate(member) if type_ else member
+                for member in parser.feed(b"", final=True):
+                    yield type_.model_validate(member) if type_ else member
+            url = parser.envelope.get("Members@odata.nextLink", None)
+            query = None
+
+    @staticmethod
+    def _membersType(schema_) -> typing.Optional[typing.Type[BaseModel]]:
+        try:
+            annotation = schema_.get_type().model_fields["Members"].annotation
+        except (AttributeError, KeyError):
+            return None
+        """Optional[List[Member]] -> Member"""
+        while not (isinstance(annotation, type) and issubclass(annotation, BaseModel)):
+            if not (args := [i for i in typing.get_args(annotation) if i is not type(None)]):
+                return None
+            annotation = args[0]
+        return annotation
 
     async def index(self, key) -> T:
+        """
+        the Member is requested directly, the pages of the Collection are not loaded
+        """
         return await self.T.asyncNew(self._client, f"{self._v.odata_id_}/{key}")
+
+    async def index_many(self, *keys, skip_errors=False, concurrency=None) -> typing.Generator:
+        """
+        index() for multiple keys, the members are requested concurrently and returned in the order of keys
+        """
+        async for v in self._many([f"{self._v.odata_id_}/{key}" for key in keys], skip_errors, concurrency):
+            yield v
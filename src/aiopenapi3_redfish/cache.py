@@ -0,0 +1,211 @@
+import asyncio
+import collections
+import contextlib
+import logging
+import time
+import typing
+import weakref
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .hub import _origin
+
+if typing.TYPE_CHECKING:
+    from .client import AsyncClient
+    from .base import AsyncResourceRoot
+
+
+class ResourceCache:
+    """
+    client side cache of resources retrieved via GET
+
+    Entries expire after ttl seconds.
+    If the service provides ResourceEvents via SSE, the cache is invalidated using the OriginOfCondition of the events
+    and the entries expire after event_ttl instead - once the SSE stream is connected.
+    While the SSE stream is disconnected, ttl is used again.
+
+    Entries are keyed by the path including the query - e.g. Collection pages with $skip -
+    and invalidated by the path without the query.
+    """
+
+    log = logging.getLogger("aiopenapi3_redfish.ResourceCache")
+
+    EventTypes = ("ResourceUpdated", "ResourceAdded", "ResourceRemoved", "StatusChange")
+
+    def __init__(self, client: "AsyncClient", ttl: float = 5, event_ttl: float = 3600, maxsize: int = 4096):
+        """
+        :param ttl: the lifetime of an entry without events
+        :param event_ttl: the lifetime of an entry while events are received
+        :param maxsize: the maximum number of entries, least recently used entries are evicted
+        """
+        self._client = client
+        self.ttl = ttl
+        self.event_ttl = event_ttl
+        self.maxsize = maxsize
+        self._entries: collections.OrderedDict[str, Tuple[float, Any]] = collections.OrderedDict()
+        self._keys: dict[str, Set[str]] = collections.defaultdict(set)
+        """the keys of a path without the query"""
+        self._generations: Dict[str, int] = dict()
+        """the number of invalidations of a path"""
+        self._instances: dict[str, weakref.WeakSet] = collections.defaultdict(weakref.WeakSet)
+        self._refresh = False
+        self._refreshing: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.live = False
+        self.hits = self.misses = self.invalidated = 0
+
+    @property
+    def lifetime(self) -> float:
+        return self.event_ttl if self.live else self.ttl
+
+    def get(self, path: str) -> Optional[Any]:
+        if (entry := self._entries.get(path, None)) is None:
+            self.misses += 1
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            self._drop(path)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(path)
+        self.hits += 1
+        return value
+
+    def generation(self, path: str) -> int:
+        """
+        the generation of the path, passed to put() to ignore a response requested before an invalidation
+        """
+        return self._generations.get(_path(path), 0)
+
+    def put(self, path: str, value: Any, generation: Optional[int] = None) -> None:
+        """
+        :param generation: the generation() of the path when the request was sent
+        """
+        if generation is not None and generation != self.generation(path):
+            self.log.debug(f"{path} invalidated while requested")
+            return
+        self._entries[path] = (time.monotonic() + self.lifetime, value)
+        self._entries.move_to_end(path)
+        self._keys[_path(path)].add(path)
+        while len(self._entries) > self.maxsize:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str) -> None:
+        del self._entries[key]
+        path = _path(key)
+        if (keys := self._keys.get(path, None)) is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys[path]
+
+    def track(self, obj: "AsyncResourceRoot") -> None:
+        """
+        refresh the object on ResourceEvents for its path
+        """
+        if len(self._instances) >= self.maxsize:
+            self._prune()
+        self._instances[obj._v.odata_id_].add(obj)
+
+    def _prune(self) -> None:
+        """drop the paths without instances alive"""
+        for path in [path for path, instances in self._instances.items() if not instances]:
+            del self._instances[path]
+
+    def invalidate(self, path: str) -> None:
+        """
+        invalidate the path and the Collection it is member of - with any query
+        """
+        path = _path(path)
+        for i in (path, path.rpartition("/")[0]):
+            self._generations[i] = self._generations.get(i, 0) + 1
+            for key in self._keys.pop(i, ()):
+                if self._entries.pop(key, None) is not None:
+                    self.invalidated += 1
+
+        if (instances := self._instances.get(path, None)) is not None and not instances:
+            del self._instances[path]
+        elif self._refresh and instances:
+            for obj in list(instances):
+                task = asyncio.create_task(self._refreshInstance(obj))
+                self._refreshing.add(task)
+                task.add_done_callback(self._refreshing.discard)
+
+    async def _refreshInstance(self, obj: "AsyncResourceRoot") -> None:
+        try:
+            await obj.refresh()
+        except Exception as e:
+            self.log.debug(f"refresh {obj._v.odata_id_} failed {e!r}")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys.clear()
+
+    async def start(self, refresh: bool = False) -> None:
+        """
+        invalidate using ResourceEvents received via the EventHub
+
+        :param refresh: refresh tracked instances on change
+        """
+        self._refresh = refresh
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        for task in list(self._refreshing):
+            task.cancel()
+        self.live = False
+
+    async def _run(self) -> None:
+        hub = self._client.hub
+        queue = asyncio.Queue()
+
+        async def forward(subscription):
+            async with subscription:
+                try:
+                    async for event, record in subscription:
+                        await queue.put(record)
+                except Exception as e:
+                    await queue.put(e)
+
+        subscriptions = [hub.subscribe(RegistryPrefix="ResourceEvent"), hub.subscribe(EventType=self.EventTypes)]
+        hub.listeners.add(self._connection)
+        self._connection(hub.connected)
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for subscription in subscriptions:
+                    tg.create_task(forward(subscription))
+                while True:
+                    item = await queue.get()
+                    if isinstance(item, Exception):
+                        self._connection(False)
+                        continue
+                    if (origin := _origin(item)) is not None:
+                        self.invalidate(origin)
+        finally:
+            hub.listeners.discard(self._connection)
+
+    def _connection(self, connected: bool) -> None:
+        if connected:
+            if not self.live:
+                self.log.info(f"events connected, using ttl {self.event_ttl}s")
+            self.live = True
+        elif self.live:
+            self.log.warning(f"events disconnected, using ttl {self.ttl}s")
+            self.live = False
+            self._expire(self.ttl)
+
+    def _expire(self, ttl: float) -> None:
+        """shorten the lifetime of all entries to ttl"""
+        until = time.monotonic() + ttl
+        for path, (expires, value) in self._entries.items():
+            if expires > until:
+                self._entries[path] = (until, value)
+
+
+def _path(key: str) -> str:
+    """the path of a key without the query"""
+    return key.partition("?")[0].rstrip("/")
@@ -1,5 +1,9 @@
+import asyncio
+import contextlib
+import functools
+import json
 import typing
-from typing import List, Union
+from typing import AsyncIterator, Iterable, List, Tuple, Union
 from pathlib import Path
 import logging
 
@@ -9,10 +13,16 @@ import routes
 
 from aiopenapi3 import OpenAPI
 from aiopenapi3.loader import ChainLoader
+import aiopenapi3.errors
 
-from aiopenapi3_redfish.errors import RedfishException
+from aiopenapi3_redfish.errors import PreconditionFailed, RedfishException
+from aiopenapi3_redfish.odata import ResourceType
 
 from aiopenapi3_redfish.base import AsyncResourceRoot
+from aiopenapi3_redfish.scheduler import Scheduler, Priority, priority
+from aiopenapi3_redfish.deadline import Deadline, bounded
+from aiopenapi3_redfish.hub import EventHub
+from aiopenapi3_redfish.cache import ResourceCache
 
 
 if typing.TYPE_CHECKING:
@@ -26,6 +36,7 @@ if typing.TYPE_CHECKING:
         AsyncTaskService,
     )
     from .serviceroot import AsyncServiceRoot
+    import pydantic
     from aiopenapi3.plugin import Plugin
     from aiopenapi3.loader import Loader
 
@@ -40,6 +51,7 @@ class Config:
         plugins: List["Plugin"] = None,
         locations: List["Loader"] = None,
         session_factory: Union[httpx.AsyncClient | httpx.Client] = httpx.AsyncClient,
+        connections: int = 8,
     ):
         self.target: str = target
         self.auth = (username, password)
@@ -47,6 +59,7 @@ class Config:
         self.plugins: List["Plugin"] = plugins or []
         self.locations: List["Loader"] = locations or []
         self.session_factory: Union[httpx.AsyncClient | httpx.Client] = session_factory
+        self.connections: int = connections
 
 
 class AsynClientLoggingAdapter(logging.LoggerAdapter):
@@ -74,6 +87,11 @@ class AsyncClient:
         self._mapping: "Mapping" = None
         self._RedfishError = self.api.components.schemas["RedfishError"].get_type()
         self.log = AsynClientLoggingAdapter(self._log, extra=dict(target=yarl.URL(self.config.target).host))
+        self._scheduler = Scheduler(self.config.connections)
+        self._routematch = functools.lru_cache(maxsize=4096)(self._routematch)
+        self.modelOf = functools.lru_cache(maxsize=256)(self.modelOf)
+        self._hub: EventHub = None
+        self._cache: ResourceCache = None
 
     @classmethod
     def fromConfig(cls, config: Config, api=None) -> "AsyncClient":
@@ -108,40 +126,272 @@ class AsyncClient:
 
     def routeOf(self, url: Union[str, yarl.URL]):
         if isinstance(url, yarl.URL):
-            url = str(url.with_fragment(None))
+            url = str(url.with_fragment(None).with_query(None))
+        parameters, routepath = self._routematch(url)
+        return dict(parameters), routepath
+
+    def _routematch(self, url: str) -> Tuple[dict, str]:
         r = self.routes.routematch(url)
         if r is None:
             raise KeyError(url)
         parameters, route, *_ = r
         return parameters, route.routepath
 
-    async def delete(self, path, context=None):
-        return await self._request(path, "delete", context=context)
+    def modelOf(self, odata_type_: str) -> typing.Type["pydantic.BaseModel"]:
+        """
+        lookup the model for a @odata.type - e.g. to validate payloads received out of band (SSE/push events)
+
+        :param odata_type_: #Event.v1_8_0.Event
+        :return: the model of Event_v1_8_0_Event
+        :raises KeyError: the description document of the type is not loaded
+        """
+        t = ResourceType(odata_type_)
+        name = t.ResourceType.lstrip("#")
+        if t.Version:
+            document, schema = f"{name}.{t.Version}.yaml", f"{name}_{t.Version}_{t.TermName}"
+        else:
+            document, schema = f"{name}.yaml", f"{name}_{t.TermName}"
+        return self.api._documents[yarl.URL(f"/redfish/v1/Schemas/{document}")].components.schemas[schema].get_type()
+
+    def priority(self, value: Union[Priority, str]):
+        """
+        select the request lane for everything awaited within the context
+
+        with client.priority("bulk"):
+            async for system in client.Systems.list():
+                …
+        """
+        return priority(value)
+
+    def deadline(self, timeout: float, minimum: float = 0.0) -> Deadline:
+        """
+        bound everything awaited within the context to timeout seconds
+
+        async with client.deadline(30):
+            async for system in client.Systems.list():
+                …
+
+        :param timeout: the budget in seconds
+        :param minimum: do not start requests if less than minimum seconds are left
+        """
+        return Deadline(timeout, minimum)
+
+    async def enableCache(
+        self, ttl: float = 5, event_ttl: float = 3600, events: bool = True, refresh: bool = False
+    ) -> ResourceCache:
+        """
+        cache resources retrieved via GET
+
+        :param ttl: the lifetime of an entry
+        :param event_ttl: the lifetime of an entry while ResourceEvents are received via SSE
+        :param events: invalidate using ResourceEvents, falls back to ttl if SSE is unavailable
+        :param refresh: refresh the resources created after enabling the cache on ResourceEvents
+        """
+        if self._cache is None:
+            self._cache = ResourceCache(self, ttl, event_ttl)
+        if events:
+            await self._cache.start(refresh)
+        return self._cache
+
+    async def disableCache(self) -> None:
+        if self._cache is not None:
+            cache, self._cache = self._cache, None
+            await cache.stop()
+
+    async def delete(self, path, context=None, priority=None):
+        return await self._request(path, "delete", context=context, priority=priority)
+
+    async def get(self, path, priority=None, cache=True):
+        """
+        :param cache: use the cached value if available
+        """
+        return await self._request(path, "get", priority=priority, cache=cache)
+
+    async def get_many(
+        self,
+        paths: Iterable[str],
+        concurrency: int = None,
+        return_exceptions: bool = False,
+        priority=None,
+        cache: bool = True,
+    ) -> List:
+        """
+        get multiple resources concurrently
+
+        :param paths: the @odata.ids, duplicates are requested once
+        :param concurrency: the maximum number of concurrent requests, defaults to Config.connections
+        :param return_exceptions: return exceptions as results instead of raising the first one
+        :param cache: use cached values if available
+        :return: the results in the order of paths
+        """
+        paths = list(map(str, paths))
+        r = dict()
+        async for path, value in self.iter_many(paths, concurrency, return_exceptions, priority, cache):
+            r[path] = value
+        return [r[path] for path in paths]
 
-    async def get(self, path):
-        return await self._request(path, "get")
+    async def iter_many(
+        self,
+        paths: Iterable[str],
+        concurrency: int = None,
+        return_exceptions: bool = False,
+        priority=None,
+        cache: bool = True,
+    ) -> AsyncIterator[Tuple[str, typing.Any]]:
+        """
+        get multiple resources concurrently, yields (path, result) in the order of completion
 
-    async def patch(self, path, data, context):
-        return await self._request(path, "patch", data=data, context=context)
+        :param paths: the @odata.ids, duplicates are requested once
+        :param concurrency: the maximum number of concurrent requests, defaults to Config.connections
+        :param return_exceptions: yield exceptions as results instead of raising the first one
+        :param cache: use cached values if available
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.config.connections)
+
+        async def fetch(path):
+            try:
+                async with semaphore:
+                    return path, await self._request(path, "get", priority=priority, cache=cache)
+            except Exception as e:
+                if return_exceptions:
+                    return path, e
+                raise
+
+        tasks = [asyncio.create_task(fetch(path)) for path in dict.fromkeys(map(str, paths))]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def patch(self, path, data, context, priority=None):
+        return await self._request(path, "patch", data=data, context=context, priority=priority)
+
+    async def _request(self, path, method, parameters=None, data=None, context=None, priority=None, cache=True):
+        if self._cache is None:
+            return await self._request_uncached(path, method, parameters, data, context, priority)
+
+        key = str(yarl.URL(path).with_fragment(None))
+        if method != "get":
+            self._cache.invalidate(key)
+            return await self._request_uncached(path, method, parameters, data, context, priority)
+        if cache and (r := self._cache.get(key)) is not None:
+            return r
+        generation = self._cache.generation(key)
+        r = await self._request_uncached(path, method, parameters, data, context, priority)
+        self._cache.put(key, r, generation)
+        return r
 
-    async def _request(self, path, method, parameters=None, data=None, context=None):
-        p, routepath = self.routeOf(yarl.URL(path))
+    async def _request_uncached(self, path, method, parameters, data, context, priority):
+        url = yarl.URL(path)
+        p, routepath = self.routeOf(url)
         req = self.api._[(routepath, method)]
         if parameters is not None:
             p.update(parameters)
 
+        """OData query parameters - e.g. Members@odata.nextLink"""
+        req.req.params.update(url.query)
+
         """PATCH requires If-Match <etag> headers"""
         if method == "patch" and context and context.odata_etag_:
             req.req.headers["If-Match"] = context.odata_etag_
 
-        return await self._request_send(req, p, data, context)
-
-    async def _request_send(self, req, parameters, data, context=None, **kwargs):
-        r = await req(parameters=parameters, data=data, context=context, **kwargs)
+        return await self._request_send(req, p, data, context, priority=priority)
+
+    async def _request_send(self, req, parameters, data, context=None, priority=None, **kwargs):
+        async with bounded(), self._scheduler.slot(priority):
+            try:
+                r = await req(parameters=parameters, data=data, context=context, **kwargs)
+            except aiopenapi3.errors.HTTPStatusError as e:
+                """412 without RedfishError body"""
+                if e.http_status == 412:
+                    raise PreconditionFailed(None) from e
+                raise
         if isinstance(r, self._RedfishError):
+            if PreconditionFailed.matches(r):
+                raise PreconditionFailed(r)
             raise RedfishException(r)
         return r
 
+    @contextlib.asynccontextmanager
+    async def stream(self, path, query=None, headers=None, priority=None, scheduled=True):
+        """
+        GET without reading/validating the response body
+
+        async with client.stream(path) as (schema, response):
+            async for chunk in response.aiter_bytes():
+                …
+
+        :param query: additional query parameters
+        :param headers: additional request headers
+        :param scheduled: occupy a scheduler slot while the context is active, disable for long-lived streams (SSE)
+        :return: the Schema of the expected response and the httpx.Response
+        """
+        url = yarl.URL(path)
+        p, routepath = self.routeOf(url)
+        req = self.api._[(routepath, "get")]
+        req.req.params.update(url.query)
+        req.req.params.update(query or {})
+        req.req.headers.update(headers or {})
+
+        async with bounded(), (self._scheduler.slot(priority) if scheduled else contextlib.nullcontext()):
+            headers, schema_, session, result = await req.stream(parameters=p)
+            try:
+                if result.is_error:
+                    await result.aread()
+                    try:
+                        error = self._RedfishError.model_validate(json.loads(result.content))
+                    except ValueError:
+                        result.raise_for_status()
+                    raise RedfishException(error, result.status_code)
+                yield schema_, result
+            finally:
+                await result.aclose()
+                await session.aclose()
+
+    async def push(self, path: str, content, headers=None, timeout: httpx.Timeout = None) -> httpx.Response:
+        """
+        POST a streamed body to a path not described by the description document - e.g. a firmware image to the
+        MultipartHttpPushUri
+
+        The request does not occupy a scheduler slot.
+
+        :param content: bytes or an async iterator of bytes
+        :param timeout: defaults to 60s, 600s for the response once the body was sent
+        :raises RedfishException: the response is an error
+        """
+        headers = dict(headers or {})
+        auth = None
+        if (token := self.api._security.get("X-Auth", None)) is not None:
+            headers["X-Auth-Token"] = token
+        else:
+            auth = httpx.BasicAuth(*self.api._security["basicAuth"])
+        url = str(self.api._base_url.join(yarl.URL(path)))
+
+        async with bounded():
+            async with self.api._session_factory(auth=auth) as session:
+                result = await session.post(
+                    url, content=content, headers=headers, timeout=timeout or httpx.Timeout(60, read=600)
+                )
+                if result.is_error:
+                    try:
+                        error = self._RedfishError.model_validate(json.loads(result.content))
+                    except ValueError:
+                        result.raise_for_status()
+                    raise RedfishException(error, result.status_code)
+                return result
+
+    @property
+    def hub(self) -> EventHub:
+        """
+        the EventHub sharing a single SSE connection with all subscribers of the client
+        """
+        if self._hub is None:
+            self._hub = EventHub(self)
+        return self._hub
+
     @property
     def AccountService(self) -> "AsyncAccountService":
         return self._serviceroot.AccountService
@@ -0,0 +1,86 @@
+import asyncio
+import contextlib
+import contextvars
+from typing import Optional, Tuple
+
+
+"""(loop time of the deadline, minimum time required to start a request)"""
+_deadline: contextvars.ContextVar[Optional[Tuple[float, float]]] = contextvars.ContextVar("deadline", default=None)
+
+
+class Deadline:
+    """
+    a budget for everything awaited within the context
+
+    async with client.deadline(30):
+        async for system in client.Systems.list():
+            …
+
+    nested deadlines can only shorten the budget.
+    requests check the remaining budget before starting and are refused with TimeoutError if less than minimum
+    seconds are left, running requests are bounded by the remaining budget.
+    """
+
+    def __init__(self, timeout: float, minimum: float = 0.0):
+        self.timeout = timeout
+        self.minimum = minimum
+        self.when: Optional[float] = None
+        self._token = None
+        self._timeout = None
+
+    async def __aenter__(self) -> "Deadline":
+        when = asyncio.get_running_loop().time() + self.timeout
+        if (current := _deadline.get()) is not None:
+            when = min(when, current[0])
+        self.when = when
+        self._timeout = asyncio.timeout_at(when)
+        self._token = _deadline.set((when, max(self.minimum, current[1] if current else 0.0)))
+        await self._timeout.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        _deadline.reset(self._token)
+        return await self._timeout.__aexit__(exc_type, exc_val, exc_tb)
+
+
+def remaining() -> Optional[float]:
+    """
+    :return: seconds left in the current budget, None if there is no deadline
+    """
+    if (current := _deadline.get()) is None:
+        return None
+    return current[0] - asyncio.get_running_loop().time()
+
+
+def check() -> Optional[float]:
+    """
+    refuse to start work which can not finish within the budget
+
+    :return: seconds left in the current budget, None if there is no deadline
+    """
+    if (current := _deadline.get()) is None:
+        return None
+    if (left := current[0] - asyncio.get_running_loop().time()) <= current[1]:
+        raise TimeoutError(f"deadline exceeded ({left:.1f}s left)")
+    return left
+
+
+def bounded():
+    """
+    bound the awaited operation by the remaining budget
+
+    required for Tasks created within a Deadline, the contextvars are copied but the timer does not apply
+    """
+    if (current := _deadline.get()) is None:
+        return contextlib.nullcontext()
+    check()
+    return asyncio.timeout_at(current[0])
+
+
+async def sleep(delay: float) -> None:
+    """
+    asyncio.sleep - raise TimeoutError early in case the budget does not cover the delay
+    """
+    if (left := remaining()) is not None and left <= delay:
+        raise TimeoutError(f"deadline exceeded ({left:.1f}s left, {delay}s required)")
+    await asyncio.sleep(delay)
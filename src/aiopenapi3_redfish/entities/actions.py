@@ -20,12 +20,14 @@ class Action:
     def data(self):
         return self.req.data.get_type()
 
-    async def __call__(self, *args, parameters: Optional[Dict[str, str]] = None, data=None, **kwargs):
+    async def __call__(self, *args, parameters: Optional[Dict[str, str]] = None, data=None, priority=None, **kwargs):
         if parameters:
             parameters.update(self.parameters)
         else:
             parameters = self.parameters
-        r = await self._client._request_send(self.req, parameters=parameters, data=data, *args, **kwargs)
+        r = await self._client._request_send(
+            self.req, parameters=parameters, data=data, priority=priority, *args, **kwargs
+        )
         return r
 
 
@@ -1,11 +1,32 @@
 import asyncio
-from typing import Literal
+import contextlib
+import datetime
+import functools
+import json
+import re
+import typing
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Literal, NamedTuple, Optional, Set, Tuple, Union
+
+import httpx
+import yarl
 
 import aiopenapi3.errors
 
 import aiopenapi3_redfish.entities.actions
 from aiopenapi3_redfish.base import AsyncResourceRoot, AsyncCollection
 from aiopenapi3_redfish.oem import Detour
+from aiopenapi3_redfish.scheduler import Priority
+from aiopenapi3_redfish.deadline import Deadline, sleep
+from aiopenapi3_redfish.errors import RedfishException
+from aiopenapi3_redfish.sse import SSEParser
+from aiopenapi3_redfish.hub import _field, _origin, _originkeys
+from aiopenapi3_redfish.metrics import MetricStore
+from aiopenapi3_redfish.tasks import WorkerPool
+from aiopenapi3_redfish.firmware import Bandwidth, FirmwareImage, Upload, multipart
+
+if typing.TYPE_CHECKING:
+    from aiopenapi3_redfish.client import AsyncClient
+    from aiopenapi3_redfish.tasks import Result
 
 
 @Detour("/redfish/v1/AccountService")
@@ -42,7 +63,7 @@ class AsyncChassis(AsyncResourceRoot):
     async def Reset(self, ResetType: str):
         action: aiopenapi3_redfish.entities.actions.Action = self.Actions["#Chassis.Reset"]
         data = action.data.model_validate(dict(ResetType=ResetType))
-        return await action(data=data)
+        return await action(data=data, priority=Priority.interactive)
 
 
 @Detour("/redfish/v1/EventService")
@@ -55,6 +76,126 @@ class AsyncEventService(AsyncResourceRoot):
         r = await action(data=data.model_dump(exclude_unset=True, by_alias=True))
         return
 
+    async def subscribe(
+        self,
+        Destination: str,
+        Context: str = None,
+        Protocol: str = "Redfish",
+        SubscriptionType: str = "RedfishEvent",
+        **kwargs,
+    ) -> AsyncResourceRoot:
+        """
+        create an EventDestination for push events
+
+        :param Destination: the url events are POSTed to
+        :param Context: the Context included with each event
+        :param kwargs: additional EventDestination properties, e.g. EventFormatType, RegistryPrefixes
+        """
+        data = dict(Destination=Destination, Protocol=Protocol, SubscriptionType=SubscriptionType, **kwargs)
+        if Context is not None:
+            data["Context"] = Context
+        self._client.log.info(f"EventService subscribe {Destination}")
+        value = await self._client._request(f"{self.odata_id_}/Subscriptions", "post", data=data)
+        return AsyncResourceRoot(self._client, value)
+
+    async def unsubscribe(self, odata_id_: str) -> None:
+        """
+        remove an EventDestination
+        """
+        self._client.log.info(f"EventService unsubscribe {odata_id_}")
+        await self._client.delete(odata_id_)
+
+    def validate(self, payload: Union[str, bytes, dict]) -> Union["pydantic.BaseModel", dict]:
+        """
+        validate an Event/MetricReport payload using the model of its @odata.type
+
+        :return: the model, the dict if the model is not available or the payload is invalid,
+            the payload as received if it is not a json object
+        """
+        try:
+            if not isinstance(payload, dict):
+                payload = json.loads(payload)
+            return self._client.modelOf(payload["@odata.type"]).model_validate(payload)
+        except (KeyError, TypeError, ValueError) as e:
+            self._client.log.debug(f"event not validated {e!r}")
+            return payload
+
+    async def events(
+        self,
+        maxsize: int = 16,
+        filter: str = None,
+        backoff: Tuple[float, float] = (1, 60),
+        onConnection: Callable[[bool], Any] = None,
+    ):
+        """
+        Server-Sent Events from ServerSentEventUri
+
+        async for event in client.EventService.events():
+            …
+
+        The stream is re-established using Last-Event-ID with exponential backoff.
+        Events are buffered in a bounded queue, the stream is not read while the queue is full.
+
+        :param maxsize: events buffered
+        :param filter: $filter, e.g. "EventType eq 'ResourceUpdated'"
+        :param backoff: (initial, maximum) delay between reconnects
+        :param onConnection: called with True once the stream is connected, False once it is disconnected
+        :return: the Event/MetricReport models (or dict if not available)
+        """
+        queue = asyncio.Queue(maxsize)
+        task = asyncio.create_task(self._sse(queue, filter, backoff, onConnection))
+        try:
+            while True:
+                item = await queue.get()
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _sse(
+        self,
+        queue: asyncio.Queue,
+        filter: Optional[str],
+        backoff: Tuple[float, float],
+        onConnection: Optional[Callable[[bool], Any]],
+    ) -> None:
+        delay = backoff[0]
+        parser = SSEParser()
+        while True:
+            headers = {"Accept": "text/event-stream"}
+            if parser.last_id is not None:
+                headers["Last-Event-ID"] = parser.last_id
+            query = {"$filter": filter} if filter else None
+            connected = False
+            try:
+                async with self._client.stream(
+                    self.ServerSentEventUri, query=query, headers=headers, scheduled=False
+                ) as (_, response):
+                    self._client.log.info(f"SSE connected {parser.last_id=}")
+                    delay = backoff[0]
+                    connected = True
+                    if onConnection is not None:
+                        onConnection(True)
+                    async for chunk in response.aiter_bytes():
+                        for event in parser.feed(chunk):
+                            if event.retry is not None:
+                                delay = event.retry / 1000
+                            if event.data:
+                                await queue.put(self.validate(event.data))
+            except (aiopenapi3.errors.RequestError, httpx.HTTPError, ConnectionError) as e:
+                self._client.log.warning(f"SSE disconnected {e!r}")
+            except Exception as e:
+                await queue.put(e)
+                return
+            finally:
+                if connected and onConnection is not None:
+                    onConnection(False)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, backoff[1])
+
 
 @Detour("/redfish/v1/Fabrics/{FabricId}")
 @Detour("#Fabric..Fabric")
@@ -66,29 +207,104 @@ class AsyncFabric(AsyncResourceRoot):
 @Detour("#JobService..JobService")
 @Detour("#ServiceRoot..ServiceRoot/JobService")
 class AsyncJobService(AsyncResourceRoot):
-    async def wait_for(self, *JobIds: str, pollInterval: int = 7, maxWait: int = 700) -> AsyncResourceRoot:
+    PendingStates = frozenset(
+        {
+            "New",
+            "Pending",
+            "Scheduled",
+            "Starting",
+            "Running",
+            "Suspended",
+            "Stopping",
+            "Service",
+            "UserIntervention",
+            "Continue",
+            "Validating",
+        }
+    )
+    FailedStates = frozenset({"Cancelled", "Exception", "Interrupted"})
+
+    @classmethod
+    def classify(cls, job: AsyncResourceRoot) -> Optional[bool]:
+        """
+        :return: None for pending Jobs, True for completed Jobs, False for failed Jobs
+        """
+        state, status = (getattr(v, "value", v) for v in (job.JobState, job.JobStatus))
+        if status not in ("OK", None) or state in cls.FailedStates:
+            return False
+        if state in cls.PendingStates:
+            return None
+        return True
+
+    async def watch(
+        self, *JobIds: str, pollInterval: float = 7, maxWait: float = 700, events: bool = True
+    ) -> AsyncIterator[AsyncResourceRoot]:
+        """
+        yields the Jobs in the order of completion - failed Jobs included, see classify()
+
+        The pending Jobs are requested concurrently once per pollInterval.
+        Events for a Job received via the EventHub start the next round early.
+
+        :raises TimeoutError: with the JobIds pending after maxWait
+        """
+        loop = asyncio.get_running_loop()
+        base = self.Jobs._v.odata_id_
+        pending = {f"{base}/{JobId}": JobId for JobId in dict.fromkeys(JobIds)}
+        wakeup = asyncio.Event()
+
+        async def listen(subscription):
+            async with subscription:
+                with contextlib.suppress(Exception):
+                    async for _ in subscription:
+                        wakeup.set()
+
+        watcher = None
+        if events and pending:
+            watcher = asyncio.create_task(listen(self._client.hub.subscribe(OriginOfCondition=list(pending))))
+
+        until = loop.time() + maxWait
+        try:
+            while pending:
+                if (now := loop.time()) >= until:
+                    raise TimeoutError(*pending.values())
+                wakeup.clear()
+                try:
+                    async with Deadline(until - now):
+                        values = await self._client.get_many(list(pending), cache=False)
+                except TimeoutError as e:
+                    raise TimeoutError(*pending.values()) from e
+
+                for path, value in zip(list(pending), values):
+                    job = await self.Jobs.T.asyncFromValue(self._client, path, value)
+                    if self.classify(job) is not None:
+                        del pending[path]
+                        yield job
+
+                if pending:
+                    with contextlib.suppress(TimeoutError):
+                        async with asyncio.timeout_at(min(until, now + pollInterval)):
+                            await wakeup.wait()
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+                await asyncio.gather(watcher, return_exceptions=True)
+
+    async def wait_for(
+        self, *JobIds: str, pollInterval: float = 7, maxWait: float = 700
+    ) -> Tuple[Set[str], List[AsyncResourceRoot], List[AsyncResourceRoot]]:
+        """
+        :return: the JobIds pending after maxWait, the Jobs completed, the Jobs failed
+        """
         todo = set(JobIds)
         done = list()
         error = list()
 
-        while len(todo):
-            for JobId in list(todo):
-                print(f"{len(todo)=} {len(done)=} {len(error)=}")
-                job = await self.Jobs.index(JobId)
-                if job.JobStatus != "OK":
-                    error.append(job)
-                else:
-                    if job.JobState == "Completed":
-                        print(job)
-                        done.append(job)
-                    elif job.JobState in ("Running", "Scheduled"):
-                        await asyncio.sleep(pollInterval)
-                        continue
-                    else:
-                        await asyncio.sleep(pollInterval)
-                        continue
-                await asyncio.sleep(pollInterval)
-                todo.discard(JobId)
+        try:
+            async for job in self.watch(*JobIds, pollInterval=pollInterval, maxWait=maxWait):
+                todo.discard(job.Id)
+                (done if self.classify(job) else error).append(job)
+        except TimeoutError as e:
+            self._client.log.warning(f"JobService.wait_for timed out waiting for {e.args}")
 
         return todo, done, error
 
@@ -144,45 +360,146 @@ class AsyncSystem(AsyncResourceRoot):
         self._client.log.info(f"Action #ComputerSystem.Reset {ResetType}")
         action: aiopenapi3_redfish.entities.actions.Action = self.Actions["#ComputerSystem.Reset"]
         data = action.data.model_validate(dict(ResetType=ResetType))
-        r = await action(data=data.model_dump(exclude_unset=True, by_alias=True))
+        r = await action(data=data.model_dump(exclude_unset=True, by_alias=True), priority=Priority.interactive)
         return r
 
-    async def togglePower(self, powerState=None):
+    async def readPowerState(self) -> Optional[str]:
+        """
+        request the PowerState only ($select) - the ComputerSystem is not validated
+        """
+        async with self._client.stream(self.odata_id_, query={"$select": "PowerState"}) as (schema_, response):
+            return json.loads(await response.aread()).get("PowerState", None)
+
+    async def powerStates(
+        self, minInterval: float = 1, maxInterval: float = 15, events: bool = True
+    ) -> AsyncIterator[Optional[str]]:
+        """
+        yields the current PowerState and every change
+
+        Events for the System received via the EventHub trigger reading the PowerState.
+        Until an event was received on a connected SSE stream, the PowerState is polled starting at minInterval, backing
+        off to maxInterval - then at maxInterval.
+        """
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        received = False
+
+        async def listen(subscription):
+            nonlocal received
+            async with subscription:
+                with contextlib.suppress(Exception):
+                    async for _ in subscription:
+                        received = True
+                        wakeup.set()
+
+        listener = None
+        if events:
+            listener = asyncio.create_task(listen(self._client.hub.subscribe(OriginOfCondition=self.odata_id_)))
+
+        current = interval = None
+        try:
+            while True:
+                wakeup.clear()
+                try:
+                    state = await self.readPowerState()
+                except (
+                    aiopenapi3.errors.RequestError,
+                    aiopenapi3.errors.ResponseError,
+                    RedfishException,
+                    httpx.HTTPError,
+                    ConnectionError,
+                ) as e:
+                    """the BMC may be unavailable during transitions - e.g. 503 while it resets"""
+                    self._client.log.debug(f"PowerState {e!r}")
+                else:
+                    if interval is None or state != current:
+                        current, interval = state, minInterval
+                        yield state
+                    else:
+                        interval = min(interval * 1.5, maxInterval)
+
+                live = received and self._client.hub.connected
+                until = loop.time() + (maxInterval if live else interval or minInterval)
+                with contextlib.suppress(TimeoutError):
+                    async with asyncio.timeout_at(until):
+                        await wakeup.wait()
+        finally:
+            if listener is not None:
+                listener.cancel()
+                await asyncio.gather(listener, return_exceptions=True)
+
+    async def waitPowerState(self, state: str, timeout: float = 600, **kwargs) -> None:
+        """
+        :param kwargs: see powerStates()
+        :raises TimeoutError: the PowerState did not change to state within timeout
+        """
+        async with Deadline(timeout), contextlib.aclosing(self.powerStates(**kwargs)) as states:
+            async for current in states:
+                if current == state:
+                    return
+
+    async def togglePower(self, powerState=None, policy: "PowerPolicy" = None):
+        """
+        :param powerState: the current PowerState, requested if None
+        :param policy: the escalation of Resets, defaults to PowerPolicy()
+        """
+        with self._client.priority(Priority.interactive):
+            return await self._togglePower(powerState, policy or PowerPolicy())
+
+    async def _togglePower(self, powerState, policy: "PowerPolicy"):
         if powerState is None:
-            await self.refresh()
-            powerState = self.PowerState
+            powerState = await self.readPowerState()
 
-        state = {"On": "Off", "Off": "On"}[powerState]
+        state = {"On": "Off", "Off": "On"}[getattr(powerState, "value", powerState)]
 
         self._client.log.info(f"togglePower {powerState} -> {state}")
 
-        async def pollState():
-            while self.PowerState != state:
-                await asyncio.sleep(15)
-                try:
-                    await self.refresh()
-                except aiopenapi3.errors.ResponseSchemaError:
-                    pass
-
-        if state == "Off":
-            if self.PowerState != "Off":
-                await self.Reset("GracefulShutdown")
-                try:
-                    await asyncio.wait_for(pollState(), 600)
-                except TimeoutError:
-                    await self.Reset("ForceOff")
-        elif state == "On":
+        for ResetType, timeout in policy.steps(state):
+            if await self.readPowerState() != state:
+                await self.Reset(ResetType)
             try:
-                if self.PowerState == "Off":
-                    await self.Reset("On")
-                await asyncio.wait_for(pollState(), 600)
+                await self.waitPowerState(
+                    state, timeout, minInterval=policy.minInterval, maxInterval=policy.maxInterval
+                )
+                break
             except TimeoutError:
-                await self.Reset("ForceRestart")
+                self._client.log.info(f"togglePower {ResetType} did not reach {state} within {timeout}s")
+        else:
+            raise TimeoutError(state)
 
         await self.refresh()
         assert self.PowerState == state
 
 
+class PowerPolicy:
+    """
+    the escalation of power transitions in AsyncSystem.togglePower
+
+    the Resets for the desired PowerState are issued in order, each is given timeout seconds to reach the PowerState
+    the defaults try GracefulShutdown before ForceOff and On before ForceRestart
+    """
+
+    def __init__(
+        self,
+        Off: Iterable[Tuple[str, float]] = (("GracefulShutdown", 600), ("ForceOff", 120)),
+        On: Iterable[Tuple[str, float]] = (("On", 600), ("ForceRestart", 600)),
+        minInterval: float = 1,
+        maxInterval: float = 15,
+    ):
+        """
+        :param Off: (ResetType, timeout) to power off
+        :param On: (ResetType, timeout) to power on
+        :param minInterval: see AsyncSystem.powerStates()
+        :param maxInterval: see AsyncSystem.powerStates()
+        """
+        self._steps = dict(Off=tuple(Off), On=tuple(On))
+        self.minInterval = minInterval
+        self.maxInterval = maxInterval
+
+    def steps(self, state: str) -> Tuple[Tuple[str, float], ...]:
+        return self._steps[state]
+
+
 @Detour("/redfish/v1/TaskService")
 @Detour("#TaskService..TaskService")
 @Detour("#ServiceRoot..ServiceRoot/Tasks")
@@ -190,51 +507,374 @@ class AsyncTaskService(AsyncResourceRoot):
     class AsyncTask(AsyncResourceRoot):
         pass
 
+    PendingStates = frozenset({"New", "Pending", "Starting", "Running", "Stopping", "Cancelling", "Suspended"})
+
     async def wait_for(self, TaskId: str, pollInterval: int = 7, maxWait: int = 700) -> AsyncTask:
-        for i in range(maxWait // pollInterval):
-            r = await self.Tasks.index(TaskId)
-            if not isinstance(r, AsyncResourceRoot):
-                raise TypeError(r)
-            if r.TaskState == "Running" and r.TaskStatus == "OK":
-                await asyncio.sleep(pollInterval)
-                continue
-            break
-        else:
-            raise TimeoutError(TaskId)
+        try:
+            async with Deadline(maxWait):
+                while True:
+                    r = await self.Tasks.index(TaskId)
+                    if not isinstance(r, AsyncResourceRoot):
+                        raise TypeError(r)
+                    if r.TaskState == "Running" and r.TaskStatus == "OK":
+                        await sleep(pollInterval)
+                        continue
+                    break
+        except TimeoutError as e:
+            raise TimeoutError(TaskId) from e
         return r
 
+    def _monitorResult(self, TaskId: str, value) -> Union[AsyncTask, bytes]:
+        """
+        a TaskMonitor returned something else than a Task
+        """
+        raise TypeError(value)
+
+    @classmethod
+    def _pending(cls, task: AsyncTask) -> bool:
+        state, status = (getattr(v, "value", v) for v in (task.TaskState, task.TaskStatus))
+        return state in cls.PendingStates and status in ("OK", None)
+
+    async def wait_for_many(
+        self,
+        TaskIds: Iterable[str],
+        pollInterval: float = 7,
+        maxWait: float = 700,
+        maxInterval: float = 60,
+        events: bool = True,
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[Tuple[str, Union[AsyncTask, bytes, Exception]]]:
+        """
+        wait for multiple Tasks, yields (TaskId, Task) in the order of completion
+
+        The pending Tasks are polled in rounds via concurrent GETs.
+        The interval per Task adapts to its PercentComplete/EstimatedDuration, starting at pollInterval.
+        While the SSE stream of the EventHub is connected, a Task is polled on its TaskEvents and maxInterval otherwise.
+
+        :param return_exceptions: yield exceptions for a Task instead of raising
+        :raises TimeoutError: with the TaskIds pending after maxWait
+        """
+        loop = asyncio.get_running_loop()
+        base = self.Tasks._v.odata_id_
+        pending = {f"{base}/{TaskId}": _TaskPoll(TaskId, loop.time(), pollInterval) for TaskId in TaskIds}
+        wakeup = asyncio.Event()
+
+        async def watch(subscription):
+            async with subscription:
+                with contextlib.suppress(Exception):
+                    async for event, record in subscription:
+                        for path in _originkeys(_origin(record) or ""):
+                            if (poll := pending.get(path, None)) is not None:
+                                poll.due = loop.time()
+                                wakeup.set()
+                                break
+
+        watcher = None
+        if events and pending:
+            subscription = self._client.hub.subscribe(MessageId="TaskEvent", OriginOfCondition=list(pending))
+            watcher = asyncio.create_task(watch(subscription))
+        until = loop.time() + maxWait
+        try:
+            while pending:
+                if (now := loop.time()) >= until:
+                    raise TimeoutError(*[poll.TaskId for poll in pending.values()])
+                if (due := [path for path, poll in pending.items() if poll.due <= now + pollInterval / 2]) == []:
+                    wakeup.clear()
+                    with contextlib.suppress(TimeoutError):
+                        async with asyncio.timeout_at(min(until, *(poll.due for poll in pending.values()))):
+                            await wakeup.wait()
+                    continue
+
+                try:
+                    async with Deadline(until - now):
+                        values = await self._client.get_many(due, return_exceptions=True, cache=False)
+                except TimeoutError as e:
+                    raise TimeoutError(*[poll.TaskId for poll in pending.values()]) from e
+
+                for path, value in zip(due, values):
+                    poll = pending[path]
+                    if isinstance(value, Exception):
+                        if not return_exceptions:
+                            raise value
+                        del pending[path]
+                        yield poll.TaskId, value
+                        continue
+
+                    r = await self.Tasks.T.asyncFromValue(self._client, path, value)
+                    if not isinstance(r, AsyncResourceRoot):
+                        del pending[path]
+                        yield poll.TaskId, self._monitorResult(poll.TaskId, r)
+                    elif self._pending(r):
+                        """TaskEvents can only arrive while the SSE stream is connected"""
+                        live = watcher is not None and self._client.hub.connected
+                        poll.update(r, loop.time(), maxInterval if live else None, maxInterval)
+                    else:
+                        del pending[path]
+                        yield poll.TaskId, r
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+                await asyncio.gather(watcher, return_exceptions=True)
+
+
+class _TaskPoll:
+    """
+    the schedule of polling a Task
+
+    the interval is half of the remaining time estimated, either via EstimatedDuration or the progress observed
+    without estimation, the interval grows by 1.5 per poll
+    """
+
+    _duration = re.compile(r"P(?:(?P<D>\d+)D)?(?:T(?:(?P<H>\d+)H)?(?:(?P<M>\d+)M)?(?:(?P<S>[\d.]+)S)?)?$")
+
+    def __init__(self, TaskId: str, now: float, interval: float):
+        self.TaskId = TaskId
+        self.due = now
+        self.interval = interval
+        self._first: Optional[Tuple[float, float]] = None
+
+    @classmethod
+    def duration(cls, value) -> Optional[float]:
+        """
+        ISO 8601 duration - e.g. PT5M30S
+        """
+        if value is None:
+            return None
+        if isinstance(value, datetime.timedelta):
+            return value.total_seconds()
+        if (m := cls._duration.match(str(value))) is None:
+            return None
+        f = dict(D=86400, H=3600, M=60, S=1)
+        return sum(float(v) * f[k] for k, v in m.groupdict().items() if v)
+
+    def update(self, task, now: float, interval: Optional[float], maxInterval: float) -> None:
+        if interval is None:
+            percent = task.PercentComplete
+            remaining = None
+            if percent is not None and (estimated := self.duration(task.EstimatedDuration)) is not None:
+                remaining = estimated * (100 - percent) / 100
+            elif percent is not None:
+                if self._first is None:
+                    self._first = (now, percent)
+                elif percent > (p0 := self._first[1]):
+                    remaining = (now - self._first[0]) * (100 - percent) / (percent - p0)
+
+            if remaining is not None:
+                interval = remaining / 2
+            else:
+                interval = self.interval * 1.5
+        self.interval = min(max(interval, 1), maxInterval)
+        self.due = now + self.interval
+
 
 @Detour("/redfish/v1/TelemetryService")
 @Detour("#TelemetryService..TelemetryService")
 @Detour("#ServiceRoot..ServiceRoot/TelemetryService")
 class AsyncTelemetryService(AsyncResourceRoot):
+    async def readMetricReport(self, Id: str) -> dict:
+        """
+        the MetricReport as decoded json - MetricValues are not validated
+        """
+        async with self._client.stream(f"{self.MetricReports._v.odata_id_}/{Id}") as (schema_, response):
+            return json.loads(await response.aread())
+
+    async def collect(self, store: "MetricStore", *Ids: str) -> int:
+        """
+        request the MetricReports concurrently and ingest them into the store
+
+        :return: the number of samples added
+        """
+        reports = await asyncio.gather(*[self.readMetricReport(Id) for Id in Ids])
+        return sum(store.ingest(report) for report in reports)
+
+    async def ingest(self, store: "MetricStore", Ids: Iterable[str] = None) -> None:
+        """
+        ingest the MetricReports received via the EventHub into the store, until cancelled
+
+        :param Ids: the MetricReports to ingest, None for all
+        """
+        async with self._client.hub.subscribe(EventType="MetricReport") as subscription:
+            async for report, _ in subscription:
+                if Ids is None or _field(report, "Id") in Ids:
+                    store.ingest(report)
+
+    async def _json(self, path: str) -> dict:
+        async with self._client.stream(path) as (schema_, response):
+            return json.loads(await response.aread())
+
+    async def _action(self, name: str, **kwargs):
+        action = self.Actions[name]
+        data = None
+        if action.req.data is not None:
+            data = action.data.model_validate(kwargs).model_dump(exclude_unset=True, by_alias=True)
+        return await action(data=data)
+
     async def ClearMetricReports(self):
         """
         '#TelemetryService.ClearMetricReports':
           target: /redfish/v1/TelemetryService/Actions/TelemetryService.ClearMetricReports
         """
-        raise NotImplementedError()
+        return await self._action("#TelemetryService.ClearMetricReports")
 
     async def ResetMetricReportDefinitionsToDefaults(self):
         """
         '#TelemetryService.ResetMetricReportDefinitionsToDefaults':
           target: /redfish/v1/TelemetryService/Actions/TelemetryService.ResetMetricReportDefinitionsToDefaults
         """
-        raise NotImplementedError()
+        return await self._action("#TelemetryService.ResetMetricReportDefinitionsToDefaults")
 
-    async def SubmitTestMetricReport(self):
+    async def SubmitTestMetricReport(self, MetricReportName: str, **kwargs):
         """
         '#TelemetryService.SubmitTestMetricReport':
           target: /redfish/v1/TelemetryService/Actions/TelemetryService.SubmitTestMetricReport
+
+        :param kwargs: MetricReportValues/GeneratedMetricReportValues
         """
-        raise NotImplementedError()
+        return await self._action(
+            "#TelemetryService.SubmitTestMetricReport", MetricReportName=MetricReportName, **kwargs
+        )
+
+    async def metricReportDefinitions(self) -> Dict[str, dict]:
+        """
+        the MetricReportDefinitions as decoded json, requested concurrently
+        """
+        collection = await self._json(self.MetricReportDefinitions._v.odata_id_)
+        paths = [i["@odata.id"] for i in collection.get("Members", [])]
+        values = await asyncio.gather(*map(self._json, paths))
+        return {value["Id"]: value for value in values}
+
+    async def createMetricReportDefinition(
+        self,
+        Id: str,
+        Metrics: List[dict],
+        MetricReportDefinitionType: Literal["Periodic", "OnChange", "OnRequest"] = "Periodic",
+        RecurrenceInterval: str = None,
+        ReportActions: Iterable[str] = ("LogToMetricReportsCollection",),
+        **kwargs,
+    ) -> AsyncResourceRoot:
+        """
+        create a MetricReportDefinition
+
+        await client.TelemetryService.createMetricReportDefinition(
+            "CPUPower", [{"MetricId": "CPUPower", "MetricProperties": ["/redfish/v1/Chassis/{ChassisId}/Sensors/{SensorId}"],
+                          "CollectionFunction": "Average", "CollectionDuration": "PT60S"}],
+            RecurrenceInterval="PT60S", Wildcards=[{"Name": "ChassisId", "Values": ["1"]}, …])
+
+        :param Metrics: the Metrics, including CollectionFunction/CollectionDuration for aggregation by the service
+        :param RecurrenceInterval: the Schedule of Periodic reports - ISO 8601 duration
+        :param kwargs: additional properties, e.g. Wildcards, ReportUpdates, ReportTimespan, MetricReportHeartbeatInterval
+        """
+        data = self._metricReportDefinition(
+            Id, Metrics, MetricReportDefinitionType, RecurrenceInterval, ReportActions, **kwargs
+        )
+        self._client.log.info(f"TelemetryService create MetricReportDefinition {Id}")
+        value = await self._client._request(self.MetricReportDefinitions._v.odata_id_, "post", data=data)
+        return AsyncResourceRoot(self._client, value)
+
+    @staticmethod
+    def _metricReportDefinition(
+        Id: str,
+        Metrics: List[dict],
+        MetricReportDefinitionType: Literal["Periodic", "OnChange", "OnRequest"] = "Periodic",
+        RecurrenceInterval: str = None,
+        ReportActions: Iterable[str] = ("LogToMetricReportsCollection",),
+        **kwargs,
+    ) -> dict:
+        """
+        the properties POSTed by createMetricReportDefinition
+        """
+        data = dict(
+            Id=Id,
+            Metrics=list(Metrics),
+            MetricReportDefinitionType=MetricReportDefinitionType,
+            ReportActions=list(ReportActions),
+            **kwargs,
+        )
+        if RecurrenceInterval is not None:
+            data["Schedule"] = dict(RecurrenceInterval=RecurrenceInterval)
+        return data
+
+    async def updateMetricReportDefinition(self, Id: str, **properties) -> None:
+        self._client.log.info(f"TelemetryService update MetricReportDefinition {Id} {sorted(properties)}")
+        await self._client.patch(f"{self.MetricReportDefinitions._v.odata_id_}/{Id}", properties, None)
+
+    async def deleteMetricReportDefinition(self, Id: str) -> None:
+        self._client.log.info(f"TelemetryService delete MetricReportDefinition {Id}")
+        await self._client.delete(f"{self.MetricReportDefinitions._v.odata_id_}/{Id}")
+
+    async def reconcile(self, desired: Dict[str, dict], prune: bool = False) -> "Reconciled":
+        """
+        create/update the MetricReportDefinitions to match desired - properties not in desired are not compared
+
+        only the properties which differ are PATCHed, a MetricReportDefinition matching desired is not modified
+
+        :param desired: the arguments of createMetricReportDefinition by Id - the defaults are compared as well
+        :param prune: delete the MetricReportDefinitions not in desired
+        """
+        current = await self.metricReportDefinitions()
+        r = Reconciled([], [], [], [])
+        for Id, arguments in desired.items():
+            data = self._metricReportDefinition(**{**arguments, "Id": Id})
+            properties = {k: v for k, v in data.items() if k != "Id"}
+            if Id not in current:
+                self._client.log.info(f"TelemetryService create MetricReportDefinition {Id}")
+                await self._client._request(self.MetricReportDefinitions._v.odata_id_, "post", data=data)
+                r.created.append(Id)
+            elif changed := {k: v for k, v in properties.items() if not _contains(v, current[Id].get(k, None))}:
+                await self.updateMetricReportDefinition(Id, **changed)
+                r.updated.append(Id)
+            else:
+                r.unchanged.append(Id)
+        if prune:
+            for Id in current.keys() - desired.keys():
+                await self.deleteMetricReportDefinition(Id)
+                r.deleted.append(Id)
+        return r
+
+    @staticmethod
+    async def reconcileFleet(
+        clients: Iterable["AsyncClient"], desired: Dict[str, dict], prune: bool = False, concurrency: int = 32
+    ) -> AsyncIterator["Result"]:
+        """
+        reconcile() the MetricReportDefinitions of many services
+
+        :return: the Results in the order of completion, the item is the client, the value Reconciled
+        """
+        pool = WorkerPool(lambda client: client.TelemetryService.reconcile(desired, prune), concurrency=concurrency)
+        async for r in pool.map(clients):
+            yield r
+
+
+class Reconciled(NamedTuple):
+    created: List[str]
+    updated: List[str]
+    deleted: List[str]
+    unchanged: List[str]
+
+
+def _contains(want, have) -> bool:
+    """
+    have matches want, additional properties in have are ignored
+    """
+    if isinstance(want, dict):
+        return isinstance(have, dict) and all(k in have and _contains(v, have[k]) for k, v in want.items())
+    if isinstance(want, (list, tuple)):
+        return isinstance(have, list) and len(want) == len(have) and all(_contains(a, b) for a, b in zip(want, have))
+    return want == have
 
 
 @Detour("/redfish/v1/UpdateService")
 @Detour("#UpdateService._.UpdateService")
 @Detour("#ServiceRoot..ServiceRoot/UpdateService")
 class AsyncUpdateService(AsyncResourceRoot):
-    async def SimpleUpdate(self):
+    async def _action(self, name: str, **kwargs):
+        action = self.Actions[name]
+        data = None
+        if action.req.data is not None:
+            data = action.data.model_validate(kwargs).model_dump(exclude_unset=True, by_alias=True)
+        return await action(data=data)
+
+    async def SimpleUpdate(self, ImageURI: str, **kwargs):
         """
         '#UpdateService.SimpleUpdate':
           '@Redfish.OperationApplyTimeSupport':
@@ -250,12 +890,79 @@ class AsyncUpdateService(AsyncResourceRoot):
           - TFTP
           - HTTPS
           target: /redfish/v1/UpdateService/Actions/UpdateService.SimpleUpdate
+
+        :param kwargs: TransferProtocol, Targets, Username, Password, …
         """
-        raise NotImplementedError()
+        return await self._action("#UpdateService.SimpleUpdate", ImageURI=ImageURI, **kwargs)
 
     async def StartUpdate(self):
         """
         '#UpdateService.StartUpdate':
           target: /redfish/v1/UpdateService/Actions/UpdateService.StartUpdate
         """
-        raise NotImplementedError()
+        return await self._action("#UpdateService.StartUpdate")
+
+    async def upload(
+        self,
+        image: FirmwareImage,
+        Targets: List[str] = None,
+        ApplyTime: str = "Immediate",
+        progress: Callable[[int, int], Any] = None,
+        bandwidth: Bandwidth = None,
+        chunk_size: int = 1024 * 1024,
+        wait: bool = True,
+        maxWait: float = 3600,
+        **parameters,
+    ) -> Upload:
+        """
+        push the image to the MultipartHttpPushUri - streamed from the mapped file
+
+        with FirmwareImage("iDRAC-with-Lifecycle-Controller_Firmware_XXXX.EXE") as image:
+            r = await client.UpdateService.upload(image, progress=lambda sent, total: …)
+
+        :param Targets: the resources to update, all applicable if empty
+        :param ApplyTime: the @Redfish.OperationApplyTime
+        :param progress: called with (bytes sent, bytes total)
+        :param bandwidth: the bandwidth cap shared with other uploads
+        :param wait: wait for the Task via the TaskService
+        :param parameters: additional UpdateParameters - e.g. Oem
+        :raises ValueError: the service does not support multipart uploads
+        """
+        if (uri := getattr(self._v, "MultipartHttpPushUri", None)) is None:
+            raise ValueError("MultipartHttpPushUri")
+        parameters = {"Targets": Targets or [], "@Redfish.OperationApplyTime": ApplyTime, **parameters}
+        headers, body = multipart(image, parameters, chunk_size, bandwidth, progress)
+        self._client.log.info(f"upload {image.name} {len(image)} bytes to {uri}")
+        r = await self._client.push(uri, body, headers)
+
+        if (location := r.headers.get("Location", None)) is None:
+            return Upload(None, None, None)
+        location = yarl.URL(location).path
+        TaskId = location.rpartition("/")[2] if "/TaskService/Tasks/" in location else None
+        task = None
+        if wait and TaskId is not None:
+            task = await self._client.TaskService.wait_for(TaskId, maxWait=maxWait)
+        return Upload(location, TaskId, task)
+
+    @staticmethod
+    async def uploadMany(
+        clients: Iterable["AsyncClient"],
+        image: FirmwareImage,
+        concurrency: int = 8,
+        bandwidth: Bandwidth = None,
+        progress: Callable[["AsyncClient", int, int], Any] = None,
+        **kwargs,
+    ) -> AsyncIterator["Result"]:
+        """
+        upload the image to many BMCs - all uploads read the same mapped image and share the bandwidth cap
+
+        :param progress: called with (client, bytes sent, bytes total)
+        :return: the Results in the order of completion, the value is the Upload
+        """
+
+        async def upload(client):
+            report = None if progress is None else functools.partial(progress, client)
+            return await client.UpdateService.upload(image, progress=report, bandwidth=bandwidth, **kwargs)
+
+        async for r in WorkerPool(upload, concurrency=concurrency).map(clients):
+            yield r
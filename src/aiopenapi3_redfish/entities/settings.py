@@ -1,5 +1,143 @@
+import asyncio
+import contextvars
+import copy
+import typing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from pydantic import BaseModel
+
+import aiopenapi3.model
+
 from aiopenapi3_redfish.base import AsyncResourceRoot
 from aiopenapi3_redfish.oem import Detour
+from aiopenapi3_redfish.registry import AttributeRegistry, load
+from aiopenapi3_redfish.tasks import WorkerPool
+
+if typing.TYPE_CHECKING:
+    from aiopenapi3_redfish.tasks import Result
+
+
+def _diff(want: Any, have: Any) -> Any:
+    """
+    the parts of want which differ from have - None if nothing differs
+    """
+    if isinstance(have, BaseModel):
+        have = have.model_dump(by_alias=True, mode="json")
+    if isinstance(want, dict) and isinstance(have, dict):
+        r = dict()
+        for k, v in want.items():
+            if k not in have:
+                r[k] = v
+            elif (d := _diff(v, have[k])) is not None:
+                r[k] = d
+        return r or None
+    return None if want == getattr(have, "value", have) else want
+
+
+def _merge(into: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    merge values into - nested dicts are merged, the values of later calls win
+
+    the values are copied, merging later calls does not modify the arguments of earlier ones
+    """
+    for k, v in values.items():
+        if isinstance(v, dict) and isinstance(into.get(k, None), dict):
+            _merge(into[k], v)
+        else:
+            into[k] = copy.deepcopy(v)
+    return into
+
+
+_batch: contextvars.ContextVar[Optional["SettingsBatch"]] = contextvars.ContextVar("batch", default=None)
+
+
+class SettingsBatch:
+    """
+    coalesce AsyncSettings.set() - the values set for the same Settings resource within the window are merged into a
+    single PATCH, all callers receive the result of the PATCH
+
+    async with AsyncSettings.batch(window=0.05):
+        await asyncio.gather(*[rule(bios) for rule in rules])
+
+    The batch applies to set() called within the context, including Tasks created within.
+    With window None the values are PATCHed by flush() or when leaving the context only - use stage() to collect the
+    values without waiting.
+    """
+
+    def __init__(self, window: Optional[float] = 0.05):
+        """
+        :param window: the seconds the values are collected after the first set(), None until flush()
+        """
+        self.window = window
+        self._pending: Dict[str, Tuple["AsyncSettings", Dict[str, Any], bool, asyncio.Future]] = dict()
+        self._timer: Optional[asyncio.Task] = None
+        self._token = None
+        self.requests = 0
+
+    async def __aenter__(self) -> "SettingsBatch":
+        self._token = _batch.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        _batch.reset(self._token)
+        if exc_type is None:
+            await self.flush()
+        else:
+            self.cancel()
+
+    def stage(self, settings: "AsyncSettings", validate: bool = True, **values) -> asyncio.Future:
+        """
+        add the values for the next PATCH of settings
+
+        :return: the Future of the shared result
+        """
+        target = settings._target()
+        if (entry := self._pending.get(target, None)) is None:
+            entry = self._pending[target] = (settings, dict(), validate, asyncio.get_running_loop().create_future())
+        elif validate and not entry[2]:
+            entry = self._pending[target] = (entry[0], entry[1], True, entry[3])
+        _merge(entry[1], values)
+        if self.window is not None and self._timer is None:
+            self._timer = asyncio.create_task(self._flushAfter(self.window))
+        return entry[3]
+
+    async def _flushAfter(self, window: float) -> None:
+        await asyncio.sleep(window)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """
+        PATCH the values collected
+        """
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        pending, self._pending = self._pending, dict()
+
+        async def apply(settings, values, validate, future):
+            try:
+                r = await settings._set(values, validate)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(r)
+
+        self.requests += len(pending)
+        await asyncio.gather(*[apply(*entry) for entry in pending.values()])
+
+    def cancel(self) -> None:
+        """
+        drop the values collected, the callers receive CancelledError
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, dict()
+        for settings, values, validate, future in pending.values():
+            future.cancel()
 
 
 class AsyncSettings(AsyncResourceRoot):
@@ -7,13 +145,116 @@ class AsyncSettings(AsyncResourceRoot):
     9.10 Settings resource
     """
 
-    async def set(self, **values):
-        odata_id_ = (
+    def _property(self, name: str) -> Any:
+        if name in (extra := self._v.model_extra or {}):
+            return extra[name]
+        return getattr(self._v, aiopenapi3.model.Model.nameof(name), None)
+
+    async def registry(self) -> Optional[AttributeRegistry]:
+        """
+        the AttributeRegistry of the Attributes, loaded once and cached
+
+        :return: None if the resource has no AttributeRegistry or it is not provided
+        """
+        if (name := self._property("AttributeRegistry")) is None:
+            return None
+        return await load(self._client, name)
+
+    async def validate(self, **values) -> None:
+        """
+        validate the Attributes proposed with the AttributeRegistry - without request if the registry was loaded
+
+        :raises AttributeValidationError: the Attributes are invalid
+        """
+        if not (attributes := values.get("Attributes", None)):
+            return
+        if (registry := await self.registry()) is None:
+            return
+        current = self._property("Attributes")
+        if isinstance(current, BaseModel):
+            current = current.model_dump(by_alias=True, mode="json")
+        registry.validate(attributes, current)
+
+    def diff(self, **values) -> Dict[str, Any]:
+        """
+        the values which differ from the value retrieved - refresh() before if it may be outdated
+
+        diff(Attributes={"BootMode": "Uefi", "SysProfile": "PerfOptimized"}) -> {"Attributes": {"SysProfile": "PerfOptimized"}}
+        """
+        r = dict()
+        for k, v in values.items():
+            if (d := _diff(v, self._property(k))) is not None:
+                r[k] = d
+        return r
+
+    def _target(self) -> str:
+        """the path PATCHed - the SettingsObject if the resource has one"""
+        return (
             self._v.model_extra.get("@Redfish.Settings", {})
             .get("SettingsObject", {})
             .get("@odata.id", self._v.odata_id_)
         )
-        return await self._client.patch(odata_id_, values, self._v)
+
+    async def set(self, validate: bool = True, **values):
+        """
+        PATCH the values which differ from the value retrieved
+
+        Within a SettingsBatch the values are merged with those of other set() calls for the resource and PATCHed
+        once the window ends.
+
+        :param validate: validate the Attributes with the AttributeRegistry before
+        :return: None without request if nothing differs
+        :raises AttributeValidationError: the Attributes are invalid
+        """
+        if (batch := _batch.get()) is not None:
+            return await asyncio.shield(batch.stage(self, validate, **values))
+        return await self._set(values, validate)
+
+    async def _set(self, values: Dict[str, Any], validate: bool):
+        if not (values := self.diff(**values)):
+            self._client.log.debug(f"{self._v.odata_id_} unchanged")
+            return None
+        if validate:
+            await self.validate(**values)
+        return await self._client.patch(self._target(), values, self._v)
+
+    async def _modify(self, values: Dict[str, Any]):
+        """modify() PATCHes the values which differ, validated"""
+        return await self._set(values, True)
+
+    @staticmethod
+    def batch(window: Optional[float] = 0.05) -> SettingsBatch:
+        """
+        coalesce the set() calls within the context - see SettingsBatch
+        """
+        return SettingsBatch(window)
+
+    @staticmethod
+    async def enforce(
+        items: Iterable[Any],
+        resolve: Callable[[Any], Awaitable["AsyncSettings"]] = None,
+        concurrency: int = 32,
+        **values,
+    ) -> AsyncIterator["Result"]:
+        """
+        set() for many Settings resources - e.g. correct the configuration drift of a fleet
+
+        async for r in AsyncSettings.enforce(clients, resolve=bios, Attributes={"SysProfile": "PerfOptimized"}):
+            …
+
+        :param items: AsyncSettings, or the items resolve() retrieves the AsyncSettings for - e.g. clients
+        :param resolve: retrieve the current AsyncSettings for an item
+        :return: the Results in the order of completion, the value is the changes PATCHed, {} for items without drift
+        """
+
+        async def apply(item) -> Dict[str, Any]:
+            settings = await resolve(item) if resolve is not None else item
+            if changes := settings.diff(**values):
+                await settings.set(**changes)
+            return changes
+
+        async for r in WorkerPool(apply, concurrency=concurrency).map(items):
+            yield r
 
 
 @Detour("#Bios..Bios")
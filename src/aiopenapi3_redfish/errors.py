@@ -1,3 +1,36 @@
 class RedfishException(Exception):
-    def __init__(self, value: "pydantic.BaseModel"):
+    def __init__(self, value: "pydantic.BaseModel", status: int = None):
+        """
+        :param status: the HTTP status code of the response, if known
+        """
         self.value = value
+        self.status = status
+
+
+class PreconditionFailed(RedfishException):
+    """
+    412 - the If-Match ETag does not match, the resource was modified since it was retrieved
+    """
+
+    @staticmethod
+    def matches(value: "pydantic.BaseModel") -> bool:
+        """
+        the RedfishError is Base.PreconditionFailed - by code or MessageId
+        """
+        try:
+            error = value.model_dump(by_alias=True, mode="json")["error"]
+        except (AttributeError, KeyError, TypeError):
+            return False
+        ids = [error.get("code", None) or ""]
+        ids.extend(i.get("MessageId", None) or "" for i in error.get("@Message.ExtendedInfo", None) or [])
+        return any(i.rpartition(".")[2] == "PreconditionFailed" for i in ids)
+
+
+class AttributeValidationError(ValueError):
+    """
+    the values proposed are invalid according to the AttributeRegistry
+    """
+
+    def __init__(self, errors: "Dict[str, str]"):
+        super().__init__(errors)
+        self.errors = errors
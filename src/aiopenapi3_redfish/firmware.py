@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, NamedTuple, Optional, Union
+
+
+class Upload(NamedTuple):
+    location: Optional[str]
+    """the task monitor"""
+    TaskId: Optional[str]
+    task: Any
+    """the Task finished, None if not awaited"""
+
+
+class Bandwidth:
+    """
+    a bandwidth cap shared by concurrent transfers - e.g. all uploads of a rollout
+
+    bandwidth = Bandwidth(100 * 2**20)
+    await bandwidth.acquire(len(chunk))
+
+    Transfers are served in the order they requested, a burst of up to burst bytes is passed without delay.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        """
+        :param rate: bytes per second
+        :param burst: bytes passed without delay after idling, defaults to rate / 4
+        """
+        self.rate = rate
+        self.burst = rate / 4 if burst is None else burst
+        self._free: Optional[float] = None
+        self.transferred = 0
+
+    async def acquire(self, n: int) -> None:
+        """
+        wait until n bytes may be sent
+        """
+        now = asyncio.get_running_loop().time()
+        floor = now - self.burst / self.rate
+        """the time the link is free, lags behind now by up to the burst"""
+        self._free = floor if self._free is None else max(self._free, floor)
+        self._free += n / self.rate
+        self.transferred += n
+        if (delay := self._free - now) > 0:
+            await asyncio.sleep(delay)
+
+
+class FirmwareImage:
+    """
+    a firmware image mapped into memory - shared by all uploads, the pages are read on demand by the OS
+
+    with FirmwareImage("BIOS_XXXX_WN64_2.19.1.EXE") as image:
+        await client.UpdateService.upload(image)
+
+    The chunks read are views of the mapping, not copies - close the image once the uploads finished.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = Path(path)
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        self._sha256: Optional[str] = None
+
+    def __enter__(self) -> "FirmwareImage":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self) -> None:
+        if self._map is None:
+            self._file = self.path.open("rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._map)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._view.release()
+            self._map.close()
+            self._file.close()
+            self._map = self._view = self._file = None
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    @property
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self._map).hexdigest()
+        return self._sha256
+
+    def read(self, start: int, end: int) -> memoryview:
+        """
+        the bytes start to end - a view of the mapping shared by all readers
+        """
+        return self._view[start:end]
+
+
+def multipart(
+    image: FirmwareImage,
+    parameters: Dict[str, Any],
+    chunk_size: int = 1024 * 1024,
+    bandwidth: Bandwidth = None,
+    progress: Callable[[int, int], Any] = None,
+) -> tuple[Dict[str, str], AsyncIterator[Union[bytes, memoryview]]]:
+    """
+    the multipart/form-data body of an upload to the MultipartHttpPushUri - UpdateParameters and UpdateFile
+
+    :param progress: called with (bytes sent, bytes total) of the image after each chunk
+    :return: the headers and the body streamed from the image
+    """
+    boundary = uuid.uuid4().hex
+    head = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="UpdateParameters"\r\n'
+        "Content-Type: application/json\r\n\r\n"
+        f"{json.dumps(parameters)}\r\n"
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="UpdateFile"; filename="{image.name}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+    total = len(image)
+    headers = {
+        "Content-Type": f"multipart/form-data; boundary={boundary}",
+        "Content-Length": str(len(head) + total + len(tail)),
+    }
+
+    async def body() -> AsyncIterator[Union[bytes, memoryview]]:
+        yield head
+        for start in range(0, total, chunk_size):
+            chunk = image.read(start, min(start + chunk_size, total))
+            if bandwidth is not None:
+                await bandwidth.acquire(len(chunk))
+            yield chunk
+            if progress is not None:
+                progress(start + len(chunk), total)
+        yield tail
+
+    return headers, body()
@@ -0,0 +1,247 @@
+import asyncio
+import collections
+import contextlib
+import enum
+import logging
+import typing
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Set, Union
+
+from pydantic import BaseModel
+
+if typing.TYPE_CHECKING:
+    from .client import AsyncClient
+
+
+class Notification(NamedTuple):
+    event: Union[BaseModel, dict]
+    """the Event/MetricReport"""
+    record: Optional[Union[BaseModel, dict]]
+    """the EventRecord matched, None for MetricReports"""
+
+
+def _field(obj, name: str) -> Any:
+    if isinstance(obj, dict):
+        v = obj.get(name, None)
+    else:
+        v = getattr(obj, name, None)
+    if isinstance(v, enum.Enum):
+        v = v.value
+    if hasattr(v, "root"):
+        v = v.root
+    return v
+
+
+def _origin(record) -> Optional[str]:
+    if (v := _field(record, "OriginOfCondition")) is None:
+        return None
+    if isinstance(v, dict):
+        return v.get("@odata.id", None)
+    return getattr(v, "odata_id_", None)
+
+
+def _messagekeys(MessageId: str) -> Iterable[str]:
+    """
+    Base.1.0.Success -> Base, Base.1, Base.1.0, Base.1.0.Success and the unversioned Base.Success
+    """
+    parts = MessageId.split(".")
+    for i in range(1, len(parts) + 1):
+        yield ".".join(parts[:i])
+    if len(parts) > 2:
+        yield f"{parts[0]}.{parts[-1]}"
+
+
+def _originkeys(path: str) -> Iterable[str]:
+    """
+    /redfish/v1/Systems/1/Bios -> the path and all parents
+    """
+    path = path.rstrip("/")
+    while path:
+        yield path
+        path, _, _ = path.rpartition("/")
+
+
+class Subscription:
+    """
+    the events matching all filters given are queued for the subscriber
+
+    if the subscriber does not keep up, the oldest events are dropped
+    """
+
+    FILTERS = ("OriginOfCondition", "MessageId", "RegistryPrefix", "EventType")
+    """the order of preference for indexing"""
+
+    def __init__(self, hub: "EventHub", maxsize: int = 64, **filters: Union[str, Iterable[str], None]):
+        self._hub = hub
+        self.filters: Dict[str, frozenset] = {
+            k: frozenset([v] if isinstance(v, str) else v) for k, v in filters.items() if v is not None
+        }
+        if unknown := set(self.filters) - set(self.FILTERS):
+            raise ValueError(f"unknown filters {sorted(unknown)}")
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def matches(self, keys: Dict[str, Set[str]]) -> bool:
+        return all(values & keys.get(name, set()) for name, values in self.filters.items())
+
+    def _put(self, item) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(item)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Notification:
+        item = await self.queue.get()
+        if isinstance(item, Exception):
+            raise item
+        if item is None:
+            raise StopAsyncIteration
+        return item
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self) -> None:
+        await self._hub.unsubscribe(self)
+
+
+class EventHub:
+    """
+    a single SSE connection per client - fanned out to many subscribers
+
+    async with client.hub.subscribe(MessageId="TaskEvent", OriginOfCondition="/redfish/v1/TaskService/Tasks") as s:
+        async for event, record in s:
+            …
+
+    Subscriptions are indexed on one of their filters, only the candidates of the index are matched.
+    The stream may be down while the hub is available - connected tells if events can be received right now.
+    """
+
+    log = logging.getLogger("aiopenapi3_redfish.EventHub")
+
+    def __init__(self, client: "AsyncClient", maxsize: int = 64):
+        self._client = client
+        self._maxsize = maxsize
+        self._index: Dict[str, Dict[str, Set[Subscription]]] = {
+            name: collections.defaultdict(set) for name in Subscription.FILTERS
+        }
+        self._any: Set[Subscription] = set()
+        self._subscriptions: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.error: Optional[Exception] = None
+        self.received = 0
+        self.connected = False
+        self.listeners: Set[Callable[[bool], Any]] = set()
+        """called with connected if the SSE stream connects or disconnects"""
+
+    @property
+    def available(self) -> bool:
+        """
+        the SSE stream did not fail permanently - it may still be (re)connecting
+        """
+        return self.error is None
+
+    def _connection(self, connected: bool) -> None:
+        if connected == self.connected:
+            return
+        self.connected = connected
+        for listener in list(self.listeners):
+            listener(connected)
+
+    def subscribe(self, maxsize: int = None, **filters) -> Subscription:
+        """
+        :param maxsize: events queued for the subscriber
+        :param filters: OriginOfCondition (path, matches sub-resources), MessageId (prefix at . boundaries, or the
+            unversioned Registry.Key), RegistryPrefix, EventType - a value or an iterable of values
+        """
+        s = Subscription(self, maxsize or self._maxsize, **filters)
+        if self.error is not None:
+            s._put(self.error)
+            return s
+
+        for name in Subscription.FILTERS:
+            if name in s.filters:
+                for value in s.filters[name]:
+                    self._index[name][value].add(s)
+                break
+        else:
+            self._any.add(s)
+        self._subscriptions.add(s)
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return s
+
+    async def unsubscribe(self, s: Subscription) -> None:
+        if s not in self._subscriptions:
+            return
+        self._subscriptions.discard(s)
+        self._any.discard(s)
+        for name, values in s.filters.items():
+            for value in values:
+                if (subscribers := self._index[name].get(value, None)) is not None:
+                    subscribers.discard(s)
+                    if not subscribers:
+                        del self._index[name][value]
+
+        if not self._subscriptions and self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    @staticmethod
+    def _keys(notification: Notification) -> Dict[str, Set[str]]:
+        if notification.record is None:
+            return {"EventType": {"MetricReport"}}
+
+        r = dict()
+        if (v := _field(notification.record, "EventType")) is not None:
+            r["EventType"] = {v}
+        if (v := _field(notification.record, "MessageId")) is not None:
+            r["MessageId"] = set(_messagekeys(v))
+            r["RegistryPrefix"] = {v.partition(".")[0]}
+        if (v := _origin(notification.record)) is not None:
+            r["OriginOfCondition"] = set(_originkeys(v))
+        return r
+
+    def publish(self, event: Union[BaseModel, dict]) -> None:
+        """
+        dispatch an Event/MetricReport to the subscribers - used for the SSE stream, may be used for push events
+        """
+        self.received += 1
+        if (records := _field(event, "Events")) is None:
+            notifications = [Notification(event, None)]
+        else:
+            notifications = [Notification(event, getattr(record, "root", record)) for record in records]
+
+        for notification in notifications:
+            keys = self._keys(notification)
+            candidates = set(self._any)
+            for name, values in keys.items():
+                index = self._index[name]
+                for value in values:
+                    if (subscribers := index.get(value, None)) is not None:
+                        candidates.update(subscribers)
+            for s in candidates:
+                if s.matches(keys):
+                    s._put(notification)
+
+    async def _run(self) -> None:
+        try:
+            async for event in self._client.EventService.events(onConnection=self._connection):
+                self.publish(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.log.warning(f"SSE unavailable {e!r}")
+            self.error = e
+            for s in list(self._subscriptions):
+                s._put(e)
+        finally:
+            self._connection(False)
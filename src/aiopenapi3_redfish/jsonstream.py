@@ -0,0 +1,121 @@
+import codecs
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+
+class MembersParser:
+    """
+    incremental parser for (large) Resource Collections
+
+    feed() the response body in chunks, the elements of the Members array are returned as soon as they are decoded.
+    The remaining properties of the Collection (e.g. Members@odata.nextLink) are collected in envelope.
+    Memory is limited to the largest element - the Members array is never kept.
+    """
+
+    _whitespace = re.compile(r"[ \t\n\r]*")
+
+    START, KEY, COLON, VALUE, ARRAY, FIRST, MEMBERS, MEMBERS_NEXT, NEXT, END = range(10)
+
+    def __init__(self, key: str = "Members"):
+        self.key = key
+        self.envelope: Dict[str, Any] = dict()
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._state = self.START
+        self._current: Optional[str] = None
+
+    def feed(self, data: bytes, final: bool = False) -> List[Any]:
+        self._buf += self._utf8.decode(data, final)
+        r = list()
+        while self._step(r, final):
+            pass
+        if final and self._state != self.END:
+            raise json.JSONDecodeError("incomplete document", self._buf, 0)
+        return r
+
+    def _skip(self, pos=0) -> int:
+        return self._whitespace.match(self._buf, pos).end()
+
+    def _expect(self, chars: str) -> Optional[str]:
+        pos = self._skip()
+        if pos == len(self._buf):
+            self._buf = ""
+            return None
+        if (c := self._buf[pos]) not in chars:
+            raise json.JSONDecodeError(f"Expecting one of {chars!r}", self._buf, pos)
+        self._buf = self._buf[pos + 1 :]
+        return c
+
+    def _value(self, final: bool) -> tuple[bool, Any]:
+        pos = self._skip()
+        try:
+            value, end = self._decoder.raw_decode(self._buf, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            self._buf = self._buf[pos:]
+            return False, None
+        if end == len(self._buf) and not final:
+            """a number may continue in the next chunk"""
+            self._buf = self._buf[pos:]
+            return False, None
+        self._buf = self._buf[end:]
+        return True, value
+
+    def _step(self, r: List[Any], final: bool) -> bool:
+        match self._state:
+            case self.START:
+                if self._expect("{") is None:
+                    return False
+                self._state = self.KEY
+            case self.KEY:
+                pos = self._skip()
+                if self._buf[pos : pos + 1] == "}":
+                    self._buf = self._buf[pos + 1 :]
+                    self._state = self.END
+                    return False
+                ok, self._current = self._value(final)
+                if not ok:
+                    return False
+                self._state = self.COLON
+            case self.COLON:
+                if self._expect(":") is None:
+                    return False
+                self._state = self.ARRAY if self._current == self.key else self.VALUE
+            case self.ARRAY:
+                if self._expect("[") is None:
+                    return False
+                self._state = self.FIRST
+            case self.FIRST:
+                if (pos := self._skip()) == len(self._buf):
+                    return False
+                if self._buf[pos] == "]":
+                    self._buf = self._buf[pos + 1 :]
+                    self._state = self.NEXT
+                else:
+                    self._state = self.MEMBERS
+            case self.VALUE:
+                ok, value = self._value(final)
+                if not ok:
+                    return False
+                self.envelope[self._current] = value
+                self._state = self.NEXT
+            case self.MEMBERS:
+                ok, value = self._value(final)
+                if not ok:
+                    return False
+                r.append(value)
+                self._state = self.MEMBERS_NEXT
+            case self.MEMBERS_NEXT:
+                if (c := self._expect(",]")) is None:
+                    return False
+                self._state = self.MEMBERS if c == "," else self.NEXT
+            case self.NEXT:
+                if (c := self._expect(",}")) is None:
+                    return False
+                self._state = self.KEY if c == "," else self.END
+            case self.END:
+                return False
+        return True
@@ -0,0 +1,187 @@
+import bisect
+import datetime
+import math
+import time
+from array import array
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from pydantic import BaseModel
+
+from .hub import _field
+
+Key = Tuple[str, Optional[str]]
+"""(MetricId, MetricProperty)"""
+
+
+class Series:
+    """
+    ring buffer of (timestamp, value) samples backed by array
+
+    The storage is mirrored - each sample is written twice - so every window is contiguous and can be exported as
+    memoryview without copying, e.g. numpy.frombuffer(values).
+    A view is valid until the samples it refers to are overwritten by later appends.
+    """
+
+    def __init__(self, capacity: int = 3600, retention: float = None, typecode: str = "d"):
+        """
+        :param capacity: the number of samples kept
+        :param retention: the seconds samples are kept
+        :param typecode: the array typecode of the values
+        """
+        self.capacity = capacity
+        self.retention = retention
+        self._t = array("d", bytes(array("d").itemsize * capacity * 2))
+        self._v = array(typecode, bytes(array(typecode).itemsize * capacity * 2))
+        self._start = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def last(self) -> Optional[Tuple[float, Any]]:
+        if self._len == 0:
+            return None
+        i = self._start + self._len - 1
+        return self._t[i], self._v[i]
+
+    def append(self, timestamp: float, value) -> bool:
+        """
+        :return: False if the sample is not newer than the last one (e.g. the same MetricReport requested twice)
+        """
+        if self._len and timestamp <= self._t[self._start + self._len - 1]:
+            return False
+        pos = (self._start + self._len) % self.capacity
+        if self._len == self.capacity:
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._len += 1
+        self._t[pos] = self._t[pos + self.capacity] = timestamp
+        self._v[pos] = self._v[pos + self.capacity] = value
+        if self.retention is not None:
+            self.expire(timestamp - self.retention)
+        return True
+
+    def expire(self, before: float) -> None:
+        """
+        drop the samples older than before
+        """
+        n = bisect.bisect_left(self.timestamps(), before)
+        self._start = (self._start + n) % self.capacity
+        self._len -= n
+
+    def timestamps(self) -> memoryview:
+        return memoryview(self._t)[self._start : self._start + self._len]
+
+    def window(self, start: float = None, end: float = None) -> Tuple[memoryview, memoryview]:
+        """
+        the samples start <= timestamp < end - without copying
+
+        :return: timestamps, values
+        """
+        ts = self.timestamps()
+        lo = 0 if start is None else bisect.bisect_left(ts, start)
+        hi = self._len if end is None else bisect.bisect_left(ts, end)
+        values = memoryview(self._v)[self._start : self._start + self._len]
+        return ts[lo:hi], values[lo:hi]
+
+    def downsample(self, step: float, start: float = None, end: float = None, how: str = "mean") -> Tuple[array, array]:
+        """
+        aggregate the samples of the window into buckets of step seconds
+
+        :param how: mean, min, max, last
+        :return: the start of the buckets, the aggregated values
+        """
+        aggregate = {"mean": lambda v: math.fsum(v) / len(v), "min": min, "max": max, "last": lambda v: v[-1]}[how]
+        rt, rv = array("d"), array("d")
+        ts, vs = self.window(start, end)
+        i = 0
+        while i < len(ts):
+            bucket = math.floor(ts[i] / step) * step
+            j = bisect.bisect_left(ts, bucket + step, i)
+            rt.append(bucket)
+            rv.append(aggregate(vs[i:j]))
+            i = j
+        return rt, rv
+
+
+def _timestamp(value) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    return datetime.datetime.fromisoformat(str(value)).timestamp()
+
+
+class MetricStore:
+    """
+    the samples of MetricReports in a Series per (MetricId, MetricProperty)
+
+    store = MetricStore(capacity=8640, retention=86400)
+    store.ingest(report)
+    timestamps, values = store.window("SystemInputPower", start=time.time() - 300)
+
+    The reports may be models or the decoded json, no models are kept.
+    Non-numeric MetricValues are skipped.
+    """
+
+    def __init__(self, capacity: int = 3600, retention: float = None):
+        self.capacity = capacity
+        self.retention = retention
+        self.series: Dict[Key, Series] = dict()
+        self.skipped = 0
+
+    def __getitem__(self, key: Union[Key, str]) -> Series:
+        if isinstance(key, str):
+            key = (key, None)
+        return self.series[key]
+
+    def __contains__(self, key: Union[Key, str]) -> bool:
+        if isinstance(key, str):
+            key = (key, None)
+        return key in self.series
+
+    def keys(self) -> Iterable[Key]:
+        return self.series.keys()
+
+    def ingest(self, report: Union[BaseModel, dict]) -> int:
+        """
+        :return: the number of samples added
+        """
+        try:
+            default = _timestamp(_field(report, "Timestamp")) or time.time()
+        except ValueError:
+            default = time.time()
+        n = 0
+        for mv in _field(report, "MetricValues") or []:
+            mv = getattr(mv, "root", mv)
+            try:
+                value = float(_field(mv, "MetricValue"))
+            except (TypeError, ValueError):
+                self.skipped += 1
+                continue
+            try:
+                timestamp = _timestamp(_field(mv, "Timestamp")) or default
+            except ValueError:
+                timestamp = default
+            key = (_field(mv, "MetricId"), _field(mv, "MetricProperty"))
+            if (series := self.series.get(key, None)) is None:
+                series = self.series[key] = Series(self.capacity, self.retention)
+            n += series.append(timestamp, value)
+        return n
+
+    def window(
+        self, MetricId: str, MetricProperty: str = None, start: float = None, end: float = None
+    ) -> Tuple[memoryview, memoryview]:
+        return self.series[(MetricId, MetricProperty)].window(start, end)
+
+    def downsample(
+        self,
+        MetricId: str,
+        MetricProperty: str = None,
+        step: float = 60,
+        start: float = None,
+        end: float = None,
+        how: str = "mean",
+    ) -> Tuple[array, array]:
+        return self.series[(MetricId, MetricProperty)].downsample(step, start, end, how)
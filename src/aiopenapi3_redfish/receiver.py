@@ -0,0 +1,235 @@
+import asyncio
+import json
+import logging
+import ssl
+import time
+import typing
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+if typing.TYPE_CHECKING:
+    from .client import AsyncClient
+
+
+class Received(NamedTuple):
+    peer: str
+    """the address of the BMC"""
+    context: Optional[str]
+    """the Context of the EventDestination"""
+    event: Any
+    """the validated Event/MetricReport"""
+    timestamp: float
+    """time.monotonic() of the reception"""
+
+
+class Metrics(NamedTuple):
+    received: int
+    accepted: int
+    dropped: int
+    invalid: int
+    queued: int
+    rate: float
+    """accepted events per second"""
+    lag: float
+    """seconds between reception and consumption of the last batch"""
+
+
+class EventReceiver:
+    """
+    HTTP(S) listener for Redfish push events (EventDestination Protocol Redfish)
+
+    async with EventReceiver(port=8443, ssl=ctx, validate=client.EventService.validate) as receiver:
+        await receiver.subscribe(client, "https://collector.example.org:8443/redfish/events")
+        async for batch in receiver.batches():
+            …
+
+    Events are queued, in case the queue is full the event is dropped and the BMC is replied 503 to retry later.
+    """
+
+    log = logging.getLogger("aiopenapi3_redfish.EventReceiver")
+
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8443,
+        ssl: Optional[ssl.SSLContext] = None,
+        path: str = "/redfish/events",
+        maxsize: int = 10000,
+        validate: Callable[[dict], Any] = None,
+        limit: int = 1024 * 1024,
+    ):
+        """
+        :param ssl: serve https
+        :param path: the path events are accepted on
+        :param maxsize: events queued
+        :param validate: the validation of payloads - e.g. AsyncEventService.validate
+        :param limit: the maximum size of a payload
+        """
+        self.host = host
+        self.port = port
+        self.ssl = ssl
+        self.path = path
+        self.limit = limit
+        self.validate = validate or (lambda x: x)
+        self.queue: asyncio.Queue[Received] = asyncio.Queue(maxsize)
+        self._server: Optional[asyncio.Server] = None
+        self._subscriptions: List[Tuple["AsyncClient", str]] = list()
+
+        self.received = self.accepted = self.dropped = self.invalid = 0
+        self._rate: Tuple[float, int] = (time.monotonic(), 0)
+        self.rate = 0.0
+        self.lag = 0.0
+
+    async def __aenter__(self) -> "EventReceiver":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._connection, self.host, self.port, ssl=self.ssl)
+        if self.port == 0:
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        remove the subscriptions created & stop listening
+        """
+        for client, odata_id_ in self._subscriptions:
+            try:
+                await client.EventService.unsubscribe(odata_id_)
+            except Exception as e:
+                self.log.warning(f"unsubscribe {odata_id_} failed {e!r}")
+        self._subscriptions.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def subscribe(self, client: "AsyncClient", destination: str, **kwargs):
+        """
+        create an EventDestination on the BMC, the subscription is removed on stop()
+
+        :param destination: the url of the receiver as reachable by the BMC
+        :param kwargs: additional EventDestination properties, e.g. EventFormatType, RegistryPrefixes
+        """
+        kwargs.setdefault("Context", str(client.config.target))
+        r = await client.EventService.subscribe(destination, **kwargs)
+        self._subscriptions.append((client, r.odata_id_))
+        return r
+
+    def metrics(self) -> Metrics:
+        now = time.monotonic()
+        since, accepted = self._rate
+        if (elapsed := now - since) >= 1:
+            self.rate = (self.accepted - accepted) / elapsed
+            self._rate = (now, self.accepted)
+        return Metrics(
+            self.received, self.accepted, self.dropped, self.invalid, self.queue.qsize(), self.rate, self.lag
+        )
+
+    async def batches(self, size: int = 100, interval: float = 0.5) -> typing.AsyncGenerator[List[Received], None]:
+        """
+        :param size: the maximum number of events per batch
+        :param interval: the maximum time to wait for a batch to fill up
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            until = loop.time() + interval
+            while len(batch) < size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                if (left := until - loop.time()) <= 0:
+                    break
+                try:
+                    async with asyncio.timeout(left):
+                        batch.append(await self.queue.get())
+                except TimeoutError:
+                    break
+            self.lag = time.monotonic() - batch[0].timestamp
+            yield batch
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername")
+        peer = peer[0] if peer else ""
+        try:
+            while True:
+                try:
+                    method, path, headers, body = await self._read(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                status = self._process(peer, method, path, body)
+                keepalive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Length: 0\r\n"
+                    f"Connection: {'keep-alive' if keepalive else 'close'}\r\n\r\n".encode()
+                )
+                await writer.drain()
+                if not keepalive:
+                    break
+        except ValueError as e:
+            self.log.debug(f"{peer} invalid request {e}")
+            writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read(self, reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.LimitOverrunError:
+            raise ValueError("header too large")
+        line, *fields = head.decode("latin-1").split("\r\n")
+        method, path, _ = line.split(" ", 2)
+        headers = dict()
+        for field in filter(None, fields):
+            name, _, value = field.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = bytearray()
+            try:
+                while (size := int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)) > 0:
+                    if len(body) + size > self.limit:
+                        raise ValueError("payload too large")
+                    body += await reader.readexactly(size + 2)
+                    del body[-2:]
+                await reader.readuntil(b"\r\n")
+            except asyncio.LimitOverrunError:
+                raise ValueError("chunk line too large")
+            return method, path, headers, bytes(body)
+
+        if (length := int(headers.get("content-length", 0))) > self.limit:
+            raise ValueError("payload too large")
+        return method, path, headers, await reader.readexactly(length)
+
+    def _process(self, peer: str, method: str, path: str, body: bytes) -> str:
+        if method != "POST":
+            return "405 Method Not Allowed"
+        if path.partition("?")[0] != self.path:
+            return "404 Not Found"
+
+        self.received += 1
+        try:
+            if not isinstance(payload := json.loads(body), dict):
+                raise ValueError(type(payload))
+            event = self.validate(payload)
+        except ValueError as e:
+            self.invalid += 1
+            self.log.debug(f"{peer} invalid payload {e}")
+            return "400 Bad Request"
+
+        try:
+            self.queue.put_nowait(Received(peer, payload.get("Context", None), event, time.monotonic()))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return "503 Service Unavailable"
+        self.accepted += 1
+        return "204 No Content"
@@ -0,0 +1,266 @@
+import asyncio
+import collections
+import json
+import logging
+import operator
+import re
+import typing
+import weakref
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+import aiopenapi3.errors
+
+from .errors import AttributeValidationError, RedfishException
+
+if typing.TYPE_CHECKING:
+    from .client import AsyncClient
+
+
+_Conditions = {
+    "EQU": operator.eq,
+    "NEQ": operator.ne,
+    "GTR": operator.gt,
+    "GEQ": operator.ge,
+    "LSS": operator.lt,
+    "LEQ": operator.le,
+}
+
+
+class AttributeRegistry:
+    """
+    the Attributes of an AttributeRegistry - e.g. BiosAttributeRegistry or the ManagerAttributeRegistry of the iDRAC
+
+    registry = AttributeRegistry(data)
+    registry.validate({"SysProfile": "Custom", "ProcTurboMode": "Disabled"}, current)
+
+    Values are validated by type, ReadOnly, the allowed values, ranges and the dependencies of type Map.
+    """
+
+    Snapshot = frozenset({"CurrentValue", "GrayOut"})
+    """properties of the entries reflecting the state the registry was created in - only used if mapped"""
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        :param data: the decoded json of the AttributeRegistry
+        """
+        self.name: Optional[str] = data.get("Id", None)
+        self.version: Optional[str] = data.get("RegistryVersion", None)
+        self.attributes: Dict[str, Dict[str, Any]] = dict()
+        self.dependencies: Dict[str, list] = collections.defaultdict(list)
+
+        entries = data.get("RegistryEntries", {})
+        for attribute in entries.get("Attributes", []):
+            for key in self._keys(attribute):
+                self.attributes.setdefault(key, attribute)
+
+        for dependency in entries.get("Dependencies", []):
+            if dependency.get("Type", "Map") != "Map" or "Dependency" not in dependency:
+                continue
+            d = dependency["Dependency"]
+            if (target := d.get("MapToAttribute", dependency.get("DependencyFor", None))) is not None:
+                self.dependencies[target].append(d)
+
+    @staticmethod
+    def _keys(attribute: Dict[str, Any]) -> Iterable[str]:
+        """
+        the names the attribute is PATCHed with
+
+        Dell registries name the attributes of the iDRAC with the group - Id iDRAC.Embedded.1#Users.4#Enable is
+        Users.4.Enable in DellAttributes
+        """
+        if (name := attribute.get("AttributeName", None)) is not None:
+            yield name
+        if (Id := attribute.get("Id", None)) is not None and "#" in Id:
+            yield ".".join(Id.split("#")[1:])
+        if name is not None and (group := attribute.get("GroupName", None)) is not None:
+            yield f"{group}.{name}"
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.attributes
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        return self.attributes[name]
+
+    def __len__(self) -> int:
+        return len(self.attributes)
+
+    def errors(self, values: Dict[str, Any], current: Dict[str, Any] = None) -> Dict[str, str]:
+        """
+        :param values: the values proposed
+        :param current: the current values, the dependencies are evaluated on the current values updated by values
+        :return: {attribute: reason} for the invalid values
+        """
+        merged = {**(current or {}), **values}
+        r = dict()
+        for name, value in values.items():
+            if (attribute := self.attributes.get(name, None)) is None:
+                r[name] = "unknown attribute"
+                continue
+            attribute = self._effective(name, attribute, merged)
+            if (reason := self._check(attribute, value)) is not None:
+                r[name] = reason
+        return r
+
+    def validate(self, values: Dict[str, Any], current: Dict[str, Any] = None) -> None:
+        """
+        :raises AttributeValidationError: values are invalid
+        """
+        if errors := self.errors(values, current):
+            raise AttributeValidationError(errors)
+
+    def _effective(self, name: str, attribute: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        the attribute with the properties mapped by the dependencies applying to values
+        """
+        for d in self.dependencies.get(name, []):
+            if self._applies(d.get("MapFrom", []), values):
+                prop = d["MapToProperty"]
+                if prop in self.Snapshot:
+                    prop = f"_{prop}"
+                attribute = {**attribute, prop: d.get("MapToValue", None)}
+        return attribute
+
+    def _applies(self, terms: Iterable[Dict[str, Any]], values: Dict[str, Any]) -> bool:
+        r = None
+        for term in terms:
+            source = term.get("MapFromAttribute", None)
+            prop = term.get("MapFromProperty", "CurrentValue")
+            if prop == "CurrentValue":
+                if source not in values:
+                    """the current values are not known - assume the service knows better"""
+                    return False
+                have = values[source]
+            else:
+                have = self.attributes.get(source, {}).get(prop, None)
+            try:
+                v = _Conditions[term.get("MapFromCondition", "EQU")](have, term.get("MapFromValue", None))
+            except (KeyError, TypeError):
+                return False
+            if r is None:
+                r = v
+            elif term.get("MapTerms", "AND") == "OR":
+                r = r or v
+            else:
+                r = r and v
+        return bool(r)
+
+    @staticmethod
+    def _check(attribute: Dict[str, Any], value: Any) -> Optional[str]:
+        if attribute.get("ReadOnly", False) or attribute.get("_GrayOut", False):
+            return "read only"
+        if "_CurrentValue" in attribute and value != attribute["_CurrentValue"]:
+            return f"set to {attribute['_CurrentValue']!r} by a dependency"
+
+        match attribute.get("Type", None):
+            case "Enumeration":
+                allowed = [i.get("ValueName", None) for i in attribute.get("Value", [])]
+                if value not in allowed:
+                    return f"{value!r} not in {allowed}"
+            case "String" | "Password":
+                if not isinstance(value, str):
+                    return f"{value!r} is not a string"
+                if (n := attribute.get("MinLength", None)) is not None and len(value) < n:
+                    return f"shorter than {n}"
+                if (n := attribute.get("MaxLength", None)) is not None and len(value) > n:
+                    return f"longer than {n}"
+                if (expr := attribute.get("ValueExpression", None)) and not re.fullmatch(expr, value):
+                    return f"{value!r} does not match {expr}"
+            case "Integer":
+                if isinstance(value, bool) or not isinstance(value, int):
+                    return f"{value!r} is not an integer"
+                lower, upper = attribute.get("LowerBound", None), attribute.get("UpperBound", None)
+                if lower is not None and value < lower:
+                    return f"{value} < {lower}"
+                if upper is not None and value > upper:
+                    return f"{value} > {upper}"
+                if (step := attribute.get("ScalarIncrement", None)) and (value - (lower or 0)) % step:
+                    return f"{value} not a multiple of {step}"
+            case "Boolean":
+                if not isinstance(value, bool):
+                    return f"{value!r} is not a boolean"
+        return None
+
+
+_registries: "collections.OrderedDict[Hashable, AttributeRegistry]" = collections.OrderedDict()
+"""the registries by identity - the Location Uri and the ETag of the document"""
+_maxsize = 64
+_loading: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Future]]" = (
+    weakref.WeakKeyDictionary()
+)
+"""the loads in progress per event loop - a Future is bound to its loop"""
+_bound: "weakref.WeakKeyDictionary[AsyncClient, Dict[str, Optional[AttributeRegistry]]]" = weakref.WeakKeyDictionary()
+"""the registries of a client by name"""
+
+log = logging.getLogger("aiopenapi3_redfish.AttributeRegistry")
+
+
+async def load(client: "AsyncClient", name: str) -> Optional[AttributeRegistry]:
+    """
+    the AttributeRegistry name, loaded once per client and shared by all BMCs serving the same document
+
+    The same name is used for different registries - e.g. across server models and BIOS versions.
+    A registry is shared if the Location Uri and the ETag of the document match, without ETag it is not shared.
+
+    :param name: the AttributeRegistry property of the Settings resource, e.g. BiosAttributeRegistry.v1_0_3
+    :return: None if the registry is not provided
+    """
+    if name in (bound := _bound.setdefault(client, dict())):
+        return bound[name]
+    key = (id(client), name)
+    loading = _loading.setdefault(asyncio.get_running_loop(), dict())
+    if (future := loading.get(key, None)) is None:
+        future = loading[key] = asyncio.ensure_future(_load(client, name))
+        future.add_done_callback(lambda _: loading.pop(key, None))
+    return await asyncio.shield(future)
+
+
+async def _json(client: "AsyncClient", path: str) -> Dict[str, Any]:
+    async with client.stream(path) as (schema_, response):
+        return json.loads(await response.aread())
+
+
+async def _document(client: "AsyncClient", name: str, uri: str) -> AttributeRegistry:
+    """
+    the registry of the document, the body is not read if a registry with the same identity was loaded
+    """
+    async with client.stream(uri) as (schema_, response):
+        if etag := response.headers.get("etag", None):
+            key = (uri, etag)
+        else:
+            key = (uri, client.config.target)
+        if (r := _registries.get(key, None)) is not None:
+            _registries.move_to_end(key)
+            log.debug(f"{name} {etag} loaded already")
+            return r
+        r = _registries[key] = AttributeRegistry(json.loads(await response.aread()))
+    while len(_registries) > _maxsize:
+        _registries.popitem(last=False)
+    return r
+
+
+async def _load(client: "AsyncClient", name: str) -> Optional[AttributeRegistry]:
+    """
+    None is cached if the service does not provide the registry, transient errors are retried on the next load
+    """
+    try:
+        r = None
+        file = await _json(client, f"/redfish/v1/Registries/{name}")
+        locations = sorted(file.get("Location", []), key=lambda i: i.get("Language", "en") != "en")
+        for location in locations:
+            if (uri := location.get("Uri", None)) is not None:
+                r = await _document(client, name, uri)
+                break
+        else:
+            log.warning(f"{name} has no Location")
+    except (KeyError, ValueError, RedfishException) as e:
+        log.warning(f"{name} not available {e!r}, not validating")
+    except (aiopenapi3.errors.RequestError, aiopenapi3.errors.ResponseError) as e:
+        log.warning(f"{name} failed {e!r}, not validating")
+        return None
+    _bound.setdefault(client, dict())[name] = r
+    return r
+
+
+def clear() -> None:
+    _registries.clear()
+    _bound.clear()
@@ -0,0 +1,121 @@
+import asyncio
+import collections
+import contextlib
+import contextvars
+import enum
+import logging
+from typing import Union
+
+
+class Priority(enum.IntEnum):
+    """
+    request lanes, lower value is served first
+    """
+
+    interactive = 0
+    normal = 1
+    bulk = 2
+
+    @classmethod
+    def of(cls, value: Union["Priority", str, None]) -> "Priority":
+        if value is None:
+            return _priority.get()
+        if isinstance(value, Priority):
+            return value
+        return cls[value]
+
+
+_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar("priority", default=Priority.normal)
+
+
+@contextlib.contextmanager
+def priority(value: Union[Priority, str]):
+    """
+    select the lane for all requests issued within the context - including those issued by asyncNew/list
+    """
+    token = _priority.set(Priority.of(value))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class Scheduler:
+    """
+    limits the number of concurrent requests to a BMC
+
+    a free slot is handed to the waiter of the highest priority lane,
+    unless a waiter of a lower priority lane waits longer than starvation seconds - the longest waiting one is served
+    first
+    """
+
+    log = logging.getLogger("aiopenapi3_redfish.Scheduler")
+
+    def __init__(self, slots: int = 8, starvation: float = 5.0):
+        self.slots = slots
+        self.starvation = starvation
+        self._active = 0
+        self._waiters: dict[Priority, collections.deque] = {p: collections.deque() for p in Priority}
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> dict[Priority, int]:
+        return {p: len(w) for p, w in self._waiters.items()}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority_: Union[Priority, str, None] = None):
+        await self.acquire(priority_)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority_: Union[Priority, str, None] = None) -> None:
+        lane = Priority.of(priority_)
+        if self._active < self.slots and not any(self._waiters.values()):
+            self._active += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        entry = (loop.time(), loop.create_future())
+        self._waiters[lane].append(entry)
+        try:
+            await entry[1]
+        except asyncio.CancelledError:
+            if entry[1].done() and not entry[1].cancelled():
+                """the slot was granted already"""
+                self.release()
+            else:
+                try:
+                    self._waiters[lane].remove(entry)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self) -> None:
+        self._active -= 1
+        self._wakeup()
+
+    def _wakeup(self) -> None:
+        while self._active < self.slots and (entry := self._next()) is not None:
+            _, fut = entry
+            if fut.done():
+                continue
+            self._active += 1
+            fut.set_result(None)
+
+    def _next(self):
+        now = asyncio.get_running_loop().time()
+        starved = [w for w in self._waiters.values() if w and now - w[0][0] > self.starvation]
+        if starved:
+            lane = min(starved, key=lambda w: w[0][0])
+            self.log.debug(f"starvation {now - lane[0][0]:.1f}s")
+            return lane.popleft()
+
+        for lane in Priority:
+            if self._waiters[lane]:
+                return self._waiters[lane].popleft()
+        return None
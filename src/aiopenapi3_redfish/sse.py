@@ -0,0 +1,76 @@
+from typing import List, NamedTuple, Optional
+
+
+class ServerSentEvent(NamedTuple):
+    event: str
+    data: str
+    id: Optional[str]
+    retry: Optional[int]
+
+
+class SSEParser:
+    """
+    incremental text/event-stream parser
+
+    https://html.spec.whatwg.org/multipage/server-sent-events.html#event-stream-interpretation
+
+    feed() the response body in chunks, returns the events completed by the chunk
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._data: List[str] = list()
+        self._event = ""
+        self._retry: Optional[int] = None
+        self.last_id: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> List[ServerSentEvent]:
+        self._buf += chunk
+        r = list()
+        start = 0
+        end = len(self._buf)
+        while start < end:
+            lf = self._buf.find(b"\n", start)
+            cr = self._buf.find(b"\r", start, lf if lf != -1 else end)
+            if cr != -1:
+                if cr + 1 == end:
+                    """\r\n may be split across chunks"""
+                    break
+                eol, skip = cr, 2 if self._buf[cr + 1] == 0x0A else 1
+            elif lf != -1:
+                eol, skip = lf, 1
+            else:
+                break
+            if (event := self._line(bytes(self._buf[start:eol]).decode("utf-8", errors="replace"))) is not None:
+                r.append(event)
+            start = eol + skip
+        del self._buf[:start]
+        return r
+
+    def _line(self, line: str) -> Optional[ServerSentEvent]:
+        if line == "":
+            return self._dispatch()
+        if line[0] == ":":
+            return None
+        field, _, value = line.partition(":")
+        if value[:1] == " ":
+            value = value[1:]
+        match field:
+            case "data":
+                self._data.append(value)
+            case "event":
+                self._event = value
+            case "id":
+                if "\0" not in value:
+                    self.last_id = value
+            case "retry":
+                if value.isdigit():
+                    self._retry = int(value)
+        return None
+
+    def _dispatch(self) -> Optional[ServerSentEvent]:
+        data, event, retry = self._data, self._event, self._retry
+        self._data, self._event, self._retry = list(), "", None
+        if not data and retry is None:
+            return None
+        return ServerSentEvent(event or "message", "\n".join(data), self.last_id, retry)
@@ -1,5 +1,255 @@
 import asyncio
+import collections
 import logging
+import statistics
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Hashable, Iterable, List, NamedTuple
+from typing import Optional, Union
+
+
+class Result(NamedTuple):
+    item: Any
+    value: Any
+    error: Optional[BaseException]
+    waited: float
+    """seconds queued"""
+    elapsed: float
+    """seconds processing"""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Stats(NamedTuple):
+    queued: int
+    inflight: int
+    done: int
+    failed: int
+    cancelled: int
+    latency: float
+    """mean seconds processing of the recent items"""
+    p95: float
+    """95th percentile seconds processing of the recent items"""
+
+
+_STOP = object()
+
+
+class WorkerPool:
+    """
+    process items concurrently
+
+    async with WorkerPool(update, concurrency=32, key=lambda host: host.bmc, per_key=1) as pool:
+        for host in hosts:
+            await pool.submit(host)
+        async for result in pool.results():
+            …
+
+    or
+
+    async for result in WorkerPool(update, concurrency=32).map(hosts):
+        …
+
+    The queue depth (maxsize) limits the items submitted ahead, concurrency the items processed.
+    Items with the same key are processed at most per_key at a time - items of busy keys are deferred without
+    occupying a worker.
+    Leaving the context waits for the queued items (drain), cancels in case of an exception.
+    """
+
+    log = logging.getLogger("aiopenapi3_redfish.WorkerPool")
+
+    def __init__(
+        self,
+        fn: Callable[[Any], Awaitable[Any]],
+        concurrency: int = 8,
+        maxsize: int = 0,
+        key: Callable[[Any], Hashable] = None,
+        per_key: int = 1,
+        results: bool = True,
+    ):
+        """
+        :param fn: the coroutine function processing an item
+        :param concurrency: the number of workers
+        :param maxsize: the queue depth, 0 for unbounded
+        :param key: the key of an item for per_key limits, e.g. the BMC
+        :param per_key: the number of items processed concurrently per key
+        :param results: stream the results via results(), else the failed ones are collected in errors
+        """
+        self.fn = fn
+        self.concurrency = concurrency
+        self.key = key
+        self.per_key = per_key
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._results: Optional[asyncio.Queue] = asyncio.Queue() if results else None
+        self._active: collections.Counter = collections.Counter()
+        self._deferred: dict[Hashable, collections.deque] = collections.defaultdict(collections.deque)
+        self._workers: List[asyncio.Task] = list()
+        self._latency: collections.deque = collections.deque(maxlen=1024)
+        self._closed = False
+        self._finished = False
+        self.errors: List[Result] = list()
+        self.inflight = self.done = self.failed = self.cancelled = 0
+
+    async def __aenter__(self) -> "WorkerPool":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.join()
+        else:
+            await self.cancel()
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    def stats(self) -> Stats:
+        queued = self._queue.qsize() + sum(map(len, self._deferred.values()))
+        latency = list(self._latency)
+        mean = statistics.fmean(latency) if latency else 0.0
+        p95 = statistics.quantiles(latency, n=20)[-1] if len(latency) > 1 else mean
+        return Stats(queued, self.inflight, self.done, self.failed, self.cancelled, mean, p95)
+
+    async def submit(self, item: Any) -> None:
+        """
+        queue an item, waits if the queue is full
+
+        :raises RuntimeError: the pool is closed
+        """
+        if self._closed:
+            raise RuntimeError("WorkerPool closed")
+        self.start()
+        await self._queue.put((item, asyncio.get_running_loop().time()))
+
+    async def close(self) -> None:
+        """
+        stop accepting items, the workers finish the queued items
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            await self._queue.put(_STOP)
+
+    async def join(self) -> None:
+        """
+        drain - close and wait for the queued items to be processed
+        """
+        if self._finished:
+            return
+        await self.close()
+        await asyncio.gather(*self._workers)
+        self._finish()
+
+    async def cancel(self) -> None:
+        """
+        cancel the items in flight and drop the queued ones
+        """
+        if self._finished:
+            return
+        self._closed = True
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        while not self._queue.empty():
+            if self._queue.get_nowait() is not _STOP:
+                self.cancelled += 1
+        self.cancelled += sum(map(len, self._deferred.values()))
+        self._deferred.clear()
+        self._finish()
+
+    def _finish(self) -> None:
+        self._finished = True
+        if self._results is not None:
+            self._results.put_nowait(_STOP)
+
+    async def results(self) -> AsyncIterator[Result]:
+        """
+        the results in the order of completion, ends after join()/cancel()
+        """
+        if self._results is None:
+            raise ValueError("results disabled")
+        while (r := await self._results.get()) is not _STOP:
+            yield r
+
+    async def map(self, items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Result]:
+        """
+        submit the items and stream the results, the pool is drained afterwards
+        """
+
+        async def feed():
+            try:
+                if hasattr(items, "__aiter__"):
+                    async for item in items:
+                        await self.submit(item)
+                else:
+                    for item in items:
+                        await self.submit(item)
+            except BaseException:
+                await self.cancel()
+                raise
+            await self.join()
+
+        self.start()
+        feeder = asyncio.create_task(feed())
+        try:
+            async for r in self.results():
+                yield r
+            await feeder
+        finally:
+            if not feeder.done():
+                feeder.cancel()
+                await asyncio.gather(feeder, return_exceptions=True)
+                await self.cancel()
+
+    async def _worker(self) -> None:
+        while (entry := await self._queue.get()) is not _STOP:
+            key = self.key(entry[0]) if self.key else None
+            if key is not None and self._active[key] >= self.per_key:
+                self._deferred[key].append(entry)
+                continue
+            while entry is not None:
+                await self._process(entry, key)
+                entry = None
+                if key is not None and (deferred := self._deferred.get(key, None)):
+                    entry = deferred.popleft()
+                    if not deferred:
+                        del self._deferred[key]
+
+    async def _process(self, entry, key) -> None:
+        item, queued = entry
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self.inflight += 1
+        self._active[key] += 1
+        value = error = None
+        try:
+            value = await self.fn(item)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception as e:
+            error = e
+        finally:
+            self.inflight -= 1
+            if (n := self._active[key] - 1) > 0:
+                self._active[key] = n
+            else:
+                del self._active[key]
+
+        elapsed = loop.time() - start
+        self._latency.append(elapsed)
+        r = Result(item, value, error, start - queued, elapsed)
+        if error is None:
+            self.done += 1
+        else:
+            self.failed += 1
+            self.log.warning(f"Error processing {item!r}: {error!r}")
+        if self._results is not None:
+            self._results.put_nowait(r)
+        elif error is not None:
+            self.errors.append(r)
 
 
 class AsyncTask:
@@ -14,55 +264,28 @@ class AsyncTask:
 
 class AsyncTaskSet:
     """
-    inspiration https://pymotw.com/3/asyncio/synchronization.html#queues
+    consume the items produced by an AsyncTask concurrently
     """
 
     log = logging.getLogger("aiopenapi3_redfish.AsyncTaskSet")
 
-    def __init__(self, task, num_consumers=3):
+    def __init__(self, task, num_consumers=3, maxsize=None, key=None, per_key=1):
+        """
+        :param num_consumers: the number of items consumed concurrently
+        :param maxsize: the number of items produced ahead, defaults to num_consumers
+        """
         assert isinstance(task, AsyncTask), task
         self.task = task
-        self.tasks: asyncio.Queue = asyncio.Queue(maxsize=num_consumers)
-
-    async def producer(self):
-        self.log.debug("producer: starting")
-        async for i in self.task.produce():
-            await self.tasks.put(i)
-            self.log.debug(f"producer: added task {i} to the queue")
-
-        # Add Stop signals / None entries in the queue
-        self.log.debug("producer: adding stop signals to the queue")
-        for i in range(self.tasks.maxsize):
-            await self.tasks.put(None)
-        self.log.debug("producer: waiting for queue to empty")
-        await self.tasks.join()
-        self.log.debug("producer: ending")
-
-    async def consumer(self, n):
-        self.log.debug(f"consumer {n}: starting")
-        item = await self.tasks.get()
-        while item is not None:
-            self.log.debug(f"consumer {n}: has item {item}")
-            try:
-                async with asyncio.TaskGroup() as tg:
-                    task = tg.create_task(self.task.consume(item))
-            except* Exception as e:
-                self.log.warning(f"Error processing %s" % item)
-                self.log.exception(e)
-            else:
-                self.log.debug(f"consumer {n}: finished item")
-            self.tasks.task_done()
-            self.log.debug(f"consumer {n}: waiting for item")
-            item = await self.tasks.get()
-
-        # None is the signal to stop.
-        self.tasks.task_done()
-        self.log.debug(f"consumer {n}: ending")
-
-    async def run(self):
-        async with asyncio.TaskGroup() as tg:
-            # Scheduled the consumer tasks.
-            consumers = [tg.create_task(self.consumer(i)) for i in range(self.tasks.maxsize)]
-
-            # Schedule the producer task.
-            prod = tg.create_task(self.producer())
+        self.pool = WorkerPool(
+            task.consume,
+            concurrency=num_consumers,
+            maxsize=num_consumers if maxsize is None else maxsize,
+            key=key,
+            per_key=per_key,
+        )
+
+    async def run(self) -> List[Result]:
+        """
+        :return: the Results of all items
+        """
+        return [r async for r in self.pool.map(self.task.produce())]
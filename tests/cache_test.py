@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from aiopenapi3_redfish.cache import ResourceCache
+from aiopenapi3_redfish.hub import EventHub
+
+
+def event(MessageId, OriginOfCondition):
+    return {
+        "@odata.type": "#Event.v1_8_0.Event",
+        "Events": [{"MessageId": MessageId, "OriginOfCondition": {"@odata.id": OriginOfCondition}}],
+    }
+
+
+class Client:
+    """the SSE stream connects if connect, else it keeps reconnecting as AsyncEventService.events() does"""
+
+    def __init__(self, connect=True):
+        self.connect = connect
+        self.onConnection = None
+        self.hub = EventHub(self)
+
+    @property
+    def EventService(self):
+        return self
+
+    async def events(self, onConnection=None):
+        self.onConnection = onConnection
+        if self.connect:
+            onConnection(True)
+        await asyncio.Event().wait()
+        yield
+
+
+@pytest.mark.asyncio
+async def test_ResourceCache_events():
+    client = Client()
+    cache = ResourceCache(client, ttl=0, event_ttl=3600)
+    await cache.start()
+    await asyncio.sleep(0.01)
+    assert cache.live
+
+    cache.put("/redfish/v1/Systems", 0)
+    cache.put("/redfish/v1/Systems/1", 1)
+    cache.put("/redfish/v1/Systems/1/Bios", 2)
+    assert cache.get("/redfish/v1/Systems/1") == 1
+
+    client.hub.publish(event("ResourceEvent.1.2.ResourceChanged", "/redfish/v1/Systems/1"))
+    client.hub.publish(event("Base.1.8.Success", "/redfish/v1/Systems/1/Bios"))
+    await asyncio.sleep(0.01)
+
+    assert cache.get("/redfish/v1/Systems/1") is None
+    assert cache.get("/redfish/v1/Systems") is None
+    assert cache.get("/redfish/v1/Systems/1/Bios") == 2
+
+    """disconnected - the entries expire after ttl"""
+    client.onConnection(False)
+    assert not cache.live
+    assert cache.get("/redfish/v1/Systems/1/Bios") is None
+
+    await cache.stop()
+    assert client.hub._task is None
+
+
+@pytest.mark.asyncio
+async def test_ResourceCache_ttl():
+    client = Client(connect=False)
+    cache = ResourceCache(client, ttl=0.05, event_ttl=3600)
+    await cache.start()
+    await asyncio.sleep(0.01)
+    assert not cache.live
+
+    cache.put("/redfish/v1/Systems/1", 1)
+    assert cache.get("/redfish/v1/Systems/1") == 1
+    await asyncio.sleep(0.06)
+    assert cache.get("/redfish/v1/Systems/1") is None
+
+    """connected later"""
+    client.onConnection(True)
+    assert cache.live
+    await cache.stop()
+
+
+def test_ResourceCache_query():
+    cache = ResourceCache(Client(), ttl=3600)
+    cache.put("/redfish/v1/Systems?$skip=0&$top=2", 0)
+    cache.put("/redfish/v1/Systems?$skip=2&$top=2", 1)
+    cache.put("/redfish/v1/Systems/1?$select=Id", 2)
+    cache.put("/redfish/v1/Chassis?$skip=2", 3)
+
+    cache.invalidate("/redfish/v1/Systems/1")
+    assert cache.get("/redfish/v1/Systems?$skip=0&$top=2") is None
+    assert cache.get("/redfish/v1/Systems?$skip=2&$top=2") is None
+    assert cache.get("/redfish/v1/Systems/1?$select=Id") is None
+    assert cache.get("/redfish/v1/Chassis?$skip=2") == 3
+    assert cache.invalidated == 3 and list(cache._keys) == ["/redfish/v1/Chassis"]
+
+
+def test_ResourceCache_inflight():
+    """a GET sent before an invalidation is not stored"""
+    cache = ResourceCache(Client(), ttl=3600)
+    generation = cache.generation("/redfish/v1/Systems?$skip=2")
+    cache.invalidate("/redfish/v1/Systems/1")
+    cache.put("/redfish/v1/Systems?$skip=2", 0, generation)
+    assert cache.get("/redfish/v1/Systems?$skip=2") is None
+
+    generation = cache.generation("/redfish/v1/Systems?$skip=2")
+    cache.put("/redfish/v1/Systems?$skip=2", 0, generation)
+    assert cache.get("/redfish/v1/Systems?$skip=2") == 0
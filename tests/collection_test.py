@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel, ConfigDict, Field
+
+from aiopenapi3_redfish.base import AsyncCollection, AsyncResourceRoot
+from aiopenapi3_redfish.scheduler import Priority
+
+
+class Reference(BaseModel):
+    odata_id_: str = Field(alias="@odata.id")
+
+
+class Collection(BaseModel):
+    model_config = ConfigDict(extra="allow")
+    odata_id_: str = Field(alias="@odata.id")
+    Members: list[Reference]
+
+
+class Client:
+    _cache = None
+
+    class config:
+        connections = 2
+
+    def __init__(self, size, top):
+        self.requests = []
+        self.priorities = []
+        self.pages = dict()
+        for skip in range(0, size, top):
+            path = f"/redfish/v1/Items?$skip={skip}" if skip else "/redfish/v1/Items"
+            data = {
+                "@odata.id": "/redfish/v1/Items",
+                "Members": [{"@odata.id": f"/redfish/v1/Items/{i}"} for i in range(skip, min(skip + top, size))],
+            }
+            if skip + top < size:
+                data["Members@odata.nextLink"] = f"/redfish/v1/Items?$skip={skip + top}"
+            self.pages[path] = Collection.model_validate(data)
+
+    async def get(self, path, priority=None):
+        self.requests.append(path)
+        self.priorities.append(Priority.of(priority))
+        await asyncio.sleep(0)
+        return self.pages[path]
+
+    async def get_many(self, paths, concurrency=None, return_exceptions=False, priority=None):
+        self.priorities.extend(Priority.of(priority) for _ in paths)
+        return list(paths)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch", [False, True])
+async def test_Collection_pages(prefetch):
+    client = Client(10, 3)
+    c = await AsyncCollection[AsyncResourceRoot]().asyncNew(client, "/redfish/v1/Items")
+    assert len(client.requests) == 1
+
+    async for i in c._members(prefetch):
+        await asyncio.sleep(0.01)
+        if i.odata_id_.endswith("/2"):
+            break
+    assert len(client.requests) == (2 if prefetch else 1)
+
+    ids = [i.odata_id_ async for i in c._members(prefetch)]
+    assert ids == [f"/redfish/v1/Items/{i}" for i in range(10)]
+    assert client.requests[-1] == "/redfish/v1/Items?$skip=9"
+
+
+class Item(AsyncResourceRoot):
+    @classmethod
+    async def asyncFromValue(cls, client, odata_id_, value, priority=None):
+        return odata_id_
+
+
+@pytest.mark.asyncio
+async def test_Collection_list_priority():
+    """the lane applies to the requests of list() only - not to the consumer"""
+    client = Client(10, 3)
+    c = await AsyncCollection[Item]().asyncNew(client, "/redfish/v1/Items")
+    ids = []
+    async for i in c.list(priority="bulk"):
+        assert Priority.of(None) == Priority.normal
+        ids.append(i)
+    assert ids == [f"/redfish/v1/Items/{i}" for i in range(10)]
+    assert client.priorities == [Priority.normal] + [Priority.bulk] * 13
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from aiopenapi3_redfish.deadline import Deadline, bounded, check, remaining, sleep
+
+
+@pytest.mark.asyncio
+async def test_Deadline_nested():
+    assert remaining() is None
+    async with Deadline(10):
+        outer = remaining()
+        async with Deadline(60):
+            assert remaining() <= outer
+        async with Deadline(1):
+            assert remaining() <= 1
+
+
+@pytest.mark.asyncio
+async def test_Deadline_refuse():
+    with pytest.raises(TimeoutError):
+        async with Deadline(1, minimum=2):
+            check()
+
+    with pytest.raises(TimeoutError):
+        async with Deadline(1):
+            await sleep(5)
+
+
+@pytest.mark.asyncio
+async def test_Deadline_tasks():
+    async def work():
+        async with bounded():
+            await asyncio.sleep(5)
+
+    with pytest.raises(TimeoutError):
+        async with Deadline(0.05):
+            task = asyncio.create_task(work())
+            await asyncio.sleep(0)
+        await task
@@ -255,6 +255,21 @@ async def test_new_Client(client):
     return None
 
 
+@pytest.mark.asyncio
+async def test_get_many(client):
+    paths = [i.odata_id_ for i in client.Systems._data] + ["/redfish/v1/Systems/invalid"]
+    r = await client.get_many(paths + paths[:1], return_exceptions=True)
+    assert len(r) == len(paths) + 1
+    assert r[0] is r[-1]
+    assert isinstance(r[-2], RedfishException)
+
+    with pytest.raises(RedfishException):
+        await client.get_many(paths)
+
+    async for path, value in client.iter_many(paths[:-1]):
+        assert value.odata_id_ == path
+
+
 @pytest.mark.asyncio
 async def test_Manager(client):
     manager = client.Manager
@@ -315,6 +330,15 @@ async def test_Action_EID_674_Manager_ExportSystemConfiguration(client: aiopenap
     assert payload.startswith(b"<SystemConfiguration")
 
 
+@pytest.mark.asyncio
+async def test_TaskService_wait_for_many(client: aiopenapi3_redfish.AsyncClient):
+    export = client.Manager.Actions.Oem["#OemManager.ExportSystemConfiguration"].export
+    ids = [(await export()).Id for _ in range(2)]
+    async for TaskId, payload in client.TaskService.wait_for_many(ids):
+        assert TaskId in ids
+        assert payload.startswith(b"<SystemConfiguration")
+
+
 @pytest.mark.skip(reason="missing template")
 @pytest.mark.asyncio
 async def test_Action_EID_674_Manager_ImportSystemConfiguration(client: aiopenapi3_redfish.AsyncClient):
@@ -343,32 +367,14 @@ async def test_EventService_SSE(client, capsys):
     async def sendtestevent():
         for i in range(3):
             await client.EventService.SubmitTestEvent(EventType="Alert", MessageId="AMP0300")
-            asyncio.sleep(5)
+            await asyncio.sleep(5)
 
     task = asyncio.create_task(sendtestevent())
 
-    async def process():
-        data = b""
-        while True:
-            data += yield
-            lines = data.split(b"\n")
-            if lines[-1] == b"":
-                data = b""
-            else:
-                data = lines[-1]
-                lines = lines[:-1]
-            for l in lines:
-                with capsys.disabled():
-                    print(l)
-
-    p = process()
-    await p.asend(None)
-
-    req = client.api._[(client.EventService.ServerSentEventUri, "get")]
-    headers, schema_, session, result = await req.stream()
     l = 0
-    async for i in result.aiter_bytes():
-        await p.asend(i)
+    async for event in client.EventService.events():
+        with capsys.disabled():
+            print(event)
         l += 1
         if l > 2:
             break
@@ -510,7 +516,7 @@ async def test_DellSoftwareInstallationServiceGetRepoBasedUpdateList(client, cap
             filter(lambda x: isinstance(x, str), map(lambda x: x.text, et.findall('.//PROPERTY[@NAME="JobID"]/VALUE')))
         )
         print(jids)
-        done, todo, error = await client.JobService.wait_for(*jids)
+        todo, done, error = await client.JobService.wait_for(*jids)
         for job in done:
             print(f"{job.Id=} {job.JobStatus=} {job.Messages[0].root.MessageId}/{job.Messages[0].root.Message}")
 
@@ -533,6 +539,13 @@ async def test_Jobs(client, capsys):
         raise ValueError("DellJob not found")
 
 
+@pytest.mark.asyncio
+async def test_Jobs_stream(client):
+    jobs = await client.Manager.Links.Oem.Dell.Jobs.refresh()
+    ids = [i.odata_id_ async for i in jobs.stream()]
+    assert ids == [i.odata_id_ for i in jobs._data]
+
+
 @pytest.mark.asyncio
 async def test_BIOS(client, capsys):
     sys = await client.Systems.index("System.Embedded.1")
@@ -0,0 +1,41 @@
+import types
+
+import pydantic
+
+from aiopenapi3_redfish.Oem.Dell.oem import DellAttributes
+
+
+class Attributes(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(extra="allow")
+
+
+def attributes(**kwargs):
+    return types.SimpleNamespace(
+        Attributes=Attributes.model_validate({k.replace("_", "."): v for k, v in kwargs.items()})
+    )
+
+
+def test_DellAttributes_index():
+    obj = DellAttributes(
+        None,
+        attributes(
+            Users_10_UserName="admin",
+            Users_2_UserName="root",
+            Users_2_Privilege=511,
+            Users_2_Enable="Enabled",
+            NTPConfigGroup_1_NTP1="ntp.example.org",
+        ),
+    )
+    index = obj.list()
+    assert list(index["Users"]) == ["2", "10"]
+    assert obj.list() is index
+
+    assert obj.get("Users", 2, "UserName") == "root"
+    assert obj.get("Users", 2) == {"Enable": "Enabled", "Privilege": 511, "UserName": "root"}
+    assert obj.filter('.Users.[] | select(.Enable == "Enabled") | .UserName').all() == ["root"]
+    assert obj.filter('.NTPConfigGroup."1".NTP1').first() == "ntp.example.org"
+
+    """a new value invalidates the index"""
+    obj._v = attributes(Users_2_UserName="operator")
+    assert obj.list() is not index
+    assert obj.filter('.Users."2".UserName').first() == "operator"
@@ -0,0 +1,89 @@
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+import types
+
+import httpx
+import pytest
+
+from aiopenapi3_redfish.Oem.Dell.clinic import DellTaskServiceMonitor
+
+Profile = b'<SystemConfiguration Model="PowerEdge R650">' + b"<Component/>" * 4096 + b"</SystemConfiguration>"
+
+
+class Response:
+    def __init__(self, status_code, content, content_type):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {"content-type": content_type}
+        self._offset = 0
+        self._consumed = False
+
+    async def aiter_bytes(self, chunk_size):
+        """as httpx - the body can be read once"""
+        if self._consumed:
+            raise httpx.StreamConsumed()
+        self._consumed = True
+        while self._offset < len(self.content):
+            chunk = self.content[self._offset : self._offset + chunk_size]
+            self._offset += len(chunk)
+            yield chunk
+
+    async def aread(self):
+        if self._consumed:
+            raise httpx.StreamConsumed()
+        self._consumed = True
+        return self.content
+
+
+def task(state, status="OK"):
+    return json.dumps(
+        {"@odata.type": "#Task.v1_6_0.Task", "Id": "JID_1", "TaskState": state, "TaskStatus": status}
+    ).encode()
+
+
+class Client:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    @contextlib.asynccontextmanager
+    async def stream(self, path):
+        assert path == "/redfish/v1/TaskService/Tasks/JID_1"
+        yield None, self.responses.pop(0)
+
+
+def monitor(client):
+    r = DellTaskServiceMonitor.__new__(DellTaskServiceMonitor)
+    r._client = client
+    r.Tasks = types.SimpleNamespace(_v=types.SimpleNamespace(odata_id_="/redfish/v1/TaskService/Tasks"))
+    return r
+
+
+@pytest.mark.asyncio
+async def test_download(tmp_path):
+    client = Client(
+        Response(202, task("Running"), "application/json"),
+        Response(200, task("Running"), "application/json"),
+        Response(200, Profile, "application/xml"),
+    )
+    path = tmp_path / "profile.xml.gz"
+    r = await monitor(client).download("JID_1", path, compress=True, pollInterval=0, chunk_size=1024)
+    assert r.size == len(Profile) and r.sha256 == hashlib.sha256(Profile).hexdigest()
+    assert r.content_type == "application/xml" and r.compressed
+    assert r.written == path.stat().st_size < r.size
+    assert gzip.decompress(path.read_bytes()) == Profile
+    assert not (tmp_path / "profile.xml.gz.part").exists()
+
+    sink = io.BytesIO()
+    r = await monitor(Client(Response(200, Profile, "application/xml"))).download("JID_1", sink)
+    assert sink.getvalue() == Profile and r.written == r.size
+
+
+@pytest.mark.asyncio
+async def test_download_failed(tmp_path):
+    client = Client(Response(200, task("Exception", "Critical"), "application/json"))
+    with pytest.raises(ValueError):
+        await monitor(client).download("JID_1", tmp_path / "profile.xml")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import types
+from typing import Optional
+
+import pydantic
+import pytest
+
+from aiopenapi3_redfish.entities.service import AsyncUpdateService
+from aiopenapi3_redfish.firmware import Bandwidth, FirmwareImage, multipart
+
+
+@pytest.fixture
+def image(tmp_path):
+    (path := tmp_path / "firmware.exe").write_bytes(bytes(range(256)) * 1000)
+    with FirmwareImage(path) as image:
+        yield image
+
+
+@pytest.mark.asyncio
+async def test_multipart(image):
+    sent = []
+    headers, body = multipart(image, {"Targets": []}, chunk_size=10000, progress=lambda n, total: sent.append(n))
+    data = b"".join([chunk async for chunk in body])
+    assert len(data) == int(headers["Content-Length"])
+    boundary = headers["Content-Type"].partition("boundary=")[2]
+    parts = data.split(f"--{boundary}".encode())
+    assert parts[1].endswith(b'\r\n\r\n{"Targets": []}\r\n')
+    assert parts[2].split(b"\r\n\r\n", 1)[1] == bytes(image.read(0, len(image))) + b"\r\n"
+    """views of the mapping, not copies"""
+    assert isinstance(image.read(0, 10), memoryview)
+    assert parts[3] == b"--\r\n"
+    assert sent[-1] == len(image) == 256000 and len(sent) == 26
+
+
+@pytest.mark.asyncio
+async def test_Bandwidth():
+    bandwidth = Bandwidth(1000000, burst=0)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*[bandwidth.acquire(10000) for _ in range(5)])
+    assert 0.04 <= loop.time() - start < 0.2
+    assert bandwidth.transferred == 50000
+
+
+class Client:
+    def __init__(self):
+        self.log = types.SimpleNamespace(info=lambda *args: None)
+        self.received = None
+
+        async def wait_for(TaskId, maxWait):
+            return {"Id": TaskId, "TaskState": "Completed"}
+
+        self.TaskService = types.SimpleNamespace(wait_for=wait_for)
+
+    async def push(self, path, content, headers):
+        assert path == "/redfish/v1/UpdateService/MultipartUpload"
+        self.received = b"".join([chunk async for chunk in content])
+        return types.SimpleNamespace(headers={"Location": "/redfish/v1/TaskService/Tasks/JID_1"})
+
+
+@pytest.mark.asyncio
+async def test_upload(image):
+    client = Client()
+    service = AsyncUpdateService.__new__(AsyncUpdateService)
+    service._client = client
+    service._v = types.SimpleNamespace(MultipartHttpPushUri="/redfish/v1/UpdateService/MultipartUpload")
+
+    r = await service.upload(image, Oem={"Dell": {}})
+    assert r.TaskId == "JID_1" and r.task["TaskState"] == "Completed"
+    assert b'"@Redfish.OperationApplyTime": "Immediate"' in client.received
+    assert json.dumps({"Dell": {}}).encode() in client.received
+
+
+class SimpleUpdate(pydantic.BaseModel):
+    ImageURI: str
+    TransferProtocol: Optional[str] = None
+
+
+class Action:
+    def __init__(self, data):
+        self.req = types.SimpleNamespace(data=data)
+        self.data = SimpleUpdate
+        self.calls = []
+
+    async def __call__(self, data=None):
+        self.calls.append(data)
+        return types.SimpleNamespace(Id="JID_1")
+
+
+class Actions:
+    def __init__(self, **actions):
+        self.actions = actions
+
+    def __getitem__(self, name):
+        return self.actions[name]
+
+
+@pytest.mark.asyncio
+async def test_actions():
+    simple, start = Action(SimpleUpdate), Action(None)
+    service = AsyncUpdateService.__new__(AsyncUpdateService)
+    service._v = types.SimpleNamespace(
+        Actions=Actions(**{"#UpdateService.SimpleUpdate": simple, "#UpdateService.StartUpdate": start})
+    )
+
+    r = await service.SimpleUpdate("https://repo/firmware.exe", TransferProtocol="HTTPS")
+    assert r.Id == "JID_1"
+    assert simple.calls == [{"ImageURI": "https://repo/firmware.exe", "TransferProtocol": "HTTPS"}]
+
+    await service.StartUpdate()
+    assert start.calls == [None]
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from aiopenapi3_redfish.hub import EventHub
+
+
+def event(MessageId, OriginOfCondition, EventType="Alert"):
+    return {
+        "@odata.type": "#Event.v1_8_0.Event",
+        "Events": [
+            {
+                "EventType": EventType,
+                "MessageId": MessageId,
+                "OriginOfCondition": {"@odata.id": OriginOfCondition},
+            }
+        ],
+    }
+
+
+class Client:
+    class EventService:
+        @staticmethod
+        async def events(onConnection=None):
+            """the SSE stream - idle"""
+            await asyncio.Event().wait()
+            yield
+
+
+@pytest.mark.asyncio
+async def test_EventHub():
+    hub = EventHub(Client())
+
+    tasks = hub.subscribe(MessageId="TaskEvent", OriginOfCondition="/redfish/v1/TaskService/Tasks")
+    changed = hub.subscribe(MessageId="ResourceEvent.ResourceChanged")
+    system = hub.subscribe(OriginOfCondition="/redfish/v1/Systems/System.Embedded.1", maxsize=1)
+    everything = hub.subscribe()
+
+    hub.publish(event("TaskEvent.1.0.TaskCompletedOK", "/redfish/v1/TaskService/Tasks/JID_1"))
+    hub.publish(event("ResourceEvent.1.2.ResourceChanged", "/redfish/v1/Systems/System.Embedded.1"))
+    hub.publish(event("ResourceEvent.1.2.ResourceCreated", "/redfish/v1/Systems/System.Embedded.1/Bios"))
+    hub.publish({"@odata.type": "#MetricReport.v1_5_0.MetricReport", "MetricValues": []})
+
+    assert tasks.queue.qsize() == 1
+    assert changed.queue.qsize() == 1
+    assert system.queue.qsize() == 1 and system.dropped == 1
+    assert everything.queue.qsize() == 4
+
+    n = await system.__anext__()
+    assert n.record["MessageId"] == "ResourceEvent.1.2.ResourceCreated"
+
+    assert hub.received == 4
+    for s in (tasks, changed, system, everything):
+        await s.close()
+    assert hub._task is None
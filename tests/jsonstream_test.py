@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from aiopenapi3_redfish.jsonstream import MembersParser
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_MembersParser(chunk_size):
+    doc = {
+        "@odata.id": "/redfish/v1/Managers/iDRAC.Embedded.1/LogServices/Lclog/Entries",
+        "Members@odata.count": 1000,
+        "Members": [{"@odata.id": f"/redfish/v1/Entries/{i}", "Message": "ä" * (i % 7), "Id": i} for i in range(1000)],
+        "Members@odata.nextLink": "/redfish/v1/Managers/iDRAC.Embedded.1/LogServices/Lclog/Entries?$skip=1000",
+    }
+    data = json.dumps(doc, indent=1, ensure_ascii=False).encode()
+
+    parser = MembersParser()
+    members = []
+    for i in range(0, len(data), chunk_size):
+        members.extend(parser.feed(data[i : i + chunk_size]))
+    members.extend(parser.feed(b"", final=True))
+
+    assert members == doc["Members"]
+    assert parser.envelope["Members@odata.count"] == 1000
+    assert parser.envelope["Members@odata.nextLink"].endswith("$skip=1000")
+
+
+def test_MembersParser_incomplete():
+    parser = MembersParser()
+    assert parser.feed(b'{"Members": [{"@odata.id": "/a"}, {"@odata.id"') == [{"@odata.id": "/a"}]
+    with pytest.raises(json.JSONDecodeError):
+        parser.feed(b"", final=True)
@@ -0,0 +1,59 @@
+import pytest
+
+from aiopenapi3_redfish.metrics import MetricStore, Series
+
+
+def test_Series_ring():
+    s = Series(capacity=4)
+    for i in range(10):
+        assert s.append(float(i), i * 10)
+    assert s.append(5.0, 0) is False
+    assert len(s) == 4 and s.last == (9.0, 90.0)
+
+    ts, vs = s.window()
+    assert ts.tolist() == [6.0, 7.0, 8.0, 9.0]
+    assert vs.tolist() == [60.0, 70.0, 80.0, 90.0]
+    assert vs.obj is s._v
+
+    ts, vs = s.window(7, 9)
+    assert ts.tolist() == [7.0, 8.0]
+
+
+def test_Series_retention():
+    s = Series(capacity=100, retention=5)
+    for i in range(20):
+        s.append(float(i), i)
+    assert s.timestamps().tolist() == [14.0, 15.0, 16.0, 17.0, 18.0, 19.0]
+
+
+@pytest.mark.parametrize("how, values", [("mean", [1.5, 5.5, 8.5]), ("max", [3, 7, 9]), ("last", [3, 7, 9])])
+def test_Series_downsample(how, values):
+    s = Series(capacity=16)
+    for i in range(10):
+        s.append(float(i), i)
+    ts, vs = s.downsample(4, start=0, how=how)
+    assert ts.tolist() == [0.0, 4.0, 8.0]
+    assert vs.tolist() == values
+
+
+def test_MetricStore():
+    report = {
+        "@odata.type": "#MetricReport.v1_4_2.MetricReport",
+        "Id": "PowerMetrics",
+        "Timestamp": "2024-01-01T00:00:10+00:00",
+        "MetricValues": [
+            {"MetricId": "SystemInputPower", "MetricValue": "320", "Timestamp": "2024-01-01T00:00:00+00:00"},
+            {"MetricId": "SystemInputPower", "MetricValue": "330", "Timestamp": "2024-01-01T00:00:05+00:00"},
+            {"MetricId": "PowerState", "MetricValue": "On"},
+            {"MetricId": "Temperature", "MetricProperty": "/redfish/v1/Chassis/1/Sensors/CPU1", "MetricValue": "55.5"},
+        ],
+    }
+    store = MetricStore()
+    assert store.ingest(report) == 3
+    assert store.ingest(report) == 0
+    assert store.skipped == 2
+
+    ts, vs = store.window("SystemInputPower")
+    assert vs.tolist() == [320.0, 330.0]
+    assert ts[0] == 1704067200.0
+    assert store["Temperature", "/redfish/v1/Chassis/1/Sensors/CPU1"].last == (1704067210.0, 55.5)
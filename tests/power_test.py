@@ -0,0 +1,96 @@
+import asyncio
+import contextlib
+import types
+
+import pytest
+
+from aiopenapi3_redfish.entities.service import AsyncSystem, PowerPolicy
+from aiopenapi3_redfish.hub import EventHub
+
+
+class Client:
+    def __init__(self):
+        self.hub = EventHub(self)
+        self.log = types.SimpleNamespace(info=lambda *args: None, debug=lambda *args: None)
+
+    @property
+    def EventService(self):
+        return self
+
+    async def events(self, onConnection=None):
+        onConnection(True)
+        await asyncio.Event().wait()
+        yield
+
+    def priority(self, value):
+        return contextlib.nullcontext()
+
+
+class System(AsyncSystem):
+    """a System which ignores GracefulShutdown"""
+
+    def __init__(self, client, PowerState):
+        self._client = client
+        self._root = self
+        self._v = types.SimpleNamespace(odata_id_="/redfish/v1/Systems/1", PowerState=PowerState)
+        self.resets = []
+        self.reads = 0
+
+    async def readPowerState(self):
+        self.reads += 1
+        return self._v.PowerState
+
+    async def refresh(self):
+        pass
+
+    async def Reset(self, ResetType):
+        self.resets.append(ResetType)
+        if ResetType in ("ForceOff", "On"):
+            self._v.PowerState = {"ForceOff": "Off", "On": "On"}[ResetType]
+            self._client.hub.publish(
+                {
+                    "Events": [
+                        {
+                            "MessageId": "ResourceEvent.1.0.ResourceChanged",
+                            "OriginOfCondition": {"@odata.id": self.odata_id_},
+                        }
+                    ]
+                }
+            )
+
+
+@pytest.mark.asyncio
+async def test_togglePower_escalation():
+    client = Client()
+    system = System(client, "On")
+    policy = PowerPolicy(Off=(("GracefulShutdown", 0.1), ("ForceOff", 1)), minInterval=0.01, maxInterval=0.02)
+    await system.togglePower(policy=policy)
+    assert system.resets == ["GracefulShutdown", "ForceOff"]
+    assert system.PowerState == "Off"
+
+    await system.togglePower("Off", policy)
+    assert system.resets[-1] == "On"
+    assert system.PowerState == "On"
+
+
+@pytest.mark.asyncio
+async def test_togglePower_timeout():
+    system = System(Client(), "On")
+    policy = PowerPolicy(Off=(("GracefulShutdown", 0.05),), minInterval=0.01, maxInterval=0.02)
+    with pytest.raises(TimeoutError):
+        await system.togglePower(policy=policy)
+    """polling backs off"""
+    assert system.reads < 10
+
+
+@pytest.mark.asyncio
+async def test_powerStates_events():
+    """the transition is observed via the event, not by polling"""
+    client = Client()
+    system = System(client, "On")
+    states = system.powerStates(minInterval=10, maxInterval=10)
+    assert await anext(states) == "On"
+    await system.Reset("ForceOff")
+    assert await asyncio.wait_for(anext(states), 1) == "Off"
+    assert system.reads == 2
+    await states.aclose()
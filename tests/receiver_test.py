@@ -0,0 +1,105 @@
+import asyncio
+import types
+
+import httpx
+import pydantic
+import pytest
+
+from aiopenapi3_redfish.entities.service import AsyncEventService
+from aiopenapi3_redfish.receiver import EventReceiver
+
+
+def event(n):
+    return {
+        "@odata.type": "#Event.v1_8_0.Event",
+        "Context": "bmc-1",
+        "Events": [{"EventType": "Alert", "MessageId": "TST100", "EventId": str(n)}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_EventReceiver():
+    async with EventReceiver(host="127.0.0.1", port=0, maxsize=8) as receiver:
+        url = f"http://127.0.0.1:{receiver.port}{receiver.path}"
+        async with httpx.AsyncClient() as bmc:
+            for i in range(10):
+                r = await bmc.post(url, json=event(i))
+                assert r.status_code == (204 if i < 8 else 503)
+
+            r = await bmc.post(url, content=b"{invalid")
+            assert r.status_code == 400
+            r = await bmc.get(url)
+            assert r.status_code == 405
+
+        batches = receiver.batches(size=5, interval=0.01)
+        batch = await anext(batches)
+        assert [i.event["Events"][0]["EventId"] for i in batch] == ["0", "1", "2", "3", "4"]
+        assert batch[0].context == "bmc-1"
+        batch = await anext(batches)
+        assert len(batch) == 3
+        await batches.aclose()
+
+        m = receiver.metrics()
+        assert (m.received, m.accepted, m.dropped, m.invalid, m.queued) == (11, 8, 2, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_EventReceiver_chunked():
+    """an oversized chunk line is rejected, the receiver keeps serving"""
+    async with EventReceiver(host="127.0.0.1", port=0) as receiver:
+        reader, writer = await asyncio.open_connection("127.0.0.1", receiver.port)
+        writer.write(
+            f"POST {receiver.path} HTTP/1.1\r\nHost: bmc\r\nTransfer-Encoding: chunked\r\n\r\n".encode()
+            + b"1;"
+            + b"x" * 2**17
+        )
+        await writer.drain()
+        assert (await reader.readline()).startswith(b"HTTP/1.1 400")
+        writer.close()
+
+        async with httpx.AsyncClient() as bmc:
+            r = await bmc.post(f"http://127.0.0.1:{receiver.port}{receiver.path}", json=event(0))
+            assert r.status_code == 204
+
+
+class Resource(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(extra="allow")
+    odata_id_: str = pydantic.Field(alias="@odata.id")
+
+
+class Client:
+    """a BMC providing the EventService"""
+
+    _cache = None
+
+    def __init__(self):
+        self.config = types.SimpleNamespace(target="https://bmc-1")
+        self.log = types.SimpleNamespace(info=lambda *args: None)
+        self.subscriptions = dict()
+        self.EventService = AsyncEventService(self, Resource.model_validate({"@odata.id": "/redfish/v1/EventService"}))
+
+    async def _request(self, path, method, data=None):
+        assert (path, method) == ("/redfish/v1/EventService/Subscriptions", "post")
+        odata_id_ = f"{path}/{len(self.subscriptions) + 1}"
+        self.subscriptions[odata_id_] = data
+        return Resource.model_validate({"@odata.id": odata_id_, **data})
+
+    async def delete(self, path):
+        del self.subscriptions[path]
+
+
+@pytest.mark.asyncio
+async def test_EventReceiver_subscribe():
+    client = Client()
+    async with EventReceiver(host="127.0.0.1", port=0) as receiver:
+        r = await receiver.subscribe(client, "https://collector:8443/redfish/events", RegistryPrefixes=["TST"])
+        assert r.odata_id_ == "/redfish/v1/EventService/Subscriptions/1"
+        assert client.subscriptions[r.odata_id_] == {
+            "Destination": "https://collector:8443/redfish/events",
+            "Protocol": "Redfish",
+            "SubscriptionType": "RedfishEvent",
+            "RegistryPrefixes": ["TST"],
+            "Context": "https://bmc-1",
+        }
+    """removed on stop()"""
+    assert client.subscriptions == {}
@@ -0,0 +1,172 @@
+import asyncio
+import contextlib
+import json
+import types
+
+import pydantic
+import pytest
+
+from aiopenapi3_redfish import registry
+from aiopenapi3_redfish.entities.settings import AsyncSettings
+from aiopenapi3_redfish.errors import AttributeValidationError
+from aiopenapi3_redfish.registry import AttributeRegistry
+
+Registry = {
+    "Id": "BiosAttributeRegistry.v1_0_3",
+    "RegistryVersion": "1.0.3",
+    "RegistryEntries": {
+        "Attributes": [
+            {
+                "AttributeName": "SysProfile",
+                "Type": "Enumeration",
+                "Value": [{"ValueName": "PerfOptimized"}, {"ValueName": "Custom"}],
+            },
+            {
+                "AttributeName": "ProcTurboMode",
+                "Type": "Enumeration",
+                "Value": [{"ValueName": "Enabled"}, {"ValueName": "Disabled"}],
+                "GrayOut": True,
+            },
+            {"AttributeName": "SerialNumber", "Type": "String", "ReadOnly": True},
+            {"AttributeName": "AssetTag", "Type": "String", "MaxLength": 10, "ValueExpression": "^[A-Z0-9]*$"},
+            {"AttributeName": "NumLock", "Type": "Boolean"},
+            {"AttributeName": "Timeout", "Type": "Integer", "LowerBound": 0, "UpperBound": 60, "ScalarIncrement": 5},
+            {
+                "AttributeName": "Enable",
+                "GroupName": "Users",
+                "Id": "iDRAC.Embedded.1#Users.4#Enable",
+                "Type": "Boolean",
+            },
+        ],
+        "Dependencies": [
+            {
+                "DependencyFor": "ProcTurboMode",
+                "Type": "Map",
+                "Dependency": {
+                    "MapFrom": [
+                        {"MapFromAttribute": "SysProfile", "MapFromCondition": "NEQ", "MapFromValue": "Custom"}
+                    ],
+                    "MapToAttribute": "ProcTurboMode",
+                    "MapToProperty": "GrayOut",
+                    "MapToValue": True,
+                },
+            }
+        ],
+    },
+}
+
+
+def test_AttributeRegistry_validate():
+    r = AttributeRegistry(Registry)
+    assert "Users.4.Enable" in r
+
+    r.validate({"SysProfile": "Custom", "ProcTurboMode": "Disabled"}, {"SysProfile": "PerfOptimized"})
+    r.validate({"AssetTag": "A1", "NumLock": False, "Timeout": 15, "Users.4.Enable": True})
+
+    with pytest.raises(AttributeValidationError) as e:
+        r.validate(
+            {
+                "SysProfile": "Fast",
+                "SerialNumber": "1",
+                "AssetTag": "a",
+                "NumLock": 1,
+                "Timeout": 61,
+                "Missing": 0,
+            }
+        )
+    assert set(e.value.errors) == {"SysProfile", "SerialNumber", "AssetTag", "NumLock", "Timeout", "Missing"}
+
+    assert r.errors({"Timeout": 7}) == {"Timeout": "7 not a multiple of 5"}
+    assert r.errors({"ProcTurboMode": "Disabled"}, {"SysProfile": "PerfOptimized"}) == {"ProcTurboMode": "read only"}
+
+
+class Attributes(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(extra="allow")
+
+
+class Bios(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(extra="allow")
+    odata_id_: str = pydantic.Field(alias="@odata.id")
+    Attributes: Attributes
+
+
+class Client:
+    def __init__(self, target="https://bmc", etag='"1"'):
+        self.config = types.SimpleNamespace(target=target)
+        self.etag = etag
+        self.requests = []
+        self.reads = 0
+        self._cache = None
+        self.log = types.SimpleNamespace(debug=lambda *args: None)
+        self.documents = {
+            "/redfish/v1/Registries/BiosAttributeRegistry.v1_0_3": {
+                "Location": [{"Language": "en", "Uri": "/registries/BiosAttributeRegistry.v1_0_3.json"}]
+            },
+            "/registries/BiosAttributeRegistry.v1_0_3.json": Registry,
+        }
+
+    @contextlib.asynccontextmanager
+    async def stream(self, path):
+        self.requests.append(("GET", path))
+        await asyncio.sleep(0)
+        content = json.dumps(self.documents[path]).encode()
+
+        async def aread():
+            self.reads += 1
+            return content
+
+        headers = {"etag": self.etag} if self.etag and path.endswith(".json") else {}
+        yield None, types.SimpleNamespace(aread=aread, headers=headers)
+
+    async def patch(self, path, data, context):
+        self.requests.append(("PATCH", path))
+        return data
+
+
+@pytest.mark.asyncio
+async def test_AsyncSettings_validate():
+    registry.clear()
+    client = Client()
+    settings = [
+        AsyncSettings(
+            client,
+            Bios.model_validate(
+                {
+                    "@odata.id": "/redfish/v1/Systems/1/Bios",
+                    "AttributeRegistry": "BiosAttributeRegistry.v1_0_3",
+                    "Attributes": {"SysProfile": "PerfOptimized", "ProcTurboMode": "Enabled"},
+                }
+            ),
+        )
+        for _ in range(2)
+    ]
+
+    r = await asyncio.gather(*[s.registry() for s in settings])
+    assert r[0] is r[1] and len(client.requests) == 2
+    assert await settings[0].registry() is r[0] and len(client.requests) == 2
+
+    with pytest.raises(AttributeValidationError):
+        await settings[0].set(Attributes={"ProcTurboMode": "Disabled"})
+    assert len(client.requests) == 2
+
+    await settings[0].set(Attributes={"SysProfile": "Custom", "ProcTurboMode": "Disabled"})
+    assert client.requests[-1] == ("PATCH", "/redfish/v1/Systems/1/Bios")
+
+
+def test_load():
+    """the document is read once per ETag - shared by the BMCs and the event loops, not shared without ETag"""
+    registry.clear()
+    clients = [
+        Client("https://bmc1"),
+        Client("https://bmc2"),
+        Client("https://bmc3", '"2"'),
+        Client("https://bmc4", None),
+        Client("https://bmc5", None),
+    ]
+    name = "BiosAttributeRegistry.v1_0_3"
+    r = [asyncio.run(registry.load(client, name)) for client in clients]
+    assert r[0] is r[1] and len({id(i) for i in r}) == 4
+    assert [client.reads for client in clients] == [2, 1, 2, 2, 2]
+    assert [len(client.requests) for client in clients] == [2] * 5
+
+    assert asyncio.run(registry.load(clients[1], name)) is r[0] and len(clients[1].requests) == 2
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import types
+
+import pydantic
+import pytest
+
+from aiopenapi3_redfish.errors import RedfishException
+from aiopenapi3_redfish.Oem.Dell.rollout import JobMonitor, Rollout
+from aiopenapi3_redfish.Oem.Dell.tracker import DellJobTracker, NoProgress
+
+
+class Tracker:
+    """completes the Job after rounds polls, stalls if rounds is None"""
+
+    def __init__(self, client, rounds, state="Completed"):
+        self._client = client
+        self.rounds = rounds
+        self.state = state
+        self.pending = dict()
+        self.done = dict()
+
+    @property
+    def active(self):
+        return bool(self.pending)
+
+    async def add(self, JobId):
+        self.pending[JobId] = types.SimpleNamespace(JobState="Running")
+
+    async def poll(self):
+        if self.rounds is None or not self.pending:
+            return []
+        self.rounds -= 1
+        if self.rounds > 0:
+            return [True]
+        self.done.update({Id: types.SimpleNamespace(JobState=self.state) for Id in self.pending})
+        self.pending.clear()
+        return [True]
+
+
+def rollout(tmp_path, hosts, trackers, **kwargs):
+    active = {group: 0 for group in hosts.values()}
+    peak = dict(active)
+
+    async def connect(host):
+        return host
+
+    async def install(host):
+        active[hosts[host]] += 1
+        peak[hosts[host]] = max(peak[hosts[host]], active[hosts[host]])
+        return f"JID_{host}"
+
+    def tracker(host):
+        t = trackers[host]()
+
+        async def poll(poll=t.poll):
+            r = await poll()
+            if not t.pending:
+                active[hosts[host]] -= 1
+            return r
+
+        t.poll = poll
+        return t
+
+    r = Rollout(
+        hosts, connect, tmp_path / "rollout.json", install=install, tracker=tracker, monitor=JobMonitor(0), **kwargs
+    )
+    return r, peak
+
+
+@pytest.mark.asyncio
+async def test_Rollout(tmp_path):
+    hosts = {f"n{i}": f"rack{i % 2}" for i in range(6)}
+    trackers = {host: (lambda host=host: Tracker(host, 2)) for host in hosts}
+    r, peak = rollout(tmp_path, hosts, trackers, waves=(1, 2), per_group=1)
+    assert r.partition() == [["n0"], ["n1", "n2"], ["n3", "n4", "n5"]]
+
+    results = [i async for i in r.run()]
+    assert all(i.ok for i in results) and len(results) == 6
+    assert peak == {"rack0": 1, "rack1": 1}
+    state = json.loads((tmp_path / "rollout.json").read_text())["hosts"]
+    assert state["n5"] == {
+        "group": "rack1",
+        "state": "done",
+        "job": "JID_n5",
+        "jobs": {"JID_n5": "Completed"},
+        "error": None,
+    }
+
+    """resume - nothing left"""
+    r, _ = rollout(tmp_path, hosts, trackers)
+    assert [i async for i in r.run()] == []
+
+
+@pytest.mark.asyncio
+async def test_Rollout_failures(tmp_path):
+    hosts = {"n0": "rack0", "n1": "rack0", "n2": "rack1"}
+    trackers = {
+        "n0": lambda: Tracker("n0", 1, "Failed"),
+        "n1": lambda: Tracker("n1", None),
+        "n2": lambda: Tracker("n2", 1),
+    }
+    r, _ = rollout(tmp_path, hosts, trackers, waves=(2,), max_failures=0.5, reboots=1, stall=lambda: NoProgress(0))
+    rebooted = []
+
+    async def reboot(client):
+        rebooted.append(client)
+
+    r.monitor.reboot = reboot
+    with pytest.raises(RuntimeError):
+        async for i in r.run():
+            assert not i.ok
+    assert rebooted == ["n1"]
+    state = r.state
+    assert state["n0"]["state"] == state["n1"]["state"] == "failed" and "n2" not in state
+
+    """resume - a running host is tracked without starting the install again"""
+    state["n2"] = {"group": "rack1", "state": "running", "jobs": {}}
+    r.save()
+    r, _ = rollout(tmp_path, hosts, trackers, max_failures=1)
+    installs = []
+
+    async def install(host):
+        installs.append(host)
+
+    r.install = install
+    trackers["n2"] = lambda: Tracker("n2", 1)
+    results = [i async for i in r.run()]
+    assert installs == [] and [i.item for i in results] == ["n2"]
+
+
+@pytest.mark.asyncio
+async def test_Rollout_installing(tmp_path):
+    """interrupted before the install returned a JobId - installed again"""
+    hosts = {"n0": "rack0"}
+    r, _ = rollout(tmp_path, hosts, {"n0": lambda: Tracker("n0", 1)})
+    r.state["n0"] = {"group": "rack0", "state": "installing", "jobs": {}}
+    r.save()
+    results = [i async for i in r.run()]
+    assert results[0].ok and r.state["n0"]["jobs"] == {"JID_n0": "Completed"}
+
+
+class Job(pydantic.BaseModel):
+    odata_id_: str = pydantic.Field(alias="@odata.id")
+    odata_type_: str = pydantic.Field(alias="@odata.type")
+    JobState: str
+    PercentComplete: int
+
+
+def job(Id, JobState, PercentComplete):
+    return {
+        "@odata.id": f"/redfish/v1/Managers/iDRAC.Embedded.1/Oem/Dell/Jobs/{Id}",
+        "@odata.type": "#DellJob.v1_6_0.DellJob",
+        "JobState": JobState,
+        "PercentComplete": PercentComplete,
+    }
+
+
+class Client:
+    _cache = None
+
+    class _mapping:
+        @staticmethod
+        def classFromResourceType(*args):
+            return None
+
+        @staticmethod
+        def classFromRoute(*args):
+            return None
+
+    def modelOf(self, odata_type_):
+        return Job
+
+
+class Jobs:
+    def __init__(self, rounds):
+        self.rounds = iter(rounds)
+
+    async def index(self, Id):
+        return Job.model_validate(job(Id, "Scheduled", 0))
+
+    async def stream(self, query=None, validate=True):
+        members = next(self.rounds)
+        if isinstance(members, Exception):
+            raise members
+        for i in members:
+            yield i
+
+
+@pytest.mark.asyncio
+async def test_Rollout_queue(tmp_path):
+    """Jobs finished before the install do not fail the host, the iDRAC resetting is not a failure"""
+    old = job("JID_old", "Failed", 100)
+    jobs = Jobs(
+        [
+            [old, job("JID_n0", "Running", 50)],
+            RedfishException(None, 503),
+            [old, job("JID_n0", "Completed", 100)],
+        ]
+    )
+
+    async def connect(host):
+        return Client()
+
+    async def install(client):
+        return "JID_n0"
+
+    r = Rollout(
+        {"n0": "rack0"},
+        connect,
+        tmp_path / "rollout.json",
+        install=install,
+        tracker=lambda client: DellJobTracker(client, jobs, interval=0),
+        monitor=JobMonitor(0),
+    )
+    results = [i async for i in r.run()]
+    assert results[0].ok and results[0].value == {"JID_n0": "Completed"}
+    assert r.state["n0"]["state"] == "done"
+
+
+@pytest.mark.asyncio
+async def test_JobMonitor_onChange():
+    """a failing onChange does not leave the watches waiting"""
+    changes = []
+
+    def onChange(host, tracker):
+        changes.append(host)
+        raise OSError("disk full")
+
+    monitor = JobMonitor(0, onChange=onChange)
+    trackers = [Tracker(f"n{i}", 2) for i in range(2)]
+    for t in trackers:
+        await t.add(f"JID_{t._client}")
+    r = await asyncio.wait_for(asyncio.gather(*[monitor.watch(t._client, t, NoProgress(60)) for t in trackers]), 5)
+    assert r == trackers and changes == ["n0", "n1", "n0", "n1"]
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from aiopenapi3_redfish.scheduler import Scheduler, Priority, priority
+
+
+@pytest.mark.asyncio
+async def test_Scheduler_priority():
+    scheduler = Scheduler(slots=1, starvation=60)
+    order = []
+
+    async def request(name, lane):
+        async with scheduler.slot(lane):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(request("first", Priority.bulk))
+        await asyncio.sleep(0)
+        for i in range(3):
+            tg.create_task(request(f"bulk{i}", Priority.bulk))
+        await asyncio.sleep(0)
+        tg.create_task(request("reset", "interactive"))
+
+    assert order[:2] == ["first", "reset"]
+
+
+@pytest.mark.asyncio
+async def test_Scheduler_starvation():
+    scheduler = Scheduler(slots=1, starvation=0.02)
+    order = []
+
+    async def request(name, lane):
+        async with scheduler.slot(lane):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(request("bulk", Priority.bulk))
+        await asyncio.sleep(0)
+        tg.create_task(request("starved", Priority.bulk))
+        for i in range(6):
+            tg.create_task(request(f"interactive{i}", Priority.interactive))
+
+    assert order.index("starved") < len(order) - 1
+
+
+@pytest.mark.asyncio
+async def test_Scheduler_context():
+    scheduler = Scheduler(slots=0)
+
+    with priority("bulk"):
+        task = asyncio.create_task(scheduler.acquire())
+        await asyncio.sleep(0)
+    assert scheduler.waiting[Priority.bulk] == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert scheduler.waiting[Priority.bulk] == 0
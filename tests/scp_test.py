@@ -0,0 +1,88 @@
+import asyncio
+import json
+import types
+
+import pytest
+
+from aiopenapi3_redfish.Oem.Dell.oem import EID_674_Manager_ImportSystemConfiguration, template
+
+Template = {"SystemConfiguration": {"Components": [{"FQDD": "iDRAC.Embedded.1", "Attributes": []}]}}
+
+
+def test_template(tmp_path):
+    (path := tmp_path / "template.json").write_text(json.dumps(Template, indent=4))
+    digest, buffer = template(path)
+    assert buffer == json.dumps(Template, separators=(",", ":"))
+    assert template(path.read_bytes()) == (digest, buffer)
+
+    digest, buffer = template(
+        b'<SystemConfiguration>\n  <Component FQDD="BIOS.Setup.1-1">\n  </Component>\n</SystemConfiguration>\n'
+    )
+    assert buffer == '<SystemConfiguration><Component FQDD="BIOS.Setup.1-1"></Component></SystemConfiguration>'
+
+
+def task(*MessageIds):
+    return types.SimpleNamespace(Messages=[types.SimpleNamespace(MessageId=i) for i in MessageIds])
+
+
+class Client:
+    def __init__(self, name, changes):
+        self.name = name
+        self.imported = False
+        self.log = types.SimpleNamespace(info=lambda *args: None)
+        action = EID_674_Manager_ImportSystemConfiguration.__new__(EID_674_Manager_ImportSystemConfiguration)
+        action._client = self
+
+        async def preview(path, Target, maxWait):
+            await asyncio.sleep(0.01)
+            if changes is None:
+                raise ValueError(name)
+            if changes == "rejected":
+                return types.SimpleNamespace(TaskState="Exception", TaskStatus="Critical", Messages=[], Id=name)
+            return task("SYS081") if changes else task("IDRAC.2.8.SYS069", "SYS081")
+
+        async def call(path, Target, **kwargs):
+            self.imported = True
+            return types.SimpleNamespace(Id=f"JID_{name}")
+
+        async def wait_for(TaskId, maxWait):
+            return TaskId
+
+        action.preview = preview
+        action.__call__ = call
+        self.TaskService = types.SimpleNamespace(wait_for=wait_for)
+        self.Manager = types.SimpleNamespace(
+            Actions=types.SimpleNamespace(Oem={"#OemManager.ImportSystemConfiguration": action})
+        )
+
+    def __repr__(self):
+        return self.name
+
+
+@pytest.mark.asyncio
+async def test_applyMany():
+    clients = [Client("a", True), Client("b", False), Client("c", None), Client("d", "rejected")]
+    results = {
+        r.item.name: r
+        async for r in EID_674_Manager_ImportSystemConfiguration.applyMany(clients, json.dumps(Template).encode())
+    }
+    assert results["a"].value.task == "JID_a" and not results["a"].value.skipped
+    assert results["b"].value.skipped and results["b"].value.task is None
+    assert isinstance(results["c"].error, ValueError)
+    """a failed preview is not imported"""
+    assert isinstance(results["d"].error, ValueError)
+    assert [c.imported for c in clients] == [True, False, False, False]
+
+
+def test_previewAction():
+    route = "/redfish/v1/Managers/{ManagerId}/Actions/Oem/EID_674_Manager.ImportSystemConfigurationPreview"
+    client = types.SimpleNamespace(
+        routeOf=lambda target: ({"ManagerId": target.split("/")[4]}, route),
+        api=types.SimpleNamespace(createRequest=lambda key: key),
+    )
+    action = EID_674_Manager_ImportSystemConfiguration.__new__(EID_674_Manager_ImportSystemConfiguration)
+    action._client = client
+    action.odata_id_ = "/redfish/v1/Managers/iDRAC.Embedded.2/Actions/Oem/EID_674_Manager.ImportSystemConfiguration"
+    preview = action._previewAction()
+    assert preview.odata_id_ == action.odata_id_ + "Preview"
+    assert preview.parameters == {"ManagerId": "iDRAC.Embedded.2"}
@@ -0,0 +1,146 @@
+import asyncio
+import types
+
+import pydantic
+import pytest
+
+from aiopenapi3_redfish.entities.settings import AsyncSettings
+from aiopenapi3_redfish.errors import PreconditionFailed
+
+
+class Attributes(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(extra="allow")
+
+
+class Bios(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(extra="allow")
+    odata_id_: str = pydantic.Field(alias="@odata.id")
+    Attributes: Attributes
+
+
+class Client:
+    def __init__(self):
+        self.requests = []
+        self._cache = None
+        self.log = types.SimpleNamespace(debug=lambda *args: None, info=lambda *args: None)
+
+    async def patch(self, path, data, context):
+        self.requests.append((path, data))
+        return data
+
+
+def bios(client, **attributes):
+    return AsyncSettings(
+        client,
+        Bios.model_validate(
+            {
+                "@odata.id": "/redfish/v1/Systems/1/Bios",
+                "@Redfish.Settings": {"SettingsObject": {"@odata.id": "/redfish/v1/Systems/1/Bios/Settings"}},
+                "Attributes": attributes,
+            }
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_AsyncSettings_set():
+    client = Client()
+    settings = bios(client, BootMode="Uefi", SysProfile="PerfPerWattOptimizedDapc", ProcCStates="Enabled")
+
+    assert settings.diff(Attributes={"BootMode": "Uefi"}) == {}
+    assert await settings.set(Attributes={"BootMode": "Uefi"}) is None
+    assert client.requests == []
+
+    await settings.set(Attributes={"BootMode": "Uefi", "SysProfile": "PerfOptimized", "New": 1})
+    assert client.requests == [
+        ("/redfish/v1/Systems/1/Bios/Settings", {"Attributes": {"SysProfile": "PerfOptimized", "New": 1}})
+    ]
+
+
+@pytest.mark.asyncio
+async def test_AsyncSettings_enforce():
+    client = Client()
+    fleet = [bios(client, SysProfile="PerfOptimized") for _ in range(3)] + [bios(client, SysProfile="Custom")]
+    results = [r async for r in AsyncSettings.enforce(fleet, Attributes={"SysProfile": "PerfOptimized"})]
+    assert sorted(bool(r.value) for r in results) == [False, False, False, True]
+    assert len(client.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_AsyncSettings_batch():
+    client = Client()
+    settings = bios(client, BootMode="Uefi", SysProfile="Custom", ProcCStates="Enabled")
+
+    async with AsyncSettings.batch(window=0.01) as batch:
+        r = await asyncio.gather(
+            settings.set(Attributes={"SysProfile": "PerfOptimized"}),
+            settings.set(Attributes={"ProcCStates": "Disabled"}),
+            settings.set(Attributes={"BootMode": "Uefi"}),
+        )
+    assert batch.requests == 1
+    assert client.requests == [
+        (
+            "/redfish/v1/Systems/1/Bios/Settings",
+            {"Attributes": {"SysProfile": "PerfOptimized", "ProcCStates": "Disabled"}},
+        )
+    ]
+    assert r[0] is r[1] is r[2]
+
+    async with AsyncSettings.batch(window=None) as batch:
+        a = batch.stage(settings, Attributes={"BootMode": "Bios"})
+        b = batch.stage(settings, Attributes={"BootMode": "Uefi"})
+        assert not a.done()
+    assert a.result() is b.result() is None
+    assert len(client.requests) == 1
+
+    """the values of the callers are not modified by merging"""
+    async with AsyncSettings.batch(window=None) as batch:
+        first = {"SysProfile": "Performance"}
+        batch.stage(settings, Attributes=first)
+        batch.stage(settings, Attributes={"ProcCStates": "Disabled"})
+    assert first == {"SysProfile": "Performance"}
+    assert client.requests[-1][1] == {"Attributes": {"SysProfile": "Performance", "ProcCStates": "Disabled"}}
+
+
+class ErrorModel(pydantic.BaseModel):
+    error: dict
+
+
+def test_PreconditionFailed_matches():
+    assert PreconditionFailed.matches(
+        ErrorModel(
+            error={
+                "code": "Base.1.8.GeneralError",
+                "@Message.ExtendedInfo": [{"MessageId": "Base.1.8.PreconditionFailed"}],
+            }
+        )
+    )
+    assert not PreconditionFailed.matches(ErrorModel(error={"code": "Base.1.8.GeneralError"}))
+    assert not PreconditionFailed.matches(None)
+
+
+@pytest.mark.asyncio
+async def test_AsyncSettings_modify():
+    client = Client()
+    settings = bios(client, Timeout=10)
+    fresh = bios(client, Timeout=20)._v
+    conflicts = [PreconditionFailed(None)]
+
+    async def patch(path, data, context):
+        if conflicts:
+            raise conflicts.pop()
+        client.requests.append((path, data))
+        return data
+
+    async def get(path, cache=True):
+        assert cache is False
+        return fresh
+
+    client.patch, client.get = patch, get
+    r = await settings.modify(lambda s: {"Attributes": {"Timeout": s._v.Attributes.Timeout + 5}}, backoff=0.001)
+    assert r == {"Attributes": {"Timeout": 25}}
+    assert client.requests == [("/redfish/v1/Systems/1/Bios/Settings", {"Attributes": {"Timeout": 25}})]
+
+    conflicts = [PreconditionFailed(None)] * 3
+    with pytest.raises(PreconditionFailed):
+        await settings.modify(lambda s: {"Attributes": {"Timeout": 0}}, retries=1, backoff=0.001)
@@ -0,0 +1,39 @@
+import types
+
+import pydantic
+
+from aiopenapi3_redfish.entities.service import AsyncEventService
+from aiopenapi3_redfish.sse import SSEParser
+
+
+def test_SSEParser():
+    data = b': keepalive\r\n\r\nid: 1\r\ndata: {"a":\r\ndata: 1}\r\n\r\nretry: 500\nevent: x\ndata\n\n'
+    for size in [1, 3, len(data)]:
+        parser = SSEParser()
+        events = []
+        for i in range(0, len(data), size):
+            events.extend(parser.feed(data[i : i + size]))
+        assert [(e.event, e.data, e.id, e.retry) for e in events] == [
+            ("message", '{"a":\n1}', "1", None),
+            ("x", "", "1", 500),
+        ]
+
+
+def test_validate():
+    """a malformed event is returned as is - it does not end the stream"""
+
+    class Event(pydantic.BaseModel):
+        Id: str
+
+    def modelOf(odata_type):
+        return {"#Event.v1_8_0.Event": Event}[odata_type]
+
+    service = AsyncEventService.__new__(AsyncEventService)
+    service._client = types.SimpleNamespace(modelOf=modelOf, log=types.SimpleNamespace(debug=lambda *args: None))
+
+    assert service.validate(b'{"@odata.type": "#Event.v1_8_0.Event", "Id": "1"}') == Event(Id="1")
+    assert service.validate('{"@odata.type": "#Unknown"}') == {"@odata.type": "#Unknown"}
+    assert service.validate({"@odata.type": "#Event.v1_8_0.Event"}) == {"@odata.type": "#Event.v1_8_0.Event"}
+    assert service.validate(b'{"@odata.type":') == b'{"@odata.type":'
+    assert service.validate("[1]") == [1]
+    assert service.validate("null") is None
@@ -0,0 +1,61 @@
+import pytest
+
+from aiopenapi3_redfish.entities.service import AsyncJobService, _TaskPoll
+
+
+class Task:
+    def __init__(self, PercentComplete=None, EstimatedDuration=None):
+        self.PercentComplete = PercentComplete
+        self.EstimatedDuration = EstimatedDuration
+
+
+@pytest.mark.parametrize("value, seconds", [("PT5M30S", 330.0), ("P1DT1H", 90000.0), ("PT0.5S", 0.5), ("5", None)])
+def test_TaskPoll_duration(value, seconds):
+    assert _TaskPoll.duration(value) == seconds
+
+
+def test_TaskPoll_update():
+    poll = _TaskPoll("JID_1", 0, 4)
+
+    """no estimation - backoff"""
+    poll.update(Task(), 0, None, 60)
+    assert poll.interval == 6 and poll.due == 6
+    poll.update(Task(), 6, None, 60)
+    assert poll.interval == 9
+
+    """EstimatedDuration"""
+    poll.update(Task(50, "PT1M"), 10, None, 60)
+    assert poll.interval == 15
+
+    """progress observed"""
+    poll = _TaskPoll("JID_2", 0, 4)
+    poll.update(Task(10), 0, None, 60)
+    poll.update(Task(20), 10, None, 60)
+    assert poll.interval == 40
+    poll.update(Task(90), 20, None, 60)
+    assert poll.interval == 1.25
+
+    """events available"""
+    poll.update(Task(90), 20, 60, 60)
+    assert poll.interval == 60
+
+
+class Job:
+    def __init__(self, JobState, JobStatus="OK"):
+        self.JobState = JobState
+        self.JobStatus = JobStatus
+
+
+@pytest.mark.parametrize(
+    "job, result",
+    [
+        (Job("Running"), None),
+        (Job("Scheduled"), None),
+        (Job("Completed"), True),
+        (Job("Exception", "Critical"), False),
+        (Job("Running", "Warning"), False),
+        (Job("Cancelled"), False),
+    ],
+)
+def test_JobService_classify(job, result):
+    assert AsyncJobService.classify(job) is result
@@ -0,0 +1,68 @@
+import asyncio
+import collections
+
+import pytest
+
+from aiopenapi3_redfish.tasks import WorkerPool, AsyncTask, AsyncTaskSet
+
+
+@pytest.mark.asyncio
+async def test_WorkerPool_per_key():
+    active = collections.Counter()
+    peak = collections.Counter()
+
+    async def work(item):
+        bmc, n = item
+        active[bmc] += 1
+        peak[bmc] = max(peak[bmc], active[bmc])
+        await asyncio.sleep(0.01)
+        active[bmc] -= 1
+        if n == 3:
+            raise ValueError(item)
+        return n
+
+    items = [(f"bmc{i % 3}", i) for i in range(12)]
+    pool = WorkerPool(work, concurrency=6, maxsize=2, key=lambda item: item[0])
+    results = [r async for r in pool.map(items)]
+
+    assert sorted(r.item for r in results) == sorted(items)
+    assert [r.item for r in results if not r.ok] == [("bmc0", 3)]
+    assert set(peak.values()) == {1}
+    stats = pool.stats()
+    assert (stats.queued, stats.inflight, stats.done, stats.failed) == (0, 0, 11, 1)
+    assert stats.latency >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_WorkerPool_cancel():
+    started = asyncio.Event()
+
+    async def work(item):
+        started.set()
+        await asyncio.sleep(10)
+
+    pool = WorkerPool(work, concurrency=2)
+    async with pool:
+        for i in range(5):
+            await pool.submit(i)
+        await started.wait()
+        await pool.cancel()
+    assert [r async for r in pool.results()] == []
+    assert pool.stats().cancelled == 5
+    with pytest.raises(RuntimeError):
+        await pool.submit(5)
+
+
+@pytest.mark.asyncio
+async def test_AsyncTaskSet():
+    class Task(AsyncTask):
+        async def produce(self):
+            for i in range(10):
+                yield i
+
+        async def consume(self, item):
+            await asyncio.sleep(0)
+            return item * 2
+
+    results = await AsyncTaskSet(Task(), num_consumers=3).run()
+    assert sorted(r.value for r in results) == list(range(0, 20, 2))
@@ -0,0 +1,79 @@
+import types
+
+import pytest
+
+from aiopenapi3_redfish.entities.service import AsyncTelemetryService
+
+PATH = "/redfish/v1/TelemetryService/MetricReportDefinitions"
+
+
+class Client:
+    def __init__(self, definitions):
+        self.definitions = definitions
+        self.requests = []
+        self.log = types.SimpleNamespace(info=lambda *args: None)
+
+    async def _request(self, path, method, data=None):
+        self.requests.append((method, path, data))
+
+    async def patch(self, path, data, context):
+        self.requests.append(("patch", path, data))
+
+    async def delete(self, path):
+        self.requests.append(("delete", path, None))
+
+
+class Telemetry(AsyncTelemetryService):
+    def __init__(self, client):
+        self._client = client
+        self._v = types.SimpleNamespace(MetricReportDefinitions=types.SimpleNamespace(odata_id_=PATH))
+
+    @property
+    def MetricReportDefinitions(self):
+        return types.SimpleNamespace(_v=self._v.MetricReportDefinitions)
+
+    async def _json(self, path):
+        if path == PATH:
+            return {"Members": [{"@odata.id": f"{PATH}/{i}"} for i in self._client.definitions]}
+        return self._client.definitions[path.rpartition("/")[2]]
+
+
+METRICS = [{"MetricId": "Power", "MetricProperties": ["/redfish/v1/Chassis/1/Sensors/Power"]}]
+
+
+@pytest.mark.asyncio
+async def test_reconcile():
+    Periodic = {"MetricReportDefinitionType": "Periodic", "ReportActions": ["LogToMetricReportsCollection"]}
+    current = {
+        "Power": {
+            "Id": "Power",
+            "Metrics": [{"MetricId": "Power", "MetricProperties": ["/redfish/v1/Chassis/1/Sensors/Power"], "X": 1}],
+            "Schedule": {"RecurrenceInterval": "PT60S"},
+            "MetricReportDefinitionEnabled": True,
+            **Periodic,
+        },
+        "Thermal": {"Id": "Thermal", "Metrics": METRICS, "Schedule": {"RecurrenceInterval": "PT10S"}, **Periodic},
+        "Default": {"Id": "Default"},
+    }
+    desired = {
+        "Power": {"Metrics": METRICS, "RecurrenceInterval": "PT60S"},
+        "Thermal": {"Metrics": METRICS, "RecurrenceInterval": "PT60S"},
+        "CPU": {"Metrics": METRICS, "MetricReportDefinitionType": "OnChange"},
+    }
+    client = Client(current)
+    r = await Telemetry(client).reconcile(desired, prune=True)
+    assert r.unchanged == ["Power"] and r.updated == ["Thermal"] and r.created == ["CPU"] and r.deleted == ["Default"]
+    assert client.requests == [
+        ("patch", f"{PATH}/Thermal", {"Schedule": {"RecurrenceInterval": "PT60S"}}),
+        (
+            "post",
+            PATH,
+            {
+                "Id": "CPU",
+                "Metrics": METRICS,
+                "MetricReportDefinitionType": "OnChange",
+                "ReportActions": ["LogToMetricReportsCollection"],
+            },
+        ),
+        ("delete", f"{PATH}/Default", None),
+    ]
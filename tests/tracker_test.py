@@ -0,0 +1,127 @@
+from typing import Optional
+
+import httpx
+import pydantic
+import pytest
+
+from aiopenapi3_redfish.errors import RedfishException
+from aiopenapi3_redfish.Oem.Dell.tracker import DellJobTracker, NoProgress, AwaitingReboot
+
+
+class Job(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(populate_by_name=True)
+    odata_id_: str = pydantic.Field(alias="@odata.id")
+    odata_type_: str = pydantic.Field(alias="@odata.type")
+    odata_etag_: Optional[str] = pydantic.Field(default=None, alias="@odata.etag")
+    Id: str
+    JobState: str
+    PercentComplete: int
+
+
+def job(Id, JobState, PercentComplete, etag=None):
+    r = {
+        "@odata.id": f"/redfish/v1/Managers/iDRAC.Embedded.1/Oem/Dell/Jobs/{Id}",
+        "@odata.type": "#DellJob.v1_6_0.DellJob",
+        "Id": Id,
+        "JobState": JobState,
+        "PercentComplete": PercentComplete,
+    }
+    if etag:
+        r["@odata.etag"] = etag
+    return r
+
+
+class Client:
+    _cache = None
+
+    class _mapping:
+        @staticmethod
+        def classFromResourceType(*args):
+            return None
+
+        @staticmethod
+        def classFromRoute(*args):
+            return None
+
+    def __init__(self):
+        self.validated = 0
+
+    def modelOf(self, odata_type_):
+        self.validated += 1
+        return Job
+
+
+class Jobs:
+    def __init__(self, rounds):
+        self.rounds = iter(rounds)
+
+    async def stream(self, query=None, validate=True):
+        assert query == {"$expand": "*($levels=1)"} and validate is False
+        members = next(self.rounds)
+        if isinstance(members, Exception):
+            raise members
+        for i in members:
+            yield i
+
+
+@pytest.mark.asyncio
+async def test_DellJobTracker():
+    client = Client()
+    rounds = [
+        [job("JID_1", "Completed", 100), job("JID_2", "Running", 10, "1"), job("JID_3", "Scheduled", 0)],
+        [job("JID_1", "Completed", 100), job("JID_2", "Running", 10, "1"), job("JID_3", "Scheduled", 0)],
+        [job("JID_2", "Running", 50, "2"), job("JID_3", "Scheduled", 0)],
+        [job("JID_2", "Completed", 100, "3"), job("JID_3", "Completed", 100)],
+    ]
+    tracker = DellJobTracker(client, Jobs(rounds), interval=0)
+    changes = [(c.job.Id, c.old, c.new) async for c in tracker.changes(NoProgress(0))]
+    assert changes == [
+        ("JID_2", None, 10),
+        ("JID_3", None, 0),
+        ("JID_2", 10, 50),
+        ("JID_2", 50, 100),
+        ("JID_3", 0, 100),
+    ]
+    assert set(tracker.done) == {"JID_1", "JID_2", "JID_3"}
+    assert tracker.requests == 4
+    """unchanged members are not validated"""
+    assert client.validated == 6
+
+
+@pytest.mark.asyncio
+async def test_StallPolicy():
+    client = Client()
+    rounds = [[job("JID_1", "Scheduled", 0)]] * 3 + [[job("JID_1", "Completed", 100)]]
+    tracker = DellJobTracker(client, Jobs(rounds), interval=0)
+    stalls = []
+
+    async def onStall():
+        stalls.append(len(tracker.pending))
+
+    async for _ in tracker.changes(AwaitingReboot(0), onStall=onStall):
+        pass
+    assert stalls == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_DellJobTracker_transient():
+    """the iDRAC resetting during an update - errors are retried, $expand is kept"""
+    client = Client()
+    rounds = [
+        [job("JID_1", "Running", 10)],
+        RedfishException(None, 503),
+        httpx.ReadError("reset"),
+        [job("JID_1", "Completed", 100)],
+    ]
+    tracker = DellJobTracker(client, Jobs(rounds), interval=0)
+    changes = [(c.job.Id, c.old, c.new) async for c in tracker.changes()]
+    assert changes == [("JID_1", None, 10), ("JID_1", 10, 100)]
+    assert tracker.expand is True
+
+    tracker = DellJobTracker(client, Jobs([RedfishException(None, 400)]), interval=0)
+
+    async def _pollConcurrent():
+        return []
+
+    tracker._pollConcurrent = _pollConcurrent
+    assert await tracker.poll() == [] and tracker.expand is False